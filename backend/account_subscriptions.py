@@ -0,0 +1,265 @@
+"""
+Push-based Solana account tracking over the pubsub WebSocket
+
+One WebSocket connection carries every accountSubscribe stream. Subscriptions
+are replayed automatically after a reconnect, and every notification is handed
+to a callback together with the address it belongs to. The callback runs in
+its own task fed by a queue, so slow handling (DB writes, alerts) never holds
+up the receive loop.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import websockets
+
+from solana_rpc import public_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WS_URL = "wss://api.mainnet-beta.solana.com"
+
+# (address, account value, slot)
+NotificationHandler = Callable[[str, Optional[Dict], int], Awaitable[None]]
+
+
+def ws_url_from_rpc_url(rpc_url: str) -> str:
+    """Derive the pubsub WebSocket URL from an HTTP RPC URL"""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
+
+class AccountSubscriptionManager:
+    """
+    Multiplexes accountSubscribe streams for many addresses over one WebSocket
+
+    subscribe()/unsubscribe() can be called at any time. While disconnected the
+    wanted subscriptions are remembered and sent again on the next connect.
+
+    Notifications wait in a queue for the callback with one entry per address:
+    a newer value for an address that is still waiting replaces the older one,
+    so the backlog never grows past the number of tracked accounts.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        on_notification: NotificationHandler,
+        commitment: str = "confirmed",
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        ping_interval: float = 20.0
+    ):
+        self.ws_url = ws_url
+        self.on_notification = on_notification
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+
+        self._wanted: Dict[str, str] = {}  # address -> encoding
+        self._sub_ids: Dict[int, str] = {}  # subscription id -> address
+        self._address_subs: Dict[str, int] = {}  # address -> subscription id
+        self._pending: Dict[int, str] = {}  # request id -> address
+        self._latest: Dict[str, Dict] = {}  # address -> {"value", "slot", "received_at"}
+        self._queued: Dict[str, Tuple[Optional[Dict], int]] = {}  # address -> (value, slot) awaiting the callback
+        self._queue: asyncio.Queue = asyncio.Queue()  # addresses in _queued, oldest first
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+        self.notifications_received = 0
+        self.notifications_coalesced = 0
+        self.reconnects = 0
+
+    async def start(self):
+        """Start the connection loop and the notification dispatcher in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._dispatch_task = asyncio.create_task(self._dispatch())
+            logger.info(f"Account subscriptions starting: {public_url(self.ws_url)}")
+
+    async def stop(self):
+        """Close the WebSocket and stop reconnecting; queued notifications are dropped"""
+        for task in (self._task, self._dispatch_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._dispatch_task = None
+        self._queued.clear()
+        self._queue = asyncio.Queue()
+        self._mark_disconnected()
+        logger.info("Account subscriptions stopped")
+
+    async def wait_connected(self, timeout: float = 10.0) -> bool:
+        """Wait until the WebSocket is connected and subscriptions were sent"""
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def subscribe(self, address: str, encoding: str = "base64"):
+        """Track an account; no-op if it is already tracked"""
+        if address in self._wanted:
+            return
+        self._wanted[address] = encoding
+        if self._ws is not None:
+            await self._send_subscribe(address)
+
+    async def unsubscribe(self, address: str):
+        """Stop tracking an account"""
+        self._wanted.pop(address, None)
+        self._latest.pop(address, None)
+        sub_id = self._address_subs.pop(address, None)
+        if sub_id is not None:
+            self._sub_ids.pop(sub_id, None)
+            if self._ws is not None:
+                await self._send("accountUnsubscribe", [sub_id])
+
+    async def sync(self, wanted: Dict[str, str]):
+        """Make the tracked set exactly `wanted` ({address: encoding})"""
+        for address in list(self._wanted):
+            if address not in wanted:
+                await self.unsubscribe(address)
+        for address, encoding in wanted.items():
+            await self.subscribe(address, encoding)
+
+    def is_live(self, address: str) -> bool:
+        """True if the account has an active stream and at least one received value"""
+        return address in self._address_subs and address in self._latest
+
+    def latest(self, address: str) -> Optional[Dict]:
+        """Latest pushed value for a live account ({"value", "slot", "received_at"})"""
+        if not self.is_live(address):
+            return None
+        return self._latest[address]
+
+    def seed(self, address: str, value: Optional[Dict], slot: int = 0):
+        """Record a value fetched over RPC so is_live() works before the first push"""
+        if address in self._wanted:
+            self._latest[address] = {"value": value, "slot": slot, "received_at": time.time()}
+
+    def stats(self) -> Dict:
+        return {
+            "connected": self._connected.is_set(),
+            "wanted": len(self._wanted),
+            "active": len(self._address_subs),
+            "notifications_received": self.notifications_received,
+            "notifications_coalesced": self.notifications_coalesced,
+            "queued": len(self._queued),
+            "reconnects": self.reconnects
+        }
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=self.ping_interval) as ws:
+                    self._ws = ws
+                    for address in list(self._wanted):
+                        await self._send_subscribe(address)
+                    self._connected.set()
+                    delay = self.reconnect_delay
+                    logger.info(f"📡 Account subscriptions connected ({len(self._wanted)} accounts)")
+
+                    async for message in ws:
+                        await self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Some connect errors quote the URL, which may carry a provider key
+                logger.warning(
+                    f"Account subscription connection lost: {str(e).replace(self.ws_url, public_url(self.ws_url))}"
+                )
+
+            self._mark_disconnected()
+            self.reconnects += 1
+            # Exponential backoff with jitter before resubscribing everything
+            await asyncio.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _mark_disconnected(self):
+        self._ws = None
+        self._connected.clear()
+        self._sub_ids.clear()
+        self._address_subs.clear()
+        self._pending.clear()
+        # Pushed values go stale once the stream is gone
+        self._latest.clear()
+
+    async def _send(self, method: str, params: List) -> int:
+        request_id = next(self._ids)
+        await self._ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params
+        }))
+        return request_id
+
+    async def _send_subscribe(self, address: str):
+        config = {"encoding": self._wanted[address], "commitment": self.commitment}
+        request_id = await self._send("accountSubscribe", [address, config])
+        self._pending[request_id] = address
+
+    async def _handle_message(self, message):
+        data = json.loads(message)
+
+        # Subscribe confirmation: {"id": request_id, "result": subscription_id}
+        if "id" in data and data.get("id") in self._pending:
+            address = self._pending.pop(data["id"])
+            if "error" in data:
+                logger.warning(f"accountSubscribe failed for {address[:8]}: {data['error']}")
+                return
+            if address not in self._wanted:
+                # Unsubscribed while the request was in flight
+                await self._send("accountUnsubscribe", [data["result"]])
+                return
+            self._sub_ids[data["result"]] = address
+            self._address_subs[address] = data["result"]
+            return
+
+        if data.get("method") != "accountNotification":
+            return
+
+        params = data.get("params") or {}
+        address = self._sub_ids.get(params.get("subscription"))
+        if address is None:
+            return
+
+        result = params.get("result") or {}
+        slot = (result.get("context") or {}).get("slot", 0)
+        value = result.get("value")
+        self._latest[address] = {"value": value, "slot": slot, "received_at": time.time()}
+        self.notifications_received += 1
+
+        if address in self._queued:
+            self.notifications_coalesced += 1
+        else:
+            self._queue.put_nowait(address)
+        self._queued[address] = (value, slot)
+
+    async def _dispatch(self):
+        """Hand queued notifications to the callback, one at a time in arrival order"""
+        while True:
+            address = await self._queue.get()
+            value, slot = self._queued.pop(address)
+            if address not in self._wanted:
+                continue  # Unsubscribed while queued
+            try:
+                await self.on_notification(address, value, slot)
+            except Exception as e:
+                logger.error(f"Error handling account notification for {address[:8]}: {str(e)}")
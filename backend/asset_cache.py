@@ -0,0 +1,233 @@
+"""
+On-disk cache for the dashboard's immutable static assets
+
+Every scrape runs in a fresh browser context, and Chromium doesn't cache
+requests that go through a route handler anyway, so each page load used to
+download the dashboard's JS/CSS bundles again. AssetCache is a route handler
+that serves scripts and stylesheets with a content hash in their file name
+(or an `immutable` Cache-Control) from a directory, fetching and storing them
+on a miss. The directory outlives contexts, browser recycles and process
+restarts, and is shared by the scrape worker processes. Once it grows past
+max_bytes the least recently used entries are evicted.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOURCE_TYPES = ("script", "stylesheet")
+
+# Bundler output names: app.3f9a1c2e.js, chunk-5d2f8a9b1c.css, index-BdX8_k2q.js,
+# or anything below a build directory that is only ever written with hashed names
+HASHED_NAME = re.compile(r"[.\-_]([0-9a-f]{8,}|(?=[A-Za-z_-]*[0-9])[A-Za-z0-9_-]{8})\.(m?js|css)$")
+HASHED_DIRS = ("/_next/static/", "/_nuxt/", "/static/chunks/")
+
+# Response headers kept with a cached body (Playwright hands out decoded bodies, so no content-encoding)
+KEPT_HEADERS = ("content-type", "cache-control", "etag", "last-modified")
+
+
+def is_hashed_asset(url: str) -> bool:
+    path = urlsplit(url).path
+    return bool(HASHED_NAME.search(path)) or any(d in path for d in HASHED_DIRS)
+
+
+def is_immutable_response(url: str, status: int, headers: Dict[str, str]) -> bool:
+    """A 200 the server allows to be reused: hashed name or `immutable`, and not no-store"""
+    if status != 200:
+        return False
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return False
+    return "immutable" in cache_control or is_hashed_asset(url)
+
+
+class AssetCache:
+    """
+    Route handler serving immutable scripts/stylesheets from `directory`
+
+    max_bytes: total size of the cached bodies before LRU eviction
+    max_entry_bytes: larger responses are passed through uncached
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_entry_bytes: Optional[int] = None,
+        resource_types: Iterable[str] = DEFAULT_RESOURCE_TYPES
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes or max(1, max_bytes // 10)
+        self.resource_types = {t.strip().lower() for t in resource_types if t.strip()}
+
+        self._size: Optional[int] = None  # total body bytes, scanned on first use
+        self._lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self.bytes_fetched = 0
+        self.errors = 0
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = self.directory / key[:2] / key
+        return base.with_suffix(".body"), base.with_suffix(".json")
+
+    def wants(self, method: str, resource_type: str, url: str) -> bool:
+        """Requests worth looking up: GETs for hashed scripts/stylesheets"""
+        return method == "GET" and resource_type in self.resource_types and is_hashed_asset(url)
+
+    def _read(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+        # Touch for LRU eviction
+        now = time.time()
+        try:
+            os.utime(body_path, (now, now))
+        except OSError:
+            pass
+        return meta, body
+
+    def _write(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> int:
+        """Store one entry atomically (body first, metadata last); returns the bytes added"""
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        previous = body_path.stat().st_size if body_path.exists() else 0
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k in KEPT_HEADERS},
+            "size": len(body),
+            "stored_at": time.time()
+        }
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode())):
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return len(body) - previous
+
+    def _scan(self):
+        """(mtime, size, body path) of every entry"""
+        entries = []
+        if self.directory.exists():
+            for body_path in self.directory.glob("*/*.body"):
+                try:
+                    st = body_path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, body_path))
+        return entries
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until under max_bytes; returns how many"""
+        # Rescan: other worker processes write to the same directory
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path.with_suffix(".json")):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+        self._size = total
+        return evicted
+
+    async def get(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        return await asyncio.to_thread(self._read, url)
+
+    async def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """Store a response if it is immutable and small enough"""
+        if len(body) > self.max_entry_bytes or not is_immutable_response(url, status, headers):
+            return False
+        async with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in await asyncio.to_thread(self._scan))
+            self._size += await asyncio.to_thread(self._write, url, status, headers, body)
+            self.stored += 1
+            if self._size > self.max_bytes:
+                evicted = await asyncio.to_thread(self._evict)
+                self.evictions += evicted
+                logger.info(f"🗄️ Evicted {evicted} cached dashboard assets ({self._size / 1e6:.1f} MB left)")
+        return True
+
+    async def handle(self, route):
+        request = route.request
+        if not self.wants(request.method, request.resource_type, request.url):
+            await route.fallback()
+            return
+        try:
+            cached = await self.get(request.url)
+        except Exception as e:
+            logger.debug(f"Asset cache read failed for {request.url}: {str(e)}")
+            cached = None
+        if cached is not None:
+            meta, body = cached
+            self.hits += 1
+            self.bytes_served += len(body)
+            await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+            return
+
+        self.misses += 1
+        # Fetch from the network, then hand the same response to the page
+        try:
+            response = await route.fetch()
+        except Exception as e:
+            # The request failed already; abort so the page doesn't wait for it
+            self.errors += 1
+            logger.debug(f"Asset fetch failed for {request.url}: {str(e)}")
+            await route.abort()
+            return
+        try:
+            body = await response.body()
+            self.bytes_fetched += len(body)
+            try:
+                await self.put(request.url, response.status, response.headers, body)
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Asset cache write failed for {request.url}: {str(e)}")
+            await route.fulfill(response=response, body=body)
+        except Exception as e:
+            # Let the next handler (and the browser) deal with the request
+            self.errors += 1
+            logger.debug(f"Could not serve {request.url} through the asset cache: {str(e)}")
+            await route.fallback()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "max_mb": round(self.max_bytes / (1024 * 1024), 1),
+            "size_mb": round(self._size / (1024 * 1024), 1) if self._size is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "stored": self.stored,
+            "evictions": self.evictions,
+            "bytes_served": self.bytes_served,
+            "bytes_fetched": self.bytes_fetched,
+            "errors": self.errors
+        }
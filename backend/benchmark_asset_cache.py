@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cold vs warm dashboard page loads with the on-disk asset cache
+
+Each address is loaded in a fresh browser context (as the scrapers do) with
+the scraper's BlockPolicy, first against an empty AssetCache directory
+(cold), then with a new AssetCache on the same directory (warm - what a
+fresh context or a restarted process sees). Reports the time until the jobs
+table is rendered and the JS/CSS bytes downloaded vs served from disk. Runs
+against the live dashboard: route.fetch() goes to the network, so HAR
+replays can't stand in for it.
+
+Usage:
+  python benchmark_asset_cache.py ADDRESS [ADDRESS ...] [--repeat 3] [--dir PATH]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from playwright.async_api import async_playwright
+
+from asset_cache import AssetCache
+from browser_pool import BlockPolicy
+from dashboard_api import DASHBOARD_HOST_URL
+
+# The scrapers start reading once this is on the page
+READY_SELECTOR = "table tbody tr"
+
+
+async def load(browser, url: str, cache: AssetCache) -> dict:
+    """One page load in a new context; returns load time and cache traffic"""
+    context = await browser.new_context()
+    await context.route("**/*", cache.handle)
+    await context.route("**/*", BlockPolicy().handle)
+    page = await context.new_page()
+
+    hits, fetched, served = cache.hits, cache.bytes_fetched, cache.bytes_served
+    started = time.perf_counter()
+    try:
+        await page.goto(url, wait_until="networkidle", timeout=30000)
+        await page.wait_for_selector(READY_SELECTOR, timeout=10000)
+        elapsed = time.perf_counter() - started
+    finally:
+        await context.close()
+
+    return {
+        "seconds": elapsed,
+        "hits": cache.hits - hits,
+        "kb_fetched": (cache.bytes_fetched - fetched) / 1024,
+        "kb_served": (cache.bytes_served - served) / 1024
+    }
+
+
+async def run_report(addresses, repeat: int, directory: Path):
+    print(f"{'page':<20}{'cold':>10}{'warm':>10}{'JS/CSS KB cold':>16}{'warm: net/disk':>18}{'hits':>6}")
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            for address in addresses:
+                url = DASHBOARD_HOST_URL.format(address=address)
+                page_dir = directory / address
+                cold = await load(browser, url, AssetCache(page_dir))
+                # New instances on the same directory: nothing shared but the disk
+                warm = [await load(browser, url, AssetCache(page_dir)) for _ in range(repeat)]
+                best = min(warm, key=lambda r: r["seconds"])
+                print(
+                    f"{address[:18]:<20}{cold['seconds'] * 1000:>7.0f} ms{best['seconds'] * 1000:>7.0f} ms"
+                    f"{cold['kb_fetched']:>16.1f}{best['kb_fetched']:>9.1f} / {best['kb_served']:<6.1f}{best['hits']:>6}"
+                )
+        finally:
+            await browser.close()
+    print(f"\n(warm = best of {repeat} loads until '{READY_SELECTOR}' is visible; cache in {directory})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("addresses", nargs="+", metavar="ADDRESS")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", type=Path, help="cache directory (default: a new temporary one)")
+    args = parser.parse_args()
+
+    if args.dir:
+        asyncio.run(run_report(args.addresses, args.repeat, args.dir))
+    else:
+        with tempfile.TemporaryDirectory(prefix="asset-cache-") as tmp:
+            asyncio.run(run_report(args.addresses, args.repeat, Path(tmp)))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the browserless dashboard parser on saved host pages
+
+Parses every fixtures/dashboard/*.html page (job rows plus status/balances)
+and a page with 1,000 rows built from the fixtures' rows, and reports the
+parse time per page and per 1,000 rows.
+
+Usage:
+  python benchmark_dashboard_parser.py                      # run on fixtures/dashboard/*.html
+  python benchmark_dashboard_parser.py --record ADDRESS ...  # save rendered host pages as fixtures
+"""
+import argparse
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from dashboard_parsing import jobs_from_html, parse_host_page
+
+FIXTURES = Path(__file__).parent / "fixtures" / "dashboard"
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def with_rows(html: str, count: int) -> str:
+    """The page with its tbody rows repeated up to `count` rows"""
+    match = re.search(r"<tbody>(.*?)</tbody>", html, re.S)
+    rows = re.findall(r"<tr.*?</tr>", match.group(1), re.S)
+    repeated = (rows * (count // len(rows) + 1))[:count]
+    return html[:match.start(1)] + "\n".join(repeated) + html[match.end(1):]
+
+
+def run_benchmark(repeat: int):
+    pages = {path.name: path.read_text() for path in sorted(FIXTURES.glob("*.html"))}
+    if not pages:
+        print(f"No pages in {FIXTURES} - record some with --record ADDRESS")
+        return
+    largest = max(pages.values(), key=lambda html: len(jobs_from_html(html)))
+    pages["1000 rows (built)"] = with_rows(largest, 1000)
+
+    print(f"{'page':<32}{'rows':>6}{'KB':>8}{'per page':>12}{'per 1k rows':>14}")
+    for name, html in pages.items():
+        rows = len(jobs_from_html(html))
+        seconds = timed(lambda: parse_host_page(html), repeat)
+        per_1k = f"{seconds * 1000 / rows * 1000:>11.1f} ms" if rows else f"{'-':>14}"
+        print(f"{name:<32}{rows:>6}{len(html) / 1024:>8.1f}{seconds * 1000:>9.2f} ms{per_1k}")
+    print(f"\n(rows + status/balances, best of {repeat} runs)")
+
+
+async def record(addresses):
+    """Save the rendered host page of each address to fixtures/dashboard/<address>.html"""
+    from browser_pool import BrowserPool
+    from dashboard_api import DASHBOARD_HOST_URL
+
+    FIXTURES.mkdir(parents=True, exist_ok=True)
+    pool = BrowserPool(max_pages=1)
+    try:
+        for address in addresses:
+            async with pool.page() as page:
+                await page.goto(DASHBOARD_HOST_URL.format(address=address), wait_until="networkidle", timeout=30000)
+                await page.wait_for_selector("table tbody tr", timeout=15000)
+                html = await page.content()
+            path = FIXTURES / f"{address}.html"
+            path.write_text(html)
+            print(f"Saved {path} ({len(jobs_from_html(html))} rows)")
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", nargs="+", metavar="ADDRESS")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record))
+    else:
+        run_benchmark(args.repeat)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Before/after report for resource blocking on recorded dashboard pages
+
+Each page is replayed from a HAR recording (fixtures/har/), once loading
+everything and once with the scraper's BlockPolicy, and the time until the
+jobs table is rendered plus the bytes transferred are compared. No
+recordings are shipped with the repo: record some first (needs the live
+dashboard), then replay them as often as needed without network access.
+
+Usage:
+  python benchmark_resource_blocking.py --record ADDRESS ...  # 1. record pages from the live dashboard
+  python benchmark_resource_blocking.py                      # 2. replay fixtures/har/*.har
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from playwright.async_api import async_playwright
+
+from browser_pool import BlockPolicy
+from dashboard_api import DASHBOARD_HOST_URL
+
+HAR_DIR = Path(__file__).parent / "fixtures" / "har"
+
+# The scrapers start reading once this is on the page
+READY_SELECTOR = "table tbody tr"
+
+
+async def load(browser, har: Path, url: str, policy) -> dict:
+    """Replay one page; returns load time, bytes and request counts"""
+    context = await browser.new_context()
+    # Routes added later run first, so the policy sees requests before the HAR
+    await context.route_from_har(har, not_found="abort")
+    if policy is not None:
+        await context.route("**/*", policy.handle)
+    page = await context.new_page()
+
+    sizes = []
+
+    async def on_finished(request):
+        try:
+            sizes.append(await request.sizes())
+        except Exception:
+            pass
+
+    page.on("requestfinished", on_finished)
+    started = time.perf_counter()
+    try:
+        await page.goto(url, wait_until="networkidle", timeout=30000)
+        await page.wait_for_selector(READY_SELECTOR, timeout=10000)
+        elapsed = time.perf_counter() - started
+    finally:
+        await context.close()
+
+    return {
+        "seconds": elapsed,
+        "requests": len(sizes),
+        "bytes": sum(s["responseBodySize"] + s["responseHeadersSize"] for s in sizes)
+    }
+
+
+async def run_report(repeat: int):
+    hars = sorted(HAR_DIR.glob("*.har"))
+    if not hars:
+        print(f"No recordings in {HAR_DIR} - record some first with --record ADDRESS")
+        return False
+
+    print(f"{'page':<20}{'load (all)':>12}{'load (blk)':>12}{'KB (all)':>11}{'KB (blk)':>11}{'reqs':>11}{'saved':>8}")
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            for har in hars:
+                address = har.stem
+                url = DASHBOARD_HOST_URL.format(address=address)
+                policy = BlockPolicy()
+                before = [await load(browser, har, url, None) for _ in range(repeat)]
+                after = [await load(browser, har, url, policy) for _ in range(repeat)]
+
+                t_before = min(r["seconds"] for r in before)
+                t_after = min(r["seconds"] for r in after)
+                kb_before = before[0]["bytes"] / 1024
+                kb_after = after[0]["bytes"] / 1024
+                saved = 100 * (1 - kb_after / kb_before) if kb_before else 0.0
+                print(
+                    f"{address[:18]:<20}{t_before * 1000:>9.0f} ms{t_after * 1000:>9.0f} ms"
+                    f"{kb_before:>11.1f}{kb_after:>11.1f}"
+                    f"{before[0]['requests']:>5} ->{after[0]['requests']:>3}{saved:>7.0f}%"
+                )
+                print(f"{'':<20}blocked: {dict(policy.blocked)}")
+        finally:
+            await browser.close()
+    print(f"\n(load = best of {repeat} runs until '{READY_SELECTOR}' is visible)")
+    return True
+
+
+async def record(addresses):
+    """Record each host page (everything it loads) to fixtures/har/<address>.har"""
+    HAR_DIR.mkdir(parents=True, exist_ok=True)
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            for address in addresses:
+                path = HAR_DIR / f"{address}.har"
+                context = await browser.new_context(record_har_path=str(path), record_har_content="embed")
+                page = await context.new_page()
+                await page.goto(DASHBOARD_HOST_URL.format(address=address), wait_until="networkidle", timeout=30000)
+                await page.wait_for_selector(READY_SELECTOR, timeout=15000)
+                await context.close()  # the HAR is written on close
+                print(f"Recorded {path}")
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", nargs="+", metavar="ADDRESS")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record))
+    else:
+        sys.exit(0 if asyncio.run(run_report(args.repeat)) else 1)
@@ -0,0 +1,269 @@
+"""
+Long-lived Chromium pool for dashboard scraping
+
+One Playwright driver and one Chromium process are kept for the lifetime of
+the app. Every scrape borrows a page in its own browser context (separate
+cookies/storage), so nothing leaks between scrapes. The browser is replaced
+after a number of pages or once Chromium's memory grows past a limit.
+Images, media, fonts and third-party trackers are aborted in scraping
+contexts since the scrapers only read text, and the dashboard's hashed JS/CSS
+bundles come from an on-disk AssetCache instead of the network.
+"""
+import asyncio
+import contextlib
+import logging
+from collections import Counter
+from typing import AsyncIterator, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+try:
+    import psutil
+except ImportError:  # RSS based recycling is skipped without psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+CHROMIUM_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+# Playwright resource types the scrapers never need
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+# Analytics/tracking hosts (subdomains included)
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "plausible.io",
+    "intercom.io",
+    "sentry.io",
+    "facebook.net",
+)
+
+
+class BlockPolicy:
+    """
+    Route handler that aborts requests by resource type or host
+
+    Allowed requests go on with route.fallback(), so other handlers (such as
+    a HAR replay) still see them.
+    """
+
+    def __init__(
+        self,
+        resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS
+    ):
+        self.resource_types = {t.strip().lower() for t in resource_types if t.strip()}
+        self.domains = tuple(d.strip().lower().lstrip(".") for d in domains if d.strip())
+        self.blocked = Counter()
+        self.allowed = 0
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """Why a request is blocked (its resource type or 'tracker'), None to let it through"""
+        if resource_type in self.resource_types:
+            return resource_type
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == domain or host.endswith("." + domain) for domain in self.domains):
+            return "tracker"
+        return None
+
+    async def handle(self, route):
+        request = route.request
+        reason = self.block_reason(request.resource_type, request.url)
+        if reason is None:
+            self.allowed += 1
+            await route.fallback()
+        else:
+            self.blocked[reason] += 1
+            await route.abort("blockedbyclient")
+
+    def stats(self) -> Dict:
+        return {
+            "resource_types": sorted(self.resource_types),
+            "domains": len(self.domains),
+            "blocked": dict(self.blocked),
+            "allowed": self.allowed
+        }
+
+
+def chromium_rss_mb() -> Optional[float]:
+    """Resident memory of all Chromium processes started by this process (MB)"""
+    if psutil is None:
+        return None
+    total = 0
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return None
+    for child in children:
+        try:
+            if any(name in child.name().lower() for name in CHROMIUM_PROCESS_NAMES):
+                total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class _PooledBrowser:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.active_pages = 0
+        self.retiring = False
+
+
+class BrowserPool:
+    """
+    Hands out isolated pages from a shared Chromium instance
+
+    max_pages: pages open at the same time (callers wait for a free slot)
+    recycle_after_pages: replace the browser after it served this many pages
+    max_rss_mb: replace the browser once Chromium uses more memory than this
+    block_policy: BlockPolicy installed on every context (None = load everything)
+    asset_cache: AssetCache serving immutable scripts/stylesheets (None = always download)
+
+    A browser being replaced keeps serving its open pages and is closed when
+    the last one is returned. start() is called on app startup, but page()
+    also starts the pool lazily so standalone scripts can use it.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 4,
+        recycle_after_pages: int = 200,
+        max_rss_mb: Optional[float] = 1024,
+        headless: bool = True,
+        block_policy: Optional[BlockPolicy] = None,
+        asset_cache=None
+    ):
+        self.max_pages = max_pages
+        self.recycle_after_pages = recycle_after_pages
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+        self.block_policy = block_policy
+        self.asset_cache = asset_cache
+
+        self._semaphore = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._current: Optional[_PooledBrowser] = None
+
+        self.browsers_launched = 0
+        self.recycles = 0
+        self.pages_served = 0
+        self.active_pages = 0
+
+    async def start(self):
+        """Start the Playwright driver (the browser itself launches on first use)"""
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            logger.info(f"🌐 Browser pool started (max {self.max_pages} pages)")
+
+    async def stop(self):
+        """Close the browser and the Playwright driver"""
+        async with self._lock:
+            if self._current is not None:
+                await self._close_browser(self._current)
+                self._current = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+                logger.info("Browser pool stopped")
+
+    async def _acquire_browser(self) -> _PooledBrowser:
+        async with self._lock:
+            if self._playwright is None:
+                await self.start()
+            current = self._current
+            if current is None or current.retiring or not current.browser.is_connected():
+                if current is not None:
+                    # Closed now if idle, otherwise when its last page is returned
+                    current.retiring = True
+                    if current.active_pages == 0:
+                        await self._close_browser(current)
+                browser = await self._playwright.chromium.launch(headless=self.headless)
+                current = self._current = _PooledBrowser(browser)
+                self.browsers_launched += 1
+            current.active_pages += 1
+            return current
+
+    async def _release_browser(self, pooled: _PooledBrowser):
+        pooled.active_pages -= 1
+        pooled.pages_served += 1
+
+        if not pooled.retiring:
+            reason = None
+            if self.recycle_after_pages and pooled.pages_served >= self.recycle_after_pages:
+                reason = f"served {pooled.pages_served} pages"
+            elif self.max_rss_mb:
+                rss = chromium_rss_mb()
+                if rss is not None and rss > self.max_rss_mb:
+                    reason = f"RSS {rss:.0f} MB > {self.max_rss_mb:.0f} MB"
+            if reason:
+                pooled.retiring = True
+                self.recycles += 1
+                logger.info(f"♻️ Recycling browser ({reason})")
+
+        if pooled.retiring and pooled.active_pages == 0:
+            async with self._lock:
+                if self._current is pooled:
+                    self._current = None
+            await self._close_browser(pooled)
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {str(e)}")
+
+    @contextlib.asynccontextmanager
+    async def page(self, block: bool = True, **context_options) -> AsyncIterator:
+        """
+        Borrow a page in a fresh browser context
+
+        context_options are passed to browser.new_context() (viewport,
+        user_agent, ...). The context is closed when the block exits.
+        block=False skips the block policy for this page.
+        """
+        async with self._semaphore:
+            pooled = await self._acquire_browser()
+            self.active_pages += 1
+            context = None
+            try:
+                context = await pooled.browser.new_context(**context_options)
+                # Routes added later run first: blocked requests never reach the cache
+                if self.asset_cache is not None:
+                    await context.route("**/*", self.asset_cache.handle)
+                if block and self.block_policy is not None:
+                    await context.route("**/*", self.block_policy.handle)
+                page = await context.new_page()
+                yield page
+            finally:
+                self.active_pages -= 1
+                self.pages_served += 1
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing browser context: {str(e)}")
+                await self._release_browser(pooled)
+
+    def stats(self) -> Dict:
+        rss = chromium_rss_mb()
+        return {
+            "max_pages": self.max_pages,
+            "active_pages": self.active_pages,
+            "pages_served": self.pages_served,
+            "browsers_launched": self.browsers_launched,
+            "recycles": self.recycles,
+            "chromium_rss_mb": round(rss, 1) if rss is not None else None,
+            "blocking": self.block_policy.stats() if self.block_policy is not None else None,
+            "asset_cache": self.asset_cache.stats() if self.asset_cache is not None else None
+        }
@@ -0,0 +1,188 @@
+"""
+Circuit breakers for the Nosana dashboard
+
+Every dashboard read for a node goes through two breakers: one for the node
+and one for the dashboard host. After `failure_threshold` consecutive
+failures a breaker opens and reads are skipped (callers fall back to the last
+known good values). It stays open for an exponentially growing, jittered
+backoff, then lets a single probe through (half-open): success closes it,
+failure opens it again with a longer backoff.
+"""
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# A half-open probe without an outcome after this long lets another probe through
+PROBE_TIMEOUT = 120.0
+
+
+class CircuitOpenError(Exception):
+    """A read was skipped because a breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker with exponential backoff and jitter
+
+    The n-th consecutive trip stays open for base_delay * 2^(n-1) seconds
+    (capped at max_delay), randomised down by up to `jitter` so breakers that
+    tripped together don't probe together.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_delay: float = 30.0,
+        max_delay: float = 1800.0,
+        jitter: float = 0.5
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0  # consecutive trips, drives the backoff
+        self.open_until = 0.0
+        self.probing = False
+        self.probe_started = 0.0
+
+        self.total_failures = 0
+        self.skipped = 0
+
+    def backoff(self) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, self.trips - 1))
+        return delay * (1 - random.uniform(0, self.jitter))
+
+    def allow(self) -> bool:
+        """True if a read may go ahead now (at most one probe while half-open)"""
+        if self.state == STATE_OPEN and time.monotonic() >= self.open_until:
+            self.state = STATE_HALF_OPEN
+            self.probing = False
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_HALF_OPEN and (
+            not self.probing or time.monotonic() - self.probe_started > PROBE_TIMEOUT
+        ):
+            # A probe that never reported back doesn't block the breaker forever
+            self.probing = True
+            self.probe_started = time.monotonic()
+            return True
+        self.skipped += 1
+        return False
+
+    def record_success(self):
+        if self.state != STATE_CLOSED:
+            logger.info(f"🔌 Circuit {self.name} closed")
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.trips += 1
+            delay = self.backoff()
+            self.state = STATE_OPEN
+            self.open_until = time.monotonic() + delay
+            self.probing = False
+            logger.warning(
+                f"🔌 Circuit {self.name} open for {delay:.0f}s "
+                f"({self.consecutive_failures} consecutive failures, trip {self.trips})"
+            )
+
+    def retry_in(self) -> Optional[float]:
+        if self.state != STATE_OPEN:
+            return None
+        return max(0.0, self.open_until - time.monotonic())
+
+    def stats(self) -> Dict:
+        retry_in = self.retry_in()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "retry_in": round(retry_in, 1) if retry_in is not None else None,
+            "total_failures": self.total_failures,
+            "skipped": self.skipped
+        }
+
+
+class DashboardBreakers:
+    """
+    One breaker per node plus one for the dashboard host
+
+    A read is allowed when both allow it. Every outcome counts for both, so
+    failures spread over many nodes (the dashboard itself is down) open the
+    host breaker and stop all reads. Node breakers are kept for the
+    `max_nodes` most recently used addresses.
+    """
+
+    def __init__(
+        self,
+        node_threshold: int = 3,
+        host_threshold: int = 8,
+        base_delay: float = 30.0,
+        max_delay: float = 1800.0,
+        max_nodes: int = 5000
+    ):
+        self.node_threshold = node_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_nodes = max_nodes
+        self.host = CircuitBreaker("dashboard", host_threshold, base_delay, max_delay)
+        self.nodes: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+
+    def node(self, address: str) -> CircuitBreaker:
+        breaker = self.nodes.get(address)
+        if breaker is None:
+            breaker = self.nodes[address] = CircuitBreaker(
+                f"node {address[:8]}", self.node_threshold, self.base_delay, self.max_delay
+            )
+            while len(self.nodes) > self.max_nodes:
+                self.nodes.popitem(last=False)
+        self.nodes.move_to_end(address)
+        return breaker
+
+    def allow(self, address: str) -> bool:
+        node = self.node(address)
+        if node.state == STATE_OPEN and node.retry_in():
+            node.skipped += 1
+            return False
+        if not self.host.allow():
+            return False
+        if not node.allow():
+            # The host probe slot was taken for nothing; give it back
+            self.host.probing = False
+            return False
+        return True
+
+    def record(self, address: str, ok: bool):
+        node = self.node(address)
+        if ok:
+            node.record_success()
+            self.host.record_success()
+        else:
+            node.record_failure()
+            self.host.record_failure()
+
+    def stats(self) -> Dict:
+        # Counts only: node addresses are not published
+        return {
+            "host": self.host.stats(),
+            "nodes_tracked": len(self.nodes),
+            "nodes_open": sum(1 for breaker in self.nodes.values() if breaker.state != STATE_CLOSED)
+        }
@@ -0,0 +1,494 @@
+"""
+Direct access to the Nosana dashboard's data API
+
+The dashboard page at https://dashboard.nosana.com/host/{address} is a
+client-side app that loads its data as JSON over XHR/fetch. Discovery mode
+opens the page once in the browser pool, records those JSON responses with
+Playwright response interception and stores them as URL templates in Mongo
+(`dashboard_api_endpoints`). After that job history, status and balances
+are fetched with plain httpx calls; rendering the page is only a fallback.
+Responses with an ETag or Last-Modified are revalidated with conditional
+requests, so an unchanged endpoint answers 304 instead of resending it.
+"""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_HOST_URL = "https://dashboard.nosana.com/host/{address}"
+
+# Keys that identify a job object in an API response
+JOB_ID_KEYS = ("address", "job", "jobAddress", "pubkey", "id")
+JOB_START_KEYS = ("timeStart", "time_start", "startedAt", "started")
+JOB_END_KEYS = ("timeEnd", "time_end", "endedAt", "completedAt")
+JOB_USD_RATE_KEYS = ("usdRewardPerHour", "usdPerHour", "pricePerHourUsd", "hourlyRateUsd")
+JOB_GPU_KEYS = ("gpu", "gpuType", "marketName", "market")
+JOB_STATE_KEYS = ("state", "status", "jobStatus")
+
+# Query parameters that page through a list
+PAGE_PARAMS = ("page", "offset", "skip")
+LIMIT_PARAMS = ("limit", "per_page", "pageSize", "size")
+
+# Responses kept (with their validators) for conditional requests
+CONDITIONAL_CACHE_SIZE = 500
+
+
+class DashboardAPIUnavailable(Exception):
+    """No known endpoint returned usable job data"""
+
+
+def _first(data: Dict, keys) -> Any:
+    for key in keys:
+        if data.get(key) not in (None, ""):
+            return data[key]
+    return None
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if isinstance(value, (int, float)) and value > 0:
+        # Seconds or milliseconds since the epoch
+        return datetime.fromtimestamp(value / 1000 if value > 1e12 else value, timezone.utc)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return None
+
+
+def find_job_list(data: Any) -> Optional[List[Dict]]:
+    """The first list of job-like objects in a JSON document (None if there is none)"""
+    if isinstance(data, list):
+        if data and all(isinstance(item, dict) for item in data[:5]):
+            sample = data[0]
+            if _first(sample, JOB_ID_KEYS) is not None and _first(sample, JOB_START_KEYS) is not None:
+                return data
+        return None
+    if isinstance(data, dict):
+        for value in data.values():
+            found = find_job_list(value)
+            if found is not None:
+                return found
+    return None
+
+
+def raw_jobs_hash(raw_jobs: List[Dict]) -> str:
+    """Fingerprint of a job list's (id, state) pairs, the API's counterpart of TABLE_HASH_JS"""
+    key = "|".join(f"{_first(raw, JOB_ID_KEYS)}:{_first(raw, JOB_STATE_KEYS)}" for raw in raw_jobs)
+    return "api:" + hashlib.sha1(key.encode()).hexdigest()
+
+
+def classify_response(data: Any) -> Optional[str]:
+    """Role of a recorded response: 'jobs', 'node' or None if it is not useful"""
+    if find_job_list(data) is not None:
+        return "jobs"
+    if isinstance(data, dict):
+        keys = {key.lower() for key in data}
+        if keys & {"status", "state", "online", "balance", "nos", "sol", "availability", "uptime"}:
+            return "node"
+    return None
+
+
+def first_page_url(url: str) -> str:
+    """url with its page/offset parameter set back to the first page (page=0 stays 0-based)"""
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    reset = [
+        (key, ("1" if key == "page" and value != "0" else "0") if key in PAGE_PARAMS and value.isdigit() else value)
+        for key, value in params
+    ]
+    if reset == params:
+        return url
+    return urlunsplit(parts._replace(query=urlencode(reset, safe="{}")))
+
+
+def url_template(url: str, address: str) -> str:
+    """
+    Replace the node address in a recorded URL with {address}
+
+    Responses recorded while the page is paginated carry later page numbers;
+    the template always starts at the first page.
+    """
+    return first_page_url(url).replace(address, "{address}")
+
+
+def fill_template(template: str, address: str) -> str:
+    return template.replace("{address}", address)
+
+
+def normalize_job(raw: Dict, nos_price: Optional[float] = None) -> Optional[Dict]:
+    """
+    Map an API job object to the dict scrape_nosana_job_history returns
+
+    Without a USD rate in the response the rate is derived from the on-chain
+    price (NOS base units per second, 6 decimals) and the NOS price.
+    """
+    job_id = _first(raw, JOB_ID_KEYS)
+    started = _to_datetime(_first(raw, JOB_START_KEYS))
+    if job_id is None or started is None:
+        return None
+
+    ended = _to_datetime(_first(raw, JOB_END_KEYS))
+    end = ended or datetime.now(timezone.utc)
+    duration_seconds = max(0, int((end - started).total_seconds()))
+
+    hourly_rate = _first(raw, JOB_USD_RATE_KEYS)
+    if hourly_rate is None and raw.get("price") is not None and nos_price:
+        hourly_rate = float(raw["price"]) / 1e6 * 3600 * nos_price
+    if hourly_rate is None:
+        return None
+
+    state = _first(raw, JOB_STATE_KEYS)
+    running = state in (1, "1") or (isinstance(state, str) and state.upper() == "RUNNING") or ended is None
+
+    return {
+        "job_id": str(job_id),
+        "started": started,
+        "started_text": started.isoformat(),
+        "duration_seconds": duration_seconds,
+        "duration_text": f"{duration_seconds // 3600}h {duration_seconds % 3600 // 60}m",
+        "hourly_rate_usd": round(float(hourly_rate), 6),
+        "gpu_type": str(_first(raw, JOB_GPU_KEYS) or ""),
+        "status": "RUNNING" if running else "SUCCESS"
+    }
+
+
+def node_summary_from(data: Dict) -> Dict:
+    """Pull job status, balances and stats out of a 'node' response"""
+    lowered = {key.lower(): value for key, value in data.items()}
+    summary: Dict[str, Any] = {}
+
+    status = lowered.get("jobstatus") or lowered.get("status") or lowered.get("state")
+    if isinstance(status, str):
+        status = status.lower()
+        if "running" in status:
+            summary["job_status"] = "running"
+        elif "queue" in status:
+            summary["job_status"] = "queue"
+        elif status in ("idle", "online", "available"):
+            summary["job_status"] = "idle"
+
+    for field, keys in (
+        ("nos_balance", ("nosbalance", "nos")),
+        ("sol_balance", ("solbalance", "sol")),
+        ("total_jobs", ("totaljobs", "jobcount", "jobs")),
+        ("availability_score", ("availability", "uptime")),
+    ):
+        for key in keys:
+            value = lowered.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                summary[field] = value
+                break
+    return summary
+
+
+class DashboardAPI:
+    """
+    Records the dashboard's JSON endpoints once and then calls them directly
+
+    Endpoints live in db.dashboard_api_endpoints as
+    {template, role, method, discovered_at}. The cache in memory is refreshed
+    every `reload_interval` seconds so a discovery on another worker is seen.
+    """
+
+    def __init__(self, db, browser_pool, timeout: float = 10.0, reload_interval: float = 300.0):
+        self.db = db
+        self.browser_pool = browser_pool
+        self.timeout = timeout
+        self.reload_interval = reload_interval
+        self._endpoints: Optional[List[Dict]] = None
+        self._loaded_at = 0.0
+        self._client: Optional[httpx.AsyncClient] = None
+        # url -> {etag, last_modified, data} of recent responses that had validators
+        self._validated: "OrderedDict[str, Dict]" = OrderedDict()
+
+        self.api_calls = 0
+        self.api_failures = 0
+        self.discoveries = 0
+        self.rejected_endpoints = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"Accept": "application/json", "Referer": "https://dashboard.nosana.com/"},
+                follow_redirects=True
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def endpoints(self, role: Optional[str] = None) -> List[Dict]:
+        if self._endpoints is None or time.monotonic() - self._loaded_at > self.reload_interval:
+            stored = await self.db.dashboard_api_endpoints.find({}, {"_id": 0}).to_list(100)
+            # Templates stored from a later page before they were reset count as their first page
+            endpoints: Dict[str, Dict] = {}
+            for endpoint in stored:
+                template = first_page_url(endpoint["template"])
+                endpoints.setdefault(template, {**endpoint, "template": template})
+            self._endpoints = list(endpoints.values())
+            self._loaded_at = time.monotonic()
+        return [e for e in self._endpoints if role is None or e["role"] == role]
+
+    def recorder(self, address: str):
+        """
+        Response handler for page.on("response") that collects JSON XHR/fetch responses
+
+        Returns (handler, recorded list). Call save() with the list afterwards.
+        """
+        recorded: List[Dict] = []
+
+        async def on_response(response):
+            try:
+                if response.request.resource_type not in ("xhr", "fetch") or response.status != 200:
+                    return
+                if "json" not in (response.headers.get("content-type") or ""):
+                    return
+                role = classify_response(await response.json())
+                if role is not None and address in response.url:
+                    recorded.append({
+                        "template": url_template(response.url, address),
+                        "role": role,
+                        "method": response.request.method
+                    })
+            except Exception as e:
+                logger.debug(f"Could not record dashboard response: {str(e)}")
+
+        return on_response, recorded
+
+    async def save(self, recorded: List[Dict]) -> int:
+        """Store recorded endpoints (once per template); returns how many were new"""
+        new = 0
+        now = datetime.now(timezone.utc).isoformat()
+        unique = {endpoint["template"]: endpoint for endpoint in recorded if endpoint["method"] == "GET"}
+        for endpoint in unique.values():
+            result = await self.db.dashboard_api_endpoints.update_one(
+                {"template": endpoint["template"]},
+                {"$set": {**endpoint, "discovered_at": now}},
+                upsert=True
+            )
+            new += 1 if result.upserted_id is not None else 0
+        if recorded:
+            self._endpoints = None  # reload on next use
+        if new:
+            logger.info(f"🛰️ Discovered {new} dashboard API endpoints")
+        return new
+
+    async def discover(self, address: str) -> List[Dict]:
+        """
+        Open the dashboard page for `address` and record the JSON it loads
+
+        Each recorded template is replayed once over HTTP before it's saved, so
+        a template that doesn't work outside the browser (session cookies, a
+        signed URL, a shape normalize_job can't read) never replaces a stored
+        one. Returns the templates that were saved.
+        """
+        on_response, recorded = self.recorder(address)
+        async with self.browser_pool.page() as page:
+            page.on("response", on_response)
+            await page.goto(DASHBOARD_HOST_URL.format(address=address), wait_until='networkidle', timeout=20000)
+        self.discoveries += 1
+
+        unique = {endpoint["template"]: endpoint for endpoint in recorded if endpoint["method"] == "GET"}
+        valid = []
+        for endpoint in unique.values():
+            if await self.replays(endpoint, address):
+                valid.append(endpoint)
+            else:
+                self.rejected_endpoints += 1
+                logger.warning(f"Dashboard API {endpoint['template']} did not replay, not saved")
+        await self.save(valid)
+        return valid
+
+    async def replays(self, endpoint: Dict, address: str) -> bool:
+        """Whether the endpoint answers a direct request with data of its role"""
+        try:
+            data = await self._get_json(fill_template(endpoint["template"], address))
+        except Exception as e:
+            logger.debug(f"Dashboard API {endpoint['template']} replay failed: {str(e)}")
+            return False
+        if endpoint["role"] == "jobs":
+            raw_jobs = find_job_list(data)
+            # Only the shape is checked here, so any NOS price lets on-chain-priced jobs through
+            return raw_jobs is not None and all(normalize_job(raw, nos_price=1.0) is not None for raw in raw_jobs)
+        return classify_response(data) == endpoint["role"]
+
+    async def _get_json(self, url: str) -> Any:
+        await self.start()
+        self.api_calls += 1
+        cached = self._validated.get(url)
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+            self.conditional_requests += 1
+        try:
+            response = await self._client.get(url, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                self.not_modified += 1
+                self._validated.move_to_end(url)
+                return cached["data"]
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            self.api_failures += 1
+            raise
+
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        if etag or last_modified:
+            self._validated[url] = {"etag": etag, "last_modified": last_modified, "data": data}
+            self._validated.move_to_end(url)
+            while len(self._validated) > CONDITIONAL_CACHE_SIZE:
+                self._validated.popitem(last=False)
+        else:
+            self._validated.pop(url, None)
+        return data
+
+    async def fetch_job_history(
+        self,
+        address: str,
+        max_pages: Optional[int] = None,
+        nos_price_source: Optional[Callable[[], Awaitable[Optional[float]]]] = None,
+        stop_when: Optional[Callable[[List[str]], bool]] = None
+    ) -> Optional[List[Dict]]:
+        """Job history over HTTP, or None when no usable endpoint is known (see iter_job_history_pages)"""
+        jobs: List[Dict] = []
+        try:
+            async for _, page_jobs in self.iter_job_history_pages(address, max_pages, nos_price_source, stop_when):
+                jobs.extend(page_jobs)
+        except DashboardAPIUnavailable:
+            return None
+        return jobs
+
+    async def iter_job_history_pages(
+        self,
+        address: str,
+        max_pages: Optional[int] = None,
+        nos_price_source: Optional[Callable[[], Awaitable[Optional[float]]]] = None,
+        stop_when: Optional[Callable[[List[str]], bool]] = None,
+        start_page: int = 1,
+        table_hash: Optional[Dict] = None
+    ) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """
+        Job history over HTTP as (page number, jobs), one page at a time
+
+        Templates with a page/offset parameter are followed from start_page
+        until an empty or short page, max_pages, or a page whose job ids make
+        stop_when true. nos_price_source is only awaited when the response has
+        no USD rate of its own. Raises DashboardAPIUnavailable when no endpoint
+        gives usable jobs; once pages were yielded, a failing endpoint raises
+        its error so the caller can carry on another way.
+
+        table_hash: {'known': hash of the last stored first page}; the first
+        page's raw_jobs_hash goes to 'current', and when it equals 'known',
+        'unchanged' is set and nothing is parsed or yielded.
+        """
+        for endpoint in await self.endpoints("jobs"):
+            yielded = False
+            try:
+                async for page in self._iter_pages(
+                    fill_template(endpoint["template"], address), max_pages, nos_price_source, stop_when, start_page,
+                    table_hash
+                ):
+                    yielded = True
+                    yield page
+                return
+            except Exception as e:
+                if yielded:
+                    raise
+                logger.debug(f"Dashboard API {endpoint['template']} failed: {str(e)}")
+        raise DashboardAPIUnavailable(f"No usable job history endpoint for {address}")
+
+    async def _iter_pages(
+        self, url: str, max_pages: Optional[int], nos_price_source, stop_when, start_page: int,
+        table_hash: Optional[Dict] = None
+    ) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query))
+        page_param = next((p for p in PAGE_PARAMS if p in params), None)
+        limit = next((int(params[p]) for p in LIMIT_PARAMS if p in params and params[p].isdigit()), None)
+
+        page_num = 1
+        if page_param is not None and start_page > 1 and (page_param == "page" or limit):
+            # Jump straight to start_page; without a known page size earlier pages are walked and skipped
+            step = 1 if page_param == "page" else limit
+            params[page_param] = str(int(params[page_param]) + (start_page - 1) * step)
+            page_num = start_page
+
+        nos_price = None
+        while True:
+            raw_jobs = find_job_list(await self._get_json(urlunsplit(parts._replace(query=urlencode(params)))))
+            if raw_jobs is None:
+                # Endpoint no longer returns jobs (or this page is empty)
+                if page_num > 1:
+                    return
+                raise DashboardAPIUnavailable("no job list in the response")
+            if table_hash is not None and page_num == 1:
+                table_hash["current"] = raw_jobs_hash(raw_jobs)
+                if table_hash["current"] == table_hash.get("known"):
+                    table_hash["unchanged"] = True
+                    return
+            if page_num >= start_page:
+                if nos_price is None and nos_price_source is not None and any(
+                    _first(raw, JOB_USD_RATE_KEYS) is None for raw in raw_jobs
+                ):
+                    nos_price = await nos_price_source()
+                page_jobs = []
+                for raw in raw_jobs:
+                    job = normalize_job(raw, nos_price)
+                    if job is None:
+                        # Shape changed - let the browser scraper handle it
+                        raise DashboardAPIUnavailable("job shape changed")
+                    page_jobs.append(job)
+                yield page_num, page_jobs
+
+                if stop_when is not None and stop_when([job["job_id"] for job in page_jobs]):
+                    return
+            if page_param is None or (max_pages and page_num >= max_pages) or not raw_jobs:
+                return
+            if limit and len(raw_jobs) < limit:
+                return
+            if page_param == "page":
+                params[page_param] = str(int(params[page_param]) + 1)
+            else:
+                params[page_param] = str(int(params[page_param]) + len(raw_jobs))
+            page_num += 1
+
+    async def fetch_node_summary(self, address: str) -> Optional[Dict]:
+        """Job status/balances/stats merged from all 'node' endpoints, or None"""
+        summary: Dict[str, Any] = {}
+        for endpoint in await self.endpoints("node"):
+            try:
+                data = await self._get_json(fill_template(endpoint["template"], address))
+            except Exception as e:
+                logger.debug(f"Dashboard API {endpoint['template']} failed: {str(e)}")
+                continue
+            if isinstance(data, dict):
+                for key, value in node_summary_from(data).items():
+                    summary.setdefault(key, value)
+        return summary or None
+
+    def stats(self) -> Dict:
+        return {
+            "endpoints": len(self._endpoints) if self._endpoints is not None else None,
+            "api_calls": self.api_calls,
+            "api_failures": self.api_failures,
+            "discoveries": self.discoveries,
+            "rejected_endpoints": self.rejected_endpoints,
+            "conditional_requests": self.conditional_requests,
+            "not_modified": self.not_modified,
+            "not_modified_rate": round(self.not_modified / self.conditional_requests, 3) if self.conditional_requests else None
+        }
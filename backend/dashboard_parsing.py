@@ -0,0 +1,248 @@
+"""
+Parsing of the rendered Nosana dashboard host page
+
+Job rows are read in the page with JOB_ROWS_JS (after TABLE_HASH_JS showed
+the table changed) and become job dicts via job_from_row; the page text
+gives status, balances and stats via summary_from_text. parse_host_page and
+friends do the same on saved HTML with lxml, without a browser.
+"""
+import logging
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import lxml.html
+
+logger = logging.getLogger(__name__)
+
+# Raw cells of the jobs table rows (header row skipped)
+JOB_ROWS_JS = '''() => {
+    const jobs = [];
+    const table = document.querySelector('table');
+    if (!table) return jobs;
+    
+    const rows = table.querySelectorAll('tr');
+    
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const cells = row.querySelectorAll('td');
+        
+        if (cells.length >= 6) {
+            const jobLink = cells[0].querySelector('a');
+            const jobId = jobLink ? jobLink.getAttribute('href').split('/').pop() : null;
+            const status = cells[6] ? cells[6].textContent.trim() : '';
+            
+            jobs.push({
+                job_id: jobId,
+                started: cells[2].textContent.trim(),
+                duration: cells[3].textContent.trim(),
+                price: cells[4].textContent.trim(),
+                gpu: cells[5].textContent.trim(),
+                status: status.includes('RUNNING') ? 'RUNNING' : 'SUCCESS'
+            });
+        }
+    }
+    
+    return jobs;
+}'''
+
+# Hash of the jobs table's (job id, status) pairs, computed in the page so only
+# the hash crosses over when nothing changed ('' without a table or rows).
+# Started/duration cells are left out: they change on every render.
+TABLE_HASH_JS = '''async () => {
+    const table = document.querySelector('table');
+    if (!table) return '';
+    const key = Array.from(table.querySelectorAll('tr')).slice(1).map(row => {
+        const cells = row.querySelectorAll('td');
+        const link = cells[0] ? cells[0].querySelector('a') : null;
+        const jobId = link ? link.getAttribute('href').split('/').pop() : '';
+        const status = cells[6] ? cells[6].textContent.trim() : '';
+        return jobId + ':' + status;
+    }).join('|');
+    if (!key) return '';
+    if (window.crypto && crypto.subtle) {
+        const digest = await crypto.subtle.digest('SHA-1', new TextEncoder().encode(key));
+        return 'page:' + Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+    let hash = 5381;
+    for (let i = 0; i < key.length; i++) hash = (Math.imul(hash, 33) ^ key.charCodeAt(i)) >>> 0;
+    return 'page-djb2:' + hash.toString(16);
+}'''
+
+
+def parse_duration_to_seconds(duration_text: str) -> int:
+    """Convert duration text like '55m 9s' or '1h 23m' to seconds"""
+    try:
+        seconds = 0
+        # Match hours
+        hours_match = re.search(r'(\d+)h', duration_text)
+        if hours_match:
+            seconds += int(hours_match.group(1)) * 3600
+        
+        # Match minutes
+        minutes_match = re.search(r'(\d+)m', duration_text)
+        if minutes_match:
+            seconds += int(minutes_match.group(1)) * 60
+        
+        # Match seconds
+        seconds_match = re.search(r'(\d+)s', duration_text)
+        if seconds_match:
+            seconds += int(seconds_match.group(1))
+        
+        return seconds
+    except Exception as e:
+        logger.error(f"Error parsing duration '{duration_text}': {str(e)}")
+        return 0
+
+
+def parse_hourly_rate(price_text: str) -> float:
+    """Extract hourly rate from price text like '$0.176' or '$0.192/h'"""
+    try:
+        # Remove '/h' suffix and '$' prefix
+        rate_str = price_text.replace('/h', '').replace('$', '').strip()
+        return float(rate_str)
+    except Exception as e:
+        logger.error(f"Error parsing hourly rate '{price_text}': {str(e)}")
+        return 0.0
+
+
+def parse_relative_time(time_text: str) -> datetime:
+    """Convert relative time like '3 hours ago' to datetime"""
+    try:
+        now = datetime.now(timezone.utc)
+        
+        # Match patterns like "3 hours ago", "33 minutes ago", "2 days ago"
+        hours_match = re.search(r'(\d+)\s+hours?\s+ago', time_text)
+        if hours_match:
+            return now - timedelta(hours=int(hours_match.group(1)))
+        
+        minutes_match = re.search(r'(\d+)\s+minutes?\s+ago', time_text)
+        if minutes_match:
+            return now - timedelta(minutes=int(minutes_match.group(1)))
+        
+        days_match = re.search(r'(\d+)\s+days?\s+ago', time_text)
+        if days_match:
+            return now - timedelta(days=int(days_match.group(1)))
+        
+        # Default to now if can't parse
+        return now
+    except Exception as e:
+        logger.error(f"Error parsing relative time '{time_text}': {str(e)}")
+        return datetime.now(timezone.utc)
+
+
+def job_from_row(row: Dict) -> Dict:
+    """Job dict for one JOB_ROWS_JS row"""
+    return {
+        "job_id": row['job_id'],
+        "started": parse_relative_time(row['started']),
+        "started_text": row['started'],
+        "duration_seconds": parse_duration_to_seconds(row['duration']),
+        "duration_text": row['duration'],
+        "hourly_rate_usd": parse_hourly_rate(row['price']),
+        "gpu_type": row['gpu'],
+        "status": row['status']
+    }
+
+
+def summary_from_text(text: str) -> Dict[str, Optional[float]]:
+    """Job status, balances, total jobs and availability from the host page text"""
+    text_lower = text.lower()
+    
+    job_status = 'idle'
+    if 'status' in text_lower and 'running' in text_lower:
+        if 'running deployment' in text_lower:
+            job_status = 'running'
+        elif 'status\nrunning' in text_lower or 'status:\nrunning' in text_lower:
+            job_status = 'running'
+    if 'queued' in text_lower or 'queue' in text_lower:
+        job_status = 'queue'
+    
+    nos_match = re.search(r'(\d+\.?\d*)\s*nos', text_lower)
+    sol_match = re.search(r'(\d+\.?\d*)\s*sol', text_lower)
+    jobs_match = re.search(r'(\d+)\s*job', text_lower)
+    avail_match = re.search(r'availability[:\s]+(\d+\.?\d*)%', text_lower)
+    if not avail_match:
+        avail_match = re.search(r'uptime[:\s]+(\d+\.?\d*)%', text_lower)
+    
+    return {
+        'job_status': job_status,
+        'nos_balance': float(nos_match.group(1)) if nos_match else None,
+        'sol_balance': float(sol_match.group(1)) if sol_match else None,
+        'total_jobs': int(jobs_match.group(1)) if jobs_match else None,
+        'availability_score': float(avail_match.group(1)) if avail_match else None
+    }
+
+
+def job_rows_from_document(document) -> List[Dict]:
+    """The rows JOB_ROWS_JS returns, from a parsed page"""
+    tables = document.xpath("//table")
+    if not tables:
+        return []
+
+    rows = []
+    for row in tables[0].iter("tr"):
+        cells = row.xpath(".//td")
+        if len(cells) < 6:
+            continue  # header row and layout rows
+        links = cells[0].xpath(".//a")
+        href = links[0].get("href") if links else None
+        status = cells[6].text_content().strip() if len(cells) > 6 else ""
+        rows.append({
+            "job_id": href.split("/")[-1] if href is not None else None,
+            "started": cells[2].text_content().strip(),
+            "duration": cells[3].text_content().strip(),
+            "price": cells[4].text_content().strip(),
+            "gpu": cells[5].text_content().strip(),
+            "status": "RUNNING" if "RUNNING" in status else "SUCCESS"
+        })
+    return rows
+
+
+def text_from_document(document) -> str:
+    """Body text with one line per text node, close to page.inner_text('body')"""
+    for element in document.xpath("//script|//style|//noscript"):
+        element.drop_tree()
+    body = document.find("body")
+    root = body if body is not None else document
+    return "\n".join(text.strip() for text in root.itertext() if text.strip())
+
+
+def parse_host_page(html: str) -> Tuple[Dict[str, Optional[float]], List[Dict]]:
+    """(summary, jobs) from a saved host page - what NodeDashboardSnapshot holds"""
+    document = lxml.html.fromstring(html)
+    jobs = [job_from_row(row) for row in job_rows_from_document(document)]
+    return summary_from_text(text_from_document(document)), jobs
+
+
+def jobs_from_html(html: str) -> List[Dict]:
+    """Job dicts (as scrape_nosana_job_history returns them) from page HTML"""
+    return [job_from_row(row) for row in job_rows_from_document(lxml.html.fromstring(html))]
+
+
+def summary_from_html(html: str) -> Dict[str, Optional[float]]:
+    return summary_from_text(text_from_document(lxml.html.fromstring(html)))
+
+
+class TableHashStats:
+    """Per source, how often the first jobs page was unchanged since it was last stored"""
+
+    def __init__(self):
+        self.checks = Counter()
+        self.unchanged = Counter()
+
+    def record(self, source: str, unchanged: bool):
+        self.checks[source] += 1
+        if unchanged:
+            self.unchanged[source] += 1
+
+    def stats(self) -> Dict:
+        return {
+            source: {
+                "checks": checks,
+                "unchanged": self.unchanged[source],
+                "hit_rate": round(self.unchanged[source] / checks, 3)
+            }
+            for source, checks in self.checks.items()
+        }
@@ -0,0 +1,589 @@
+"""
+Nosana dashboard job history: scraping it and storing it in Mongo
+
+Everything a scrape needs and nothing the API does: the settings, the Mongo
+handle, the browser pool and dashboard readers (JSON API, snapshots, circuit
+breakers) and the page-by-page history walk. server.py imports these, and
+the scrape workers (scrape_worker.py) import this module instead of
+server.py, so a worker process never builds the FastAPI app.
+"""
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from asset_cache import AssetCache
+from browser_pool import BrowserPool, BlockPolicy, DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_RESOURCE_TYPES
+from circuit_breaker import CircuitOpenError, DashboardBreakers
+from dashboard_api import DashboardAPI
+from dashboard_parsing import JOB_ROWS_JS, TABLE_HASH_JS, TableHashStats, job_from_row
+from node_snapshot import NodeSnapshotStore
+from page_waits import PageWaitStats, table_signature, wait_for_table_change
+
+# Set Playwright browser path
+os.environ['PLAYWRIGHT_BROWSERS_PATH'] = '/pw-browsers'
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Shared Chromium pool for dashboard scraping
+BROWSER_POOL_MAX_PAGES = int(os.environ.get('BROWSER_POOL_MAX_PAGES', '4'))  # Concurrent pages
+BROWSER_RECYCLE_AFTER_PAGES = int(os.environ.get('BROWSER_RECYCLE_AFTER_PAGES', '200'))
+BROWSER_MAX_RSS_MB = float(os.environ.get('BROWSER_MAX_RSS_MB', '1024'))  # Recycle above this (0 = never)
+SCRAPER_BLOCKING_ENABLED = os.environ.get('SCRAPER_BLOCKING_ENABLED', 'true').lower() == 'true'  # Abort heavy/tracker requests
+SCRAPER_BLOCK_RESOURCE_TYPES = os.environ.get('SCRAPER_BLOCK_RESOURCE_TYPES', ','.join(DEFAULT_BLOCKED_RESOURCE_TYPES)).split(',')  # Playwright resource types
+SCRAPER_PAGE_WAIT_TIMEOUT = float(os.environ.get('SCRAPER_PAGE_WAIT_TIMEOUT', '10'))  # Backstop for pagination waits (seconds)
+SCRAPER_BLOCK_DOMAINS = os.environ.get('SCRAPER_BLOCK_DOMAINS', ','.join(DEFAULT_BLOCKED_DOMAINS)).split(',')  # Tracker hosts (subdomains included)
+SCRAPER_ASSET_CACHE_ENABLED = os.environ.get('SCRAPER_ASSET_CACHE_ENABLED', 'true').lower() == 'true'  # Serve hashed JS/CSS from disk
+SCRAPER_ASSET_CACHE_DIR = os.environ.get('SCRAPER_ASSET_CACHE_DIR', str(ROOT_DIR / '.cache' / 'dashboard-assets'))  # Shared by worker processes
+SCRAPER_ASSET_CACHE_MB = float(os.environ.get('SCRAPER_ASSET_CACHE_MB', '200'))  # LRU eviction above this
+
+# Dashboard data API (JSON endpoints recorded from the page, called over httpx)
+DASHBOARD_API_ENABLED = os.environ.get('DASHBOARD_API_ENABLED', 'true').lower() == 'true'
+DASHBOARD_API_DISCOVERY = os.environ.get('DASHBOARD_API_DISCOVERY', 'true').lower() == 'true'  # Record during browser scrapes
+
+# Dashboard circuit breakers (skip reads after repeated failures, serve last known good values)
+DASHBOARD_BREAKER_NODE_FAILURES = int(os.environ.get('DASHBOARD_BREAKER_NODE_FAILURES', '3'))  # Consecutive failures per node
+DASHBOARD_BREAKER_HOST_FAILURES = int(os.environ.get('DASHBOARD_BREAKER_HOST_FAILURES', '8'))  # Consecutive failures across nodes
+DASHBOARD_BREAKER_BASE_DELAY = float(os.environ.get('DASHBOARD_BREAKER_BASE_DELAY', '30'))  # First open period, doubles per trip
+DASHBOARD_BREAKER_MAX_DELAY = float(os.environ.get('DASHBOARD_BREAKER_MAX_DELAY', '1800'))
+NODE_SNAPSHOT_MAX_AGE = float(os.environ.get('NODE_SNAPSHOT_MAX_AGE', '60'))  # Seconds a dashboard read is reused (one refresh cycle)
+
+# Incremental history scraping (stop at the newest stored job)
+SCRAPE_KNOWN_JOBS_LIMIT = int(os.environ.get('SCRAPE_KNOWN_JOBS_LIMIT', '500'))  # Recent job ids checked per scrape
+
+# Scrape queue (see scrape_queue.py)
+SCRAPE_JOB_MAX_ATTEMPTS = int(os.environ.get('SCRAPE_JOB_MAX_ATTEMPTS', '3'))  # Tries per job (timeouts/crashes included)
+
+# MongoDB connection
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(mongo_url)
+db = client[os.environ['DB_NAME']]
+
+logger = logging.getLogger(__name__)
+
+# Browser pages for dashboard scraping (started on startup, stopped on shutdown)
+browser_pool = BrowserPool(
+    max_pages=BROWSER_POOL_MAX_PAGES,
+    recycle_after_pages=BROWSER_RECYCLE_AFTER_PAGES,
+    max_rss_mb=BROWSER_MAX_RSS_MB or None,
+    block_policy=BlockPolicy(SCRAPER_BLOCK_RESOURCE_TYPES, SCRAPER_BLOCK_DOMAINS) if SCRAPER_BLOCKING_ENABLED else None,
+    asset_cache=AssetCache(
+        SCRAPER_ASSET_CACHE_DIR, max_bytes=int(SCRAPER_ASSET_CACHE_MB * 1024 * 1024)
+    ) if SCRAPER_ASSET_CACHE_ENABLED else None
+)
+
+# How long scrapers wait for pages to change after navigation/clicks
+page_wait_stats = PageWaitStats()
+
+# Direct HTTP access to the dashboard's JSON endpoints; the browser is the fallback
+dashboard_api = DashboardAPI(db, browser_pool)
+
+# Per-node and dashboard-wide circuit breakers for browser/API reads
+dashboard_breakers = DashboardBreakers(
+    node_threshold=DASHBOARD_BREAKER_NODE_FAILURES,
+    host_threshold=DASHBOARD_BREAKER_HOST_FAILURES,
+    base_delay=DASHBOARD_BREAKER_BASE_DELAY,
+    max_delay=DASHBOARD_BREAKER_MAX_DELAY
+)
+
+# One dashboard read per node per refresh cycle, shared by status, payment and history callers
+node_snapshots = NodeSnapshotStore(
+    browser_pool,
+    dashboard_api=dashboard_api if DASHBOARD_API_ENABLED else None,
+    max_age=NODE_SNAPSHOT_MAX_AGE,
+    nos_price_source=lambda: get_nos_token_price(),
+    discover=DASHBOARD_API_ENABLED and DASHBOARD_API_DISCOVERY,
+    page_wait_stats=page_wait_stats,
+    breakers=dashboard_breakers
+)
+
+# How often a node's first jobs page was unchanged since it was last stored
+table_hash_stats = TableHashStats()
+
+
+async def get_nos_token_price() -> Optional[float]:
+    """Fetch current NOS token price in USD from CoinGecko API"""
+    try:
+        response = requests.get(
+            "https://api.coingecko.com/api/v3/simple/price?ids=nosana&vs_currencies=usd",
+            timeout=5
+        )
+        if response.status_code == 200:
+            data = response.json()
+            price = data.get('nosana', {}).get('usd')
+            if price:
+                logger.info(f"💰 NOS Token Price: ${price:.4f} USD")
+                return float(price)
+        logger.warning(f"Failed to fetch NOS price: {response.status_code}")
+    except Exception as e:
+        logger.error(f"Error fetching NOS price: {str(e)}")
+    return None
+
+
+def fetch_nos_price_coingecko() -> Optional[float]:
+    """Synchronous version - Fetch current NOS token price in USD from CoinGecko API"""
+    try:
+        response = requests.get(
+            "https://api.coingecko.com/api/v3/simple/price?ids=nosana&vs_currencies=usd",
+            timeout=5
+        )
+        if response.status_code == 200:
+            data = response.json()
+            price = data.get('nosana', {}).get('usd')
+            if price:
+                return float(price)
+    except Exception as e:
+        logger.error(f"Error fetching NOS price: {str(e)}")
+    return None
+
+
+async def next_history_page(page, page_num: int, node_address: str) -> bool:
+    """Move the dashboard's jobs table to page_num + 1; False on the last page"""
+    def is_data_request(request):
+        return request.resource_type in ('xhr', 'fetch') and node_address in request.url
+    
+    signature = await table_signature(page)
+    
+    # Check for "Next" button
+    next_button = await page.query_selector('button:has-text("Next"), a:has-text("Next"), button[aria-label*="next" i]')
+    
+    if next_button:
+        # Check if button is disabled
+        is_disabled = await next_button.evaluate('el => el.disabled || el.classList.contains("disabled")')
+        if is_disabled:
+            logger.info(f"✅ Reached last page (button disabled)")
+            return False
+        
+        # Click next button
+        await next_button.click()
+        outcome = await wait_for_table_change(
+            page, signature, is_data_request, SCRAPER_PAGE_WAIT_TIMEOUT, stats=page_wait_stats
+        )
+        if outcome != 'rows_changed' and await table_signature(page) == signature:
+            logger.info(f"✅ Page did not change after Next ({outcome}), stopping")
+            return False
+        return True
+    
+    # No next button found - check for pagination links
+    pagination = await page.query_selector('nav[role="navigation"], div[class*="pagination"]')
+    if not pagination:
+        logger.info(f"✅ Single page only (no pagination)")
+        return False
+    
+    # Try to find and click next page number
+    next_page_link = await pagination.query_selector(f'a:has-text("{page_num + 1}"), button:has-text("{page_num + 1}")')
+    if not next_page_link:
+        logger.info(f"✅ No more pages (no next link)")
+        return False
+    
+    await next_page_link.click()
+    outcome = await wait_for_table_change(
+        page, signature, is_data_request, SCRAPER_PAGE_WAIT_TIMEOUT, stats=page_wait_stats
+    )
+    if outcome != 'rows_changed' and await table_signature(page) == signature:
+        logger.info(f"✅ Page did not change after page link ({outcome}), stopping")
+        return False
+    return True
+
+
+async def iter_job_history_pages(
+    node_address: str,
+    max_pages: int = None,
+    stop_when: Optional[Callable[[List[str]], bool]] = None,
+    resume_from: Optional[Tuple[str, int]] = None,
+    table_hash: Optional[Dict] = None
+) -> AsyncIterator[Tuple[int, str, List[Dict]]]:
+    """
+    Scrape job history from the Nosana dashboard one page at a time
+    
+    Yields (page number, source, jobs) as each page is parsed. Source is
+    'snapshot' (first page of the node's dashboard snapshot), 'api' (the
+    dashboard's JSON endpoints) or 'browser' (Playwright), tried in that order.
+    
+    Args:
+        node_address: Node address to scrape
+        max_pages: Maximum number of pages to scrape (None = all pages)
+        stop_when: Called with each page's job ids; True stops after that page
+        resume_from: (source, page) to start at, pages before it are skipped
+        when that source is used (page numbers differ between sources)
+        table_hash: {'known': fingerprint of the first page as last stored};
+        the first page's fingerprint (TABLE_HASH_JS in the page, raw_jobs_hash
+        for the API) goes to 'current'. When it equals 'known', 'unchanged' is
+        set and nothing is parsed or yielded.
+    
+    Raises CircuitOpenError when the node's dashboard circuit is open and the
+    error of a failed page read, after the pages read so far were yielded.
+    """
+    def start_page(source: str) -> int:
+        return resume_from[1] if resume_from and resume_from[0] == source else 1
+    
+    # The first page is part of the node's dashboard snapshot
+    if resume_from is None and (max_pages == 1 or stop_when is not None):
+        try:
+            snapshot = await node_snapshots.get(node_address)
+            first_page = snapshot.jobs
+            if table_hash is not None and snapshot.table_hash:
+                table_hash['current'] = snapshot.table_hash
+                if snapshot.table_hash == table_hash.get('known'):
+                    table_hash['unchanged'] = True
+                    table_hash_stats.record('snapshot', True)
+                    logger.info(f"⏭️ Jobs table unchanged for {node_address[:8]}..., nothing to store")
+                    return
+                table_hash_stats.record('snapshot', False)
+            if max_pages == 1 or (first_page and stop_when([job['job_id'] for job in first_page])):
+                logger.info(f"⚡ {len(first_page)} jobs from the dashboard snapshot for {node_address[:8]}...")
+                yield 1, 'snapshot', first_page
+                return
+        except Exception as snapshot_error:
+            logger.debug(f"Dashboard snapshot unavailable: {str(snapshot_error)}")
+    
+    if DASHBOARD_API_ENABLED:
+        api_pages = 0
+        try:
+            async for page_num, jobs in dashboard_api.iter_job_history_pages(
+                node_address, max_pages, get_nos_token_price, stop_when, start_page=start_page('api'),
+                table_hash=table_hash
+            ):
+                api_pages += 1
+                yield page_num, 'api', jobs
+            if table_hash is not None and table_hash.get('current'):
+                table_hash_stats.record('api', bool(table_hash.get('unchanged')))
+            if table_hash is not None and table_hash.get('unchanged'):
+                logger.info(f"⏭️ Job history unchanged for {node_address[:8]}..., nothing to store")
+                return
+            logger.info(f"⚡ Fetched {api_pages} pages from dashboard API for {node_address[:8]}...")
+            return
+        except Exception as api_error:
+            logger.debug(f"Dashboard API unavailable after {api_pages} pages, rendering the page: {str(api_error)}")
+    
+    if not dashboard_breakers.allow(node_address):
+        raise CircuitOpenError(f"Dashboard circuit open for {node_address[:8]}")
+    
+    url = f"https://dashboard.nosana.com/host/{node_address}"
+    first_page_num = start_page('browser')
+    logger.info(f"🌐 Scraping Nosana dashboard for node: {node_address}")
+    
+    try:
+        async with browser_pool.page() as page:
+            # Record the JSON the page loads so the next call can skip the browser
+            recorded = []
+            if DASHBOARD_API_ENABLED and DASHBOARD_API_DISCOVERY:
+                on_response, recorded = dashboard_api.recorder(node_address)
+                page.on("response", on_response)
+            
+            try:
+                # Navigate to page
+                await page.goto(url, wait_until='networkidle', timeout=15000)
+                
+                # Wait for table to load
+                await page.wait_for_selector('table', timeout=10000)
+                
+                if first_page_num > 1:
+                    logger.info(f"⏩ Resuming at page {first_page_num}")
+                total_jobs = 0
+                page_num = 1
+                while True:
+                    if page_num == 1 and first_page_num == 1 and table_hash is not None:
+                        # Fingerprint the table in the page before reading any rows
+                        table_hash['current'] = await page.evaluate(TABLE_HASH_JS) or None
+                        unchanged = table_hash['current'] is not None and table_hash['current'] == table_hash.get('known')
+                        table_hash_stats.record('page', unchanged)
+                        if unchanged:
+                            table_hash['unchanged'] = True
+                            logger.info(f"⏭️ Jobs table unchanged for {node_address[:8]}..., nothing to store")
+                            break
+                    if page_num >= first_page_num:
+                        # Extract job data from current page
+                        jobs_data = await page.evaluate(JOB_ROWS_JS)
+                        total_jobs += len(jobs_data)
+                        logger.info(f"✅ Page {page_num}: {len(jobs_data)} jobs")
+                        yield page_num, 'browser', [job_from_row(job_data) for job_data in jobs_data]
+                        
+                        # Stop once the page only has jobs we already have
+                        if stop_when and stop_when([job_data['job_id'] for job_data in jobs_data]):
+                            logger.info(f"🛑 Caught up with stored jobs on page {page_num}")
+                            break
+                    
+                    # Check if max_pages reached
+                    if max_pages and page_num >= max_pages:
+                        logger.info(f"🛑 Reached max pages limit: {max_pages}")
+                        break
+                    
+                    if not await next_history_page(page, page_num, node_address):
+                        break
+                    page_num += 1
+                
+                dashboard_breakers.record(node_address, ok=True)
+                logger.info(f"🎉 Successfully scraped {total_jobs} jobs from {page_num} pages")
+                if recorded:
+                    await dashboard_api.save(recorded)
+                
+            except Exception as e:
+                dashboard_breakers.record(node_address, ok=False)
+                logger.error(f"Error during Playwright scraping: {str(e)}")
+                raise
+    
+    except Exception:
+        if 'page' not in locals():
+            # The browser could not even open a page
+            dashboard_breakers.record(node_address, ok=False)
+        raise
+
+
+async def scrape_nosana_job_history(
+    node_address: str,
+    max_pages: int = None,
+    stop_when: Optional[Callable[[List[str]], bool]] = None,
+    raise_errors: bool = False
+) -> List[Dict]:
+    """
+    Scrape actual job history data from Nosana dashboard
+    Supports pagination to get all historical jobs (see iter_job_history_pages)
+    
+    Returns list of jobs with real payment data; when a page fails, the jobs
+    of the pages read before it. With raise_errors the failure (or an open
+    circuit) is raised instead, so a queued scrape is retried.
+    """
+    all_jobs = []
+    pages = iter_job_history_pages(node_address, max_pages, stop_when)
+    try:
+        async for _, _, jobs in pages:
+            all_jobs.extend(jobs)
+    except CircuitOpenError:
+        if raise_errors:
+            raise
+        logger.info(f"🔌 Dashboard circuit open for {node_address[:8]}..., skipping history scrape")
+    except Exception as e:
+        if raise_errors:
+            raise
+        logger.error(f"Error scraping Nosana dashboard: {str(e)}")
+    finally:
+        await pages.aclose()
+    return all_jobs
+
+
+def caught_up_with(known_job_ids: set, watermark: Optional[str]) -> Callable[[List[str]], bool]:
+    """stop_when for scrape_nosana_job_history: the page has the watermark job or only known jobs"""
+    def stop_when(page_job_ids: List[str]) -> bool:
+        job_ids = [job_id for job_id in page_job_ids if job_id]
+        if not job_ids:
+            return False
+        return watermark in job_ids or all(job_id in known_job_ids for job_id in job_ids)
+    return stop_when
+
+
+async def scrape_and_store_job_history(user_id: str, node_address: str, backfill: bool = False) -> Dict:
+    """
+    Scrape the jobs newer than what is stored for a node, storing each page as it arrives
+    
+    Pagination stops at the page holding the node's watermark (newest
+    stored job) or with only known job ids, so a routine scrape costs one
+    page. Nodes without a watermark and backfill=True walk the full history.
+    
+    The walk's last stored page is kept in scrape_progress until it finishes.
+    A walk that failed or timed out is resumed there by the next call, with
+    the watermark it started with (a backfill request resumes a full walk).
+    The watermark only moves to the walk's newest job once the walk is
+    complete, so the pages between it and the old watermark are never skipped.
+    
+    A fresh walk fingerprints the first page and compares it with the hash
+    stored on the watermark; when the table is unchanged nothing is parsed
+    or stored and 'unchanged' is set in the result.
+    
+    Returns {'pages', 'jobs_scraped', 'jobs_stored', 'complete'}
+    """
+    table_hash = None
+    newest = None
+    progress = await db.scrape_progress.find_one({"node_address": node_address}, {"_id": 0})
+    if progress and (not backfill or progress.get('watermark') is None):
+        watermark_id = progress.get('watermark')
+        newest = progress.get('newest')
+        # The resumed page's jobs are stored already, so only the watermark itself ends the walk
+        stop_when = caught_up_with(set(), watermark_id) if watermark_id else None
+        resume_from = (progress['source'], progress['page'])
+        logger.info(f"⏯️ Resuming job history scrape for {node_address[:8]}... at {progress['source']} page {progress['page']}")
+    else:
+        watermark = None if backfill else await db.scrape_watermarks.find_one({"node_address": node_address}, {"_id": 0})
+        watermark_id = watermark['job_id'] if watermark else None
+        stop_when = None
+        resume_from = None
+        table_hash = {'known': watermark.get('table_hash') if watermark else None}
+        if watermark_id:
+            # Jobs newer than the watermark may come from a partial scrape with unscraped pages below them
+            known_docs = await db.scraped_jobs.find(
+                {"node_address": node_address, "started": {"$lte": watermark['started']}}, {"_id": 0, "job_id": 1}
+            ).sort("started", -1).to_list(SCRAPE_KNOWN_JOBS_LIMIT)
+            known_job_ids = {doc['job_id'] for doc in known_docs}
+            known_job_ids.add(watermark_id)
+            stop_when = caught_up_with(known_job_ids, watermark_id)
+        elif not backfill:
+            logger.info(f"📚 No scrape watermark for {node_address[:8]}..., scraping full history")
+    
+    nos_price = None
+    result = {'pages': 0, 'jobs_scraped': 0, 'jobs_stored': 0, 'complete': False}
+    pages = iter_job_history_pages(node_address, stop_when=stop_when, resume_from=resume_from, table_hash=table_hash)
+    try:
+        async for page_num, source, jobs in pages:
+            if nos_price is None:
+                nos_price = fetch_nos_price_coingecko() or 0.1
+            result['jobs_stored'] += await store_scraped_jobs(
+                user_id, node_address, jobs, nos_price=nos_price, raise_errors=True
+            )
+            result['pages'] += 1
+            result['jobs_scraped'] += len(jobs)
+            newest = newest_job(jobs + ([newest] if newest else []))
+            now = datetime.now(timezone.utc).isoformat()
+            await db.scrape_progress.update_one(
+                {"node_address": node_address},
+                {
+                    "$set": {
+                        "watermark": watermark_id, "newest": newest,
+                        "source": source, "page": page_num, "updated_at": now
+                    },
+                    "$setOnInsert": {"started_at": now}
+                },
+                upsert=True
+            )
+        result['complete'] = True
+    except CircuitOpenError:
+        logger.info(f"🔌 Dashboard circuit open for {node_address[:8]}..., skipping history scrape")
+    except Exception as e:
+        logger.warning(
+            f"Job history scrape of {node_address[:8]}... stopped after {result['pages']} pages, "
+            f"resuming there next time: {str(e)}"
+        )
+    finally:
+        await pages.aclose()
+    
+    if result['complete']:
+        # Everything down to the old watermark is stored now
+        if newest:
+            await update_scrape_watermark(node_address, newest)
+        await db.scrape_progress.delete_one({"node_address": node_address})
+        if table_hash and table_hash.get('unchanged'):
+            result['unchanged'] = True
+        elif table_hash and table_hash.get('current'):
+            # Only on an existing watermark: a table with no stored jobs has nothing to compare against
+            await db.scrape_watermarks.update_one(
+                {"node_address": node_address}, {"$set": {"table_hash": table_hash['current']}}
+            )
+    return result
+
+
+def newest_job(jobs: List[Dict]) -> Optional[Dict]:
+    """{'job_id', 'started'} of the most recently started job, None without any"""
+    def started_at(job):
+        started = job['started']
+        return started if isinstance(started, datetime) else datetime.fromisoformat(started.replace('Z', '+00:00'))
+    
+    newest = max((job for job in jobs if job.get('job_id')), key=started_at, default=None)
+    if newest is None:
+        return None
+    return {'job_id': newest['job_id'], 'started': started_at(newest).isoformat()}
+
+
+async def update_scrape_watermark(node_address: str, newest: Dict):
+    """Move the node's watermark to `newest` (see newest_job), never backwards"""
+    newest_started = newest['started']
+    current = await db.scrape_watermarks.find_one({"node_address": node_address}, {"_id": 0})
+    if current and current.get('started', '') >= newest_started:
+        return
+    await db.scrape_watermarks.update_one(
+        {"node_address": node_address},
+        {"$set": {
+            "job_id": newest['job_id'],
+            "started": newest_started,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }},
+        upsert=True
+    )
+
+
+async def store_scraped_jobs(
+    user_id: str,
+    node_address: str,
+    jobs: List[Dict],
+    nos_price: Optional[float] = None,
+    raise_errors: bool = False
+):
+    """
+    Store scraped jobs from Nosana dashboard in MongoDB
+    Prevents duplicates by job_id (one bulk upsert per call)
+    
+    nos_price: NOS price to value the jobs at (fetched when not given)
+    raise_errors: raise instead of returning 0 when the write fails
+    
+    The scrape watermark is left alone: only a complete walk
+    (scrape_and_store_job_history) may move it.
+    """
+    try:
+        if not jobs:
+            return 0
+        
+        if nos_price is None:
+            nos_price = fetch_nos_price_coingecko() or 0.1
+        
+        operations = []
+        for job in jobs:
+            # Calculate earnings
+            duration_hours = job['duration_seconds'] / 3600.0
+            usd_earned = duration_hours * job['hourly_rate_usd']
+            nos_earned = usd_earned / nos_price if nos_price > 0 else 0
+            
+            # Calculate completion time: started + duration
+            started_dt = job['started'] if isinstance(job['started'], datetime) else datetime.fromisoformat(job['started'].replace('Z', '+00:00'))
+            
+            # For SUCCESS jobs, calculate completed time
+            if job['status'] == 'SUCCESS':
+                completed_dt = started_dt + timedelta(seconds=job['duration_seconds'])
+                completed = completed_dt.isoformat()
+            else:
+                # RUNNING jobs - not completed yet
+                completed = None
+            
+            # Store job
+            job_doc = {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "node_address": node_address,
+                "job_id": job['job_id'],
+                "started": started_dt.isoformat(),
+                "started_text": job.get('started_text', ''),
+                "completed": completed,
+                "duration_seconds": job['duration_seconds'],
+                "duration_text": job.get('duration_text', ''),
+                "hourly_rate_usd": job['hourly_rate_usd'],
+                "usd_earned": round(usd_earned, 4),
+                "nos_earned": round(nos_earned, 2),
+                "nos_price_at_time": nos_price,
+                "gpu_type": job['gpu_type'],
+                "status": job['status'],
+                "scraped_at": datetime.now(timezone.utc).isoformat()
+            }
+            
+            # Only inserted if the job isn't stored yet
+            operations.append(UpdateOne(
+                {"job_id": job['job_id'], "node_address": node_address},
+                {"$setOnInsert": job_doc},
+                upsert=True
+            ))
+        
+        result = await db.scraped_jobs.bulk_write(operations, ordered=False)
+        stored_count = result.upserted_count
+        
+        logger.info(f"✅ Stored {stored_count} new jobs for node {node_address[:8]}...")
+        return stored_count
+        
+    except Exception as e:
+        logger.error(f"Error storing scraped jobs: {str(e)}")
+        if raise_errors:
+            raise
+        return 0
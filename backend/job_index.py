@@ -0,0 +1,177 @@
+"""
+On-chain Nosana job index
+
+Finds running and queued jobs for nodes straight from the Nosana jobs program
+with getProgramAccounts and memcmp filters, instead of listing every job on
+the network and fetching accounts one by one (what nosana_service.js does).
+"""
+import asyncio
+import base64
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from solders.pubkey import Pubkey
+
+from nosana_accounts import JOB_ACCOUNT, NOSANA_JOBS_PROGRAM_ID
+from solana_rpc import SolanaRPCClient
+
+logger = logging.getLogger(__name__)
+
+# JobAccount.state values
+JOB_STATE_QUEUED = 0
+JOB_STATE_RUNNING = 1
+JOB_STATE_DONE = 2
+JOB_STATE_STOPPED = 3
+
+JOB_NODE_OFFSET = JOB_ACCOUNT.offset("node")
+JOB_STATE_OFFSET = JOB_ACCOUNT.offset("state")
+
+# Fields the index hands out (skips the ipfs hashes and project)
+JOB_INDEX_FIELDS = ("market", "node", "payer", "price", "state", "time_start", "time_end", "timeout")
+
+# Above this many nodes one network-wide query per state is cheaper than
+# one query per node and state
+PER_NODE_QUERY_LIMIT = 4
+
+# Running jobs must have started after this (2022-01-01, before the jobs
+# program was deployed) and not in the future, or the layout is off
+MIN_JOB_TIME_START = 1_640_995_200
+
+
+class JobIndexUnavailable(Exception):
+    """The JobAccount layout didn't check out against the chain; use another source"""
+
+
+def _memcmp(offset: int, data: bytes) -> Dict:
+    return {"memcmp": {"offset": offset, "bytes": base64.b64encode(data).decode(), "encoding": "base64"}}
+
+
+def job_status_from_jobs(jobs: List[Dict]) -> str:
+    """Collapse a node's jobs into the dashboard's job_status ('running', 'queue' or 'idle')"""
+    states = {job["state"] for job in jobs}
+    if JOB_STATE_RUNNING in states:
+        return "running"
+    if JOB_STATE_QUEUED in states:
+        return "queue"
+    return "idle"
+
+
+class JobIndex:
+    """
+    Running/queued job lookups against the Nosana jobs program
+
+    A single node costs one getProgramAccounts per state, filtered on the
+    JobAccount discriminator, node and state. Larger batches use one
+    network-wide query per state and match the node field locally.
+
+    An empty answer only means "idle" if the memcmp offsets are right, so the
+    layout is checked against the network's running jobs first (and again
+    every `layout_check_interval` seconds, `layout_retry_interval` after a
+    failure): there has to be at least one, and
+    each must decode with a plausible start time. Until a check passes,
+    lookups raise JobIndexUnavailable and callers fall back to the SDK
+    service or the dashboard.
+    """
+
+    def __init__(
+        self,
+        rpc: SolanaRPCClient,
+        program_id: str = NOSANA_JOBS_PROGRAM_ID,
+        layout_check_interval: float = 3600.0,
+        layout_retry_interval: float = 300.0
+    ):
+        self.rpc = rpc
+        self.program_id = program_id
+        self.layout_check_interval = layout_check_interval
+        self.layout_retry_interval = layout_retry_interval  # After a failed check
+        self.layout_ok: Optional[bool] = None
+        self._layout_checked_at = 0.0
+        self._layout_lock = asyncio.Lock()
+
+    async def _program_accounts(self, filters: List[Dict]) -> List[Dict]:
+        config = {
+            "encoding": "base64",
+            "commitment": self.rpc.commitment,
+            "filters": [_memcmp(0, JOB_ACCOUNT.discriminator)] + filters
+        }
+        result = await self.rpc.call("getProgramAccounts", [self.program_id, config])
+        # Plain list, or {"context", "value"} if the node wraps it
+        return result.get("value", []) if isinstance(result, dict) else (result or [])
+
+    async def check_layout(self) -> bool:
+        """Decode the network's running jobs and see whether they look like jobs"""
+        accounts = await self._program_accounts([_memcmp(JOB_STATE_OFFSET, bytes([JOB_STATE_RUNNING]))])
+        decoded = JOB_ACCOUNT.decode_many(accounts, ("state", "time_start"))
+        latest_start = time.time() + 86400
+        ok = bool(decoded) and all(
+            job is not None and job["state"] == JOB_STATE_RUNNING
+            and MIN_JOB_TIME_START <= job["time_start"] <= latest_start
+            for job in decoded
+        )
+        if not ok:
+            logger.warning(
+                f"JobAccount layout check failed ({len(decoded)} running jobs decoded), job index disabled"
+            )
+        return ok
+
+    async def _ensure_layout(self):
+        async with self._layout_lock:
+            interval = self.layout_check_interval if self.layout_ok else self.layout_retry_interval
+            if self.layout_ok is None or time.monotonic() - self._layout_checked_at > interval:
+                self.layout_ok = await self.check_layout()
+                self._layout_checked_at = time.monotonic()
+        if not self.layout_ok:
+            raise JobIndexUnavailable("JobAccount layout check failed")
+
+    async def _program_jobs(self, filters: List[Dict]) -> List[Dict]:
+        accounts = await self._program_accounts(filters)
+        jobs = []
+        for job in JOB_ACCOUNT.decode_many(accounts, JOB_INDEX_FIELDS):
+            if job is not None:
+                job["job"] = job.pop("address", None)
+                jobs.append(job)
+        return jobs
+
+    async def jobs_for_node(
+        self,
+        node: str,
+        states: Iterable[int] = (JOB_STATE_RUNNING, JOB_STATE_QUEUED)
+    ) -> List[Dict]:
+        """Active jobs assigned to one node"""
+        await self._ensure_layout()
+        node_filter = _memcmp(JOB_NODE_OFFSET, bytes(Pubkey.from_string(node)))
+        results = await asyncio.gather(*(
+            self._program_jobs([node_filter, _memcmp(JOB_STATE_OFFSET, bytes([state]))])
+            for state in states
+        ))
+        return [job for jobs in results for job in jobs]
+
+    async def jobs_for_nodes(
+        self,
+        nodes: List[str],
+        states: Iterable[int] = (JOB_STATE_RUNNING, JOB_STATE_QUEUED)
+    ) -> Dict[str, List[Dict]]:
+        """Active jobs for many nodes: {node: [job, ...]} with an entry for every node"""
+        await self._ensure_layout()
+        unique_nodes = list(dict.fromkeys(nodes))
+        states = tuple(states)
+        if len(unique_nodes) <= PER_NODE_QUERY_LIMIT:
+            results = await asyncio.gather(*(self.jobs_for_node(node, states) for node in unique_nodes))
+            return dict(zip(unique_nodes, results))
+
+        jobs_by_node: Dict[str, List[Dict]] = {node: [] for node in unique_nodes}
+        results = await asyncio.gather(*(
+            self._program_jobs([_memcmp(JOB_STATE_OFFSET, bytes([state]))])
+            for state in states
+        ))
+        for jobs in results:
+            for job in jobs:
+                if job["node"] in jobs_by_node:
+                    jobs_by_node[job["node"]].append(job)
+        return jobs_by_node
+
+    async def job_statuses(self, nodes: List[str]) -> Dict[str, str]:
+        """{node: 'running' | 'queue' | 'idle'} for many nodes"""
+        jobs_by_node = await self.jobs_for_nodes(nodes)
+        return {node: job_status_from_jobs(jobs) for node, jobs in jobs_by_node.items()}
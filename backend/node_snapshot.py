@@ -0,0 +1,253 @@
+"""
+One dashboard read per node per refresh cycle
+
+check_node_jobs (status and balances), scrape_latest_job_payment (payment of
+a finished job) and the history scraper (first page of jobs) all want data
+from the same dashboard host page. NodeSnapshotStore reads it once - through
+the dashboard data API when its endpoints are known, otherwise with a single
+page load - and hands the same NodeDashboardSnapshot to every caller until
+it is `max_age` seconds old. Concurrent requests for a node share one read.
+
+A page read fingerprints the jobs table in the page first (TABLE_HASH_JS);
+when it matches the previous snapshot's, the rows aren't read or parsed
+again and the previous jobs are reused.
+
+With DashboardBreakers attached, a node whose reads keep failing (or a
+dashboard that is down) is not read at all while its breaker is open; the
+last good snapshot is served instead. Snapshots are kept for the
+`max_entries` most recently read nodes and for at most `keep_seconds`.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from circuit_breaker import CircuitOpenError
+from dashboard_api import DASHBOARD_HOST_URL
+from dashboard_parsing import JOB_ROWS_JS, TABLE_HASH_JS, job_from_row, summary_from_text
+from page_waits import wait_for_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NodeDashboardSnapshot:
+    """Everything the backend reads from a node's dashboard page"""
+    address: str
+    job_status: Optional[str] = None
+    nos_balance: Optional[float] = None
+    sol_balance: Optional[float] = None
+    total_jobs: Optional[int] = None
+    availability_score: Optional[float] = None
+    jobs: List[Dict] = field(default_factory=list)  # first page of job history, newest first
+    source: str = "page"  # 'api' or 'page'
+    table_hash: Optional[str] = None  # TABLE_HASH_JS of the jobs table (page reads)
+    taken_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def latest_payment_usd(self) -> Optional[float]:
+        """Hourly rate of the newest job (the dashboard's price column)"""
+        if self.jobs and self.jobs[0].get("hourly_rate_usd"):
+            return self.jobs[0]["hourly_rate_usd"]
+        return None
+
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+
+class NodeSnapshotStore:
+    """
+    Cache of NodeDashboardSnapshot per node address
+
+    dashboard_api: DashboardAPI tried before rendering (None = always render)
+    nos_price_source: awaited by the API path when jobs carry no USD rate
+    discover: record the page's JSON endpoints while rendering
+    breakers: DashboardBreakers gating reads (None = always read)
+    max_entries, keep_seconds: bound on the nodes kept and how long a
+    snapshot is kept (as the last good one) after its read
+    """
+
+    def __init__(
+        self,
+        browser_pool,
+        dashboard_api=None,
+        max_age: float = 60.0,
+        nos_price_source: Optional[Callable[[], Awaitable[Optional[float]]]] = None,
+        discover: bool = False,
+        page_wait_stats=None,
+        breakers=None,
+        max_entries: int = 5000,
+        keep_seconds: float = 86400.0
+    ):
+        self.browser_pool = browser_pool
+        self.dashboard_api = dashboard_api
+        self.max_age = max_age
+        self.nos_price_source = nos_price_source
+        self.discover = discover
+        self.page_wait_stats = page_wait_stats
+        self.breakers = breakers
+        self.max_entries = max_entries
+        self.keep_seconds = max(keep_seconds, max_age)
+
+        self._snapshots: "OrderedDict[str, NodeDashboardSnapshot]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.coalesced = 0
+        self.reads = {"api": 0, "page": 0}
+        self.last_good_served = 0
+        self.table_unchanged = 0
+
+    async def get(self, address: str, max_age: Optional[float] = None) -> NodeDashboardSnapshot:
+        """Snapshot no older than max_age (default self.max_age), read now if needed"""
+        max_age = self.max_age if max_age is None else max_age
+        snapshot = self._snapshots.get(address)
+        if snapshot is not None and snapshot.age() <= max_age:
+            self.hits += 1
+            return snapshot
+
+        inflight = self._inflight.get(address)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The reading caller was cancelled - read again
+                return await self.get(address, max_age)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[address] = future
+        try:
+            snapshot = await self._read(address)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(address, None)
+        self._store(address, snapshot)
+        future.set_result(snapshot)
+        return snapshot
+
+    def _store(self, address: str, snapshot: NodeDashboardSnapshot):
+        """Keep the snapshot, dropping the least recently read and expired ones"""
+        self._snapshots[address] = snapshot
+        self._snapshots.move_to_end(address)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+        while self._snapshots:
+            oldest = next(iter(self._snapshots.values()))
+            if oldest.age() <= self.keep_seconds:
+                break
+            self._snapshots.popitem(last=False)
+
+    def peek(self, address: str, max_age: Optional[float] = None) -> Optional[NodeDashboardSnapshot]:
+        """Cached snapshot if it is fresh enough, without reading"""
+        max_age = self.max_age if max_age is None else max_age
+        snapshot = self._snapshots.get(address)
+        return snapshot if snapshot is not None and snapshot.age() <= max_age else None
+
+    def invalidate(self, address: str):
+        self._snapshots.pop(address, None)
+
+    async def _read(self, address: str) -> NodeDashboardSnapshot:
+        if self.breakers is None:
+            return await self._read_dashboard(address)
+
+        if not self.breakers.allow(address):
+            last_good = self._snapshots.get(address)
+            if last_good is None or last_good.age() > self.keep_seconds:
+                raise CircuitOpenError(f"dashboard circuit open for {address[:8]}")
+            self.last_good_served += 1
+            logger.debug(f"Circuit open for {address[:8]}, serving snapshot from {last_good.age():.0f}s ago")
+            return last_good
+        try:
+            snapshot = await self._read_dashboard(address)
+        except Exception:
+            self.breakers.record(address, ok=False)
+            raise
+        self.breakers.record(address, ok=True)
+        return snapshot
+
+    async def _read_dashboard(self, address: str) -> NodeDashboardSnapshot:
+        if self.dashboard_api is not None:
+            try:
+                snapshot = await self._read_api(address)
+                if snapshot is not None:
+                    self.reads["api"] += 1
+                    return snapshot
+            except Exception as e:
+                logger.debug(f"Dashboard API unavailable for {address[:8]}, rendering the page: {str(e)}")
+        snapshot = await self._read_page(address)
+        self.reads["page"] += 1
+        return snapshot
+
+    async def _read_api(self, address: str) -> Optional[NodeDashboardSnapshot]:
+        """Snapshot from the data API, or None unless it has both status and jobs"""
+        summary, jobs = await asyncio.gather(
+            self.dashboard_api.fetch_node_summary(address),
+            self.dashboard_api.fetch_job_history(address, 1, self.nos_price_source)
+        )
+        if not summary or not summary.get("job_status") or jobs is None:
+            return None
+        return NodeDashboardSnapshot(
+            address=address,
+            job_status=summary["job_status"],
+            nos_balance=summary.get("nos_balance"),
+            sol_balance=summary.get("sol_balance"),
+            total_jobs=summary.get("total_jobs"),
+            availability_score=summary.get("availability_score"),
+            jobs=jobs,
+            source="api"
+        )
+
+    async def _read_page(self, address: str) -> NodeDashboardSnapshot:
+        """Status, balances and the first page of jobs from one page load"""
+        recorded = []
+        async with self.browser_pool.page() as page:
+            if self.discover and self.dashboard_api is not None:
+                on_response, recorded = self.dashboard_api.recorder(address)
+                page.on("response", on_response)
+
+            await page.goto(DASHBOARD_HOST_URL.format(address=address), wait_until="networkidle", timeout=20000)
+            # Status is rendered client-side after the data arrives
+            await wait_for_text(page, "status", stats=self.page_wait_stats)
+            try:
+                await page.wait_for_selector("table", timeout=5000)
+            except Exception:
+                logger.debug(f"No jobs table on the dashboard for {address[:8]}")
+
+            text = await page.inner_text("body")
+            table_hash = await page.evaluate(TABLE_HASH_JS) or None
+            previous = self._snapshots.get(address)
+            if table_hash is not None and previous is not None and previous.table_hash == table_hash:
+                # Same jobs, same states: keep the parsed jobs
+                self.table_unchanged += 1
+                jobs = previous.jobs
+            else:
+                jobs = [job_from_row(row) for row in await page.evaluate(JOB_ROWS_JS)]
+
+        if recorded:
+            await self.dashboard_api.save(recorded)
+
+        summary = summary_from_text(text)
+        logger.info(f"📸 Dashboard snapshot for {address[:8]}...: {summary['job_status']}, {len(jobs)} jobs on page 1")
+        return NodeDashboardSnapshot(address=address, jobs=jobs, table_hash=table_hash, **summary)
+
+    def stats(self) -> Dict:
+        return {
+            "cached": len(self._snapshots),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "reads": dict(self.reads),
+            "last_good_served": self.last_good_served,
+            "table_unchanged": self.table_unchanged,
+            "max_age": self.max_age
+        }
@@ -0,0 +1,198 @@
+"""
+Declared layouts for Nosana on-chain accounts
+
+Job, market and node accounts are Anchor accounts: an 8 byte discriminator
+followed by the fields in declaration order. Fields are read straight from a
+memoryview over the account data with struct.unpack_from, so decoding never
+slices the buffer into intermediate bytes objects (pubkeys are the exception:
+they are copied once to render them as base58).
+"""
+import base64
+import hashlib
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from solders.pubkey import Pubkey
+
+NOSANA_JOBS_PROGRAM_ID = "nosJhNRqr2bc9g1nfGDcXXTXvYUmxD4cVwy2pMWhrYM"
+NOSANA_NODES_PROGRAM_ID = "nosNeZR64wiEhQc5j251bsP4WqDabT6hmz4PHyoHLGD"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Fixed-size field kinds: (struct format, size). None = decoded by hand.
+_FIXED_KINDS = {
+    "u8": ("<B", 1),
+    "bool": ("<?", 1),
+    "u16": ("<H", 2),
+    "u32": ("<I", 4),
+    "u64": ("<Q", 8),
+    "i64": ("<q", 8),
+    "u128": (None, 16),
+    "pubkey": (None, 32),
+    "bytes32": (None, 32),
+}
+# Variable-size kinds (u32 length prefix); only allowed after all fixed fields
+_DYNAMIC_KINDS = {"string", "vec_pubkey"}
+
+_U32 = struct.Struct("<I")
+
+
+def anchor_discriminator(account_name: str) -> bytes:
+    """First 8 bytes of sha256("account:<Name>")"""
+    return hashlib.sha256(f"account:{account_name}".encode()).digest()[:8]
+
+
+def _read_fixed(view: memoryview, kind: str, unpack, offset: int):
+    if unpack is not None:
+        return unpack(view, offset)[0]
+    if kind == "pubkey":
+        return str(Pubkey.from_bytes(view[offset:offset + 32].tobytes()))
+    if kind == "u128":
+        return int.from_bytes(view[offset:offset + 16], "little")
+    return view[offset:offset + 32].hex()
+
+
+class AccountLayout:
+    """
+    Field offsets and decoder for one Anchor account type
+
+    fields: [(name, kind), ...] in declaration order. Fixed-size fields get
+    precomputed offsets; trailing string/vec_pubkey fields are walked in order
+    and only when asked for.
+    """
+
+    def __init__(self, account_name: str, fields: Sequence[Tuple[str, str]]):
+        self.account_name = account_name
+        self.discriminator = anchor_discriminator(account_name)
+        self._fixed: List[Tuple[str, str, Optional[object], int]] = []  # (name, kind, unpack, offset)
+        self._dynamic: List[Tuple[str, str]] = []
+        self.offsets: Dict[str, int] = {}
+
+        offset = len(self.discriminator)
+        for name, kind in fields:
+            if kind in _DYNAMIC_KINDS:
+                self._dynamic.append((name, kind))
+                continue
+            if self._dynamic:
+                raise ValueError(f"{account_name}.{name}: fixed field after a variable-size field")
+            fmt, size = _FIXED_KINDS[kind]
+            unpack = struct.Struct(fmt).unpack_from if fmt else None
+            self._fixed.append((name, kind, unpack, offset))
+            self.offsets[name] = offset
+            offset += size
+        # Offset of the first variable-size field (= minimum account size)
+        self.size = offset
+
+    def offset(self, field: str) -> int:
+        return self.offsets[field]
+
+    def matches(self, data: Buffer) -> bool:
+        return len(data) >= self.size and data[:8] == self.discriminator
+
+    def decode(self, data: Buffer, fields: Optional[Iterable[str]] = None) -> Optional[Dict]:
+        """
+        Decode account data; None if it is not this account type
+
+        fields: only decode these (decoding pubkeys is the expensive part, so
+        asking for just e.g. node and state is much cheaper than everything)
+        """
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        if len(view) < self.size or view[:8] != self.discriminator:
+            return None
+
+        wanted = set(fields) if fields is not None else None
+        decoded = {}
+        for name, kind, unpack, offset in self._fixed:
+            if wanted is None or name in wanted:
+                decoded[name] = _read_fixed(view, kind, unpack, offset)
+
+        if self._dynamic and (wanted is None or any(name in wanted for name, _ in self._dynamic)):
+            offset = self.size
+            for name, kind in self._dynamic:
+                count = _U32.unpack_from(view, offset)[0]
+                offset += 4
+                if kind == "string":
+                    if wanted is None or name in wanted:
+                        decoded[name] = str(view[offset:offset + count], "utf-8", "replace")
+                    offset += count
+                else:
+                    if wanted is None or name in wanted:
+                        decoded[name] = [
+                            str(Pubkey.from_bytes(view[o:o + 32].tobytes()))
+                            for o in range(offset, offset + 32 * count, 32)
+                        ]
+                    offset += 32 * count
+        return decoded
+
+    def decode_many(self, accounts: List[Optional[Dict]], fields: Optional[Iterable[str]] = None) -> List[Optional[Dict]]:
+        """
+        Decode a getMultipleAccounts value list or a getProgramAccounts result in one pass
+
+        Returns one entry per input (None for missing accounts or other
+        account types). getProgramAccounts entries get their "address" added.
+        Account data must be base64 encoded.
+        """
+        fields = set(fields) if fields is not None else None
+        decoded = []
+        for entry in accounts:
+            if entry is None:
+                decoded.append(None)
+                continue
+            account = entry.get("account", entry)
+            try:
+                data = base64.b64decode(account["data"][0])
+            except (KeyError, IndexError, TypeError, ValueError):
+                decoded.append(None)
+                continue
+            result = self.decode(data, fields)
+            if result is not None and "pubkey" in entry:
+                result["address"] = entry["pubkey"]
+            decoded.append(result)
+        return decoded
+
+
+# nosana-jobs JobAccount (state: 0 queued, 1 running, 2 done, 3 stopped)
+JOB_ACCOUNT = AccountLayout("JobAccount", [
+    ("ipfs_job", "bytes32"),
+    ("ipfs_result", "bytes32"),
+    ("market", "pubkey"),
+    ("node", "pubkey"),
+    ("payer", "pubkey"),
+    ("price", "u64"),
+    ("project", "pubkey"),
+    ("state", "u8"),
+    ("time_end", "i64"),
+    ("time_start", "i64"),
+    ("timeout", "i64"),
+])
+
+# nosana-jobs MarketAccount (queue holds either queued jobs or queued nodes)
+MARKET_ACCOUNT = AccountLayout("MarketAccount", [
+    ("authority", "pubkey"),
+    ("job_expiration", "i64"),
+    ("job_price", "u64"),
+    ("job_timeout", "i64"),
+    ("job_type", "u8"),
+    ("vault", "pubkey"),
+    ("vault_bump", "u8"),
+    ("node_access_key", "pubkey"),
+    ("node_xnos_minimum", "u128"),
+    ("queue_type", "u8"),
+    ("queue", "vec_pubkey"),
+])
+
+# nosana-nodes NodeAccount
+NODE_ACCOUNT = AccountLayout("NodeAccount", [
+    ("authority", "pubkey"),
+    ("audited", "bool"),
+    ("architecture", "u8"),
+    ("country", "u16"),
+    ("cpu", "u16"),
+    ("gpu", "u16"),
+    ("memory", "u16"),
+    ("iops", "u16"),
+    ("storage", "u16"),
+    ("endpoint", "string"),
+    ("icon", "string"),
+    ("version", "string"),
+])
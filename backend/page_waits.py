@@ -0,0 +1,134 @@
+"""
+Event-driven waits for dashboard pagination
+
+After a Next click the scraper waits for the page to actually change instead
+of sleeping: the jobs table's row set (job links, so a different first job
+id counts as well) differs from the previous page, or the page's data
+request finishes. A timeout is only the backstop. Every wait is recorded in
+PageWaitStats so the time spent per page shows up in /api/metrics.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job links of the table rows (text for rows without a link), header row skipped
+TABLE_SIGNATURE_JS = """() => {
+    const table = document.querySelector('table');
+    if (!table) return '';
+    return Array.from(table.querySelectorAll('tr')).slice(1).map(row => {
+        const link = row.querySelector('td a');
+        return link ? link.getAttribute('href') : row.textContent.trim();
+    }).join('|');
+}"""
+
+# True once the table shows a different, non-empty row set (an empty table is a loading state)
+TABLE_CHANGED_JS = f"""previous => {{
+    const signature = ({TABLE_SIGNATURE_JS})();
+    return signature !== '' && signature !== previous;
+}}"""
+
+
+class PageWaitStats:
+    """Durations and outcomes of the last `window` page waits"""
+
+    def __init__(self, window: int = 500):
+        self.durations = deque(maxlen=window)
+        self.outcomes = Counter()
+
+    def record(self, seconds: float, outcome: str):
+        self.durations.append(seconds)
+        self.outcomes[outcome] += 1
+
+    def stats(self) -> Dict:
+        durations = sorted(self.durations)
+        if not durations:
+            return {"waits": 0, "outcomes": dict(self.outcomes)}
+        return {
+            "waits": sum(self.outcomes.values()),
+            "outcomes": dict(self.outcomes),
+            "avg_ms": round(1000 * sum(durations) / len(durations), 1),
+            "p50_ms": round(1000 * durations[len(durations) // 2], 1),
+            "p95_ms": round(1000 * durations[min(len(durations) - 1, int(len(durations) * 0.95))], 1),
+            "max_ms": round(1000 * durations[-1], 1)
+        }
+
+
+async def table_signature(page) -> str:
+    return await page.evaluate(TABLE_SIGNATURE_JS)
+
+
+async def wait_for_text(page, pattern: str, timeout: float = 5.0, stats: Optional[PageWaitStats] = None) -> str:
+    """Wait until the page body matches the regex `pattern` (case-insensitive): 'content' or 'timeout'"""
+    started = time.monotonic()
+    try:
+        await page.wait_for_function(
+            "pattern => new RegExp(pattern, 'i').test(document.body.innerText)",
+            arg=pattern, polling="raf", timeout=timeout * 1000
+        )
+        outcome = "content"
+    except Exception:
+        outcome = "timeout"
+    if stats is not None:
+        stats.record(time.monotonic() - started, outcome)
+    return outcome
+
+
+async def wait_for_table_change(
+    page,
+    previous: str,
+    request_filter: Optional[Callable] = None,
+    timeout: float = 10.0,
+    settle: float = 0.5,
+    stats: Optional[PageWaitStats] = None
+) -> str:
+    """
+    Wait until the jobs table no longer shows `previous` (a table_signature)
+
+    request_filter picks the page's data request; once it has finished the
+    table gets `settle` seconds to render it. Returns what ended the wait:
+    'rows_changed', 'response' (data arrived, rows unchanged) or 'timeout'.
+    """
+    started = time.monotonic()
+
+    async def rows_changed() -> str:
+        await page.wait_for_function(TABLE_CHANGED_JS, arg=previous, polling="raf", timeout=timeout * 1000)
+        return "rows_changed"
+
+    async def request_finished() -> str:
+        await page.wait_for_event("requestfinished", predicate=request_filter, timeout=timeout * 1000)
+        try:
+            await page.wait_for_function(TABLE_CHANGED_JS, arg=previous, polling="raf", timeout=settle * 1000)
+            return "rows_changed"
+        except Exception:
+            return "response"
+
+    pending = {asyncio.create_task(rows_changed())}
+    if request_filter is not None:
+        pending.add(asyncio.create_task(request_finished()))
+
+    outcome = "timeout"
+    try:
+        while pending and outcome == "timeout":
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    outcome = task.result()
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.monotonic() - started
+    if stats is not None:
+        stats.record(elapsed, outcome)
+    if outcome == "timeout":
+        logger.debug(f"Table did not change within {timeout:.0f}s")
+    return outcome
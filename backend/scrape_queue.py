@@ -0,0 +1,213 @@
+"""
+Mongo-backed queue of dashboard scrape jobs
+
+The API only enqueues scrapes and reads their results; scrape_worker.py
+processes claim them. A claim is a lease: a job whose worker crashed or hung
+becomes claimable again once its lease has expired, until max_attempts is
+reached. One pending/running job per address and kind at a time - enqueuing
+again returns the existing job (asking for a backfill upgrades it to one).
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ScrapeQueue:
+    """
+    Scrape jobs in `scrape_jobs`
+
+    kind: 'history' stores new jobs through store_scraped_jobs, 'live'
+    additionally keeps the scraped jobs in the result for the caller
+    """
+
+    def __init__(self, db, max_attempts: int = 3, keep_finished_hours: int = 24):
+        self.db = db
+        self.collection = db.scrape_jobs
+        self.max_attempts = max_attempts
+        self.keep_finished_hours = keep_finished_hours
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("id", unique=True)
+        await self.collection.create_index([("status", 1), ("lease_until", 1), ("created_at", 1)])
+        # At most one active job per address and kind
+        await self.collection.create_index(
+            [("address", 1), ("kind", 1)],
+            unique=True,
+            partialFilterExpression={"active": True},
+            name="one_active_job_per_address"
+        )
+        await self.collection.create_index("finished_at", expireAfterSeconds=self.keep_finished_hours * 3600)
+
+    async def enqueue(
+        self,
+        address: str,
+        user_id: str,
+        kind: str = "history",
+        backfill: bool = False,
+        max_pages: Optional[int] = None
+    ) -> Dict:
+        """Queue a scrape, or return the pending/running one for this address and kind"""
+        existing = await self.collection.find_one({"address": address, "kind": kind, "active": True}, {"_id": 0})
+        if existing:
+            if backfill and not existing.get("backfill"):
+                return await self._upgrade_to_backfill(existing)
+            return existing
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "address": address,
+            "user_id": user_id,
+            "backfill": backfill,
+            "max_pages": max_pages,
+            "status": STATUS_PENDING,
+            "active": True,
+            "attempts": 0,
+            "created_at": _now().isoformat(),
+            "lease_until": None,
+        }
+        try:
+            await self.collection.insert_one(dict(job))
+        except DuplicateKeyError:
+            # Enqueued concurrently by another request
+            return await self.collection.find_one({"address": address, "kind": kind, "active": True}, {"_id": 0})
+        return job
+
+    async def _upgrade_to_backfill(self, job: Dict) -> Dict:
+        """
+        A backfill asked for while a routine scrape of the address is queued
+
+        A pending job becomes the backfill; a running one is requeued as a
+        backfill when it finishes (complete/fail), since its worker has read
+        the flag already.
+        """
+        upgraded = await self.collection.find_one_and_update(
+            {"id": job["id"], "status": STATUS_PENDING},
+            {"$set": {"backfill": True}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if upgraded is not None:
+            return upgraded
+        marked = await self.collection.find_one_and_update(
+            {"id": job["id"], "active": True},
+            {"$set": {"backfill_requested": True}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        if marked is None:
+            # Finished in the meantime: queue the backfill on its own
+            return await self.enqueue(job["address"], job["user_id"], kind=job["kind"], backfill=True)
+        return marked
+
+    async def _requeue_backfill(self, job_id: str) -> bool:
+        """Put a finished job back as a backfill if one was asked for while it ran"""
+        requeued = await self.collection.find_one_and_update(
+            {"id": job_id, "backfill_requested": True},
+            {"$set": {
+                "status": STATUS_PENDING,
+                "backfill": True,
+                "backfill_requested": None,
+                "attempts": 0,
+                "lease_until": None
+            }},
+            projection={"_id": 0}
+        )
+        return requeued is not None
+
+    async def enqueue_many(self, addresses_by_user: List[Dict], kind: str = "history", backfill: bool = False) -> List[Dict]:
+        """enqueue() for [{'address', 'user_id'}, ...]"""
+        return [
+            await self.enqueue(item["address"], item["user_id"], kind=kind, backfill=backfill)
+            for item in addresses_by_user
+        ]
+
+    async def claim(self, worker: str, lease_seconds: float) -> Optional[Dict]:
+        """Take the oldest pending job, or a running one whose lease expired"""
+        now = _now()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": STATUS_PENDING},
+                {"status": STATUS_RUNNING, "lease_until": {"$lt": now.isoformat()}},
+            ], "attempts": {"$lt": self.max_attempts}},
+            {
+                "$set": {
+                    "status": STATUS_RUNNING,
+                    "worker": worker,
+                    "started_at": now.isoformat(),
+                    "lease_until": (now + timedelta(seconds=lease_seconds)).isoformat()
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def complete(self, job_id: str, result: Dict):
+        if await self._requeue_backfill(job_id):
+            return
+        await self.collection.update_one(
+            {"id": job_id},
+            {"$set": {
+                "status": STATUS_DONE,
+                "active": None,
+                "result": result,
+                "error": None,
+                "finished_at": _now()
+            }}
+        )
+
+    async def fail(self, job: Dict, error: str):
+        """Back to pending while attempts are left, otherwise failed"""
+        if await self._requeue_backfill(job["id"]):
+            return
+        if job.get("attempts", 0) < self.max_attempts:
+            update = {"status": STATUS_PENDING, "lease_until": None, "error": error}
+        else:
+            update = {"status": STATUS_FAILED, "active": None, "error": error, "finished_at": _now()}
+        await self.collection.update_one({"id": job["id"]}, {"$set": update})
+
+    async def expire_abandoned(self) -> int:
+        """Mark jobs that ran out of attempts on expired leases as failed"""
+        now = _now()
+        result = await self.collection.update_many(
+            {"status": STATUS_RUNNING, "lease_until": {"$lt": now.isoformat()}, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"status": STATUS_FAILED, "active": None, "error": "lease expired", "finished_at": now}}
+        )
+        return result.modified_count
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"id": job_id}, {"_id": 0})
+
+    async def wait(self, job_id: str, timeout: float, poll_interval: float = 0.5) -> Optional[Dict]:
+        """Poll until the job is done or failed; returns the last seen document"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            job = await self.get(job_id)
+            if job is None or job["status"] in (STATUS_DONE, STATUS_FAILED) or loop.time() >= deadline:
+                return job
+            await asyncio.sleep(poll_interval)
+
+    async def stats(self) -> Dict:
+        counts = await self.collection.aggregate([
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(None)
+        return {item["_id"]: item["count"] for item in counts}
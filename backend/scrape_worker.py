@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Dashboard scraper worker pool (runs outside the API process)
+
+A supervisor starts --processes worker processes and restarts any that die.
+Each worker claims jobs from the Mongo scrape queue (scrape_queue.py), runs
+up to --concurrency of them at a time with its own Chromium, and stores each
+scraped page as it arrives (scrape_and_store_job_history). A job that
+exceeds --timeout is cancelled and retried from its last stored page; jobs
+held by a crashed worker are picked up again when their lease expires. Memory used by Chromium stays out of uvicorn.
+
+Usage:
+  python scrape_worker.py [--processes 2] [--concurrency 2] [--timeout 300]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.append(str(Path(__file__).parent))
+
+from scrape_queue import ScrapeQueue
+
+logger = logging.getLogger("scrape_worker")
+
+# Lease on top of the job timeout before another worker may take the job
+LEASE_MARGIN_SECONDS = 60
+# Scraped jobs kept in a 'live' job's result
+LIVE_RESULT_LIMIT = 1000
+
+
+def serializable_jobs(jobs: List[Dict]) -> List[Dict]:
+    return [
+        {**job, "started": job["started"].isoformat() if isinstance(job["started"], datetime) else job["started"]}
+        for job in jobs
+    ]
+
+
+class ScrapeWorker:
+    """
+    Claims and runs scrape jobs, `concurrency` at a time
+
+    scrape(job) scrapes and stores, and returns {'jobs_scraped',
+    'jobs_stored'} plus the scraped 'jobs' for 'live' jobs.
+    """
+
+    def __init__(
+        self,
+        queue: ScrapeQueue,
+        scrape: Callable[[Dict], Awaitable[Dict]],
+        name: str,
+        concurrency: int = 2,
+        job_timeout: float = 300.0,
+        poll_interval: float = 2.0
+    ):
+        self.queue = queue
+        self.scrape = scrape
+        self.name = name
+        self.concurrency = concurrency
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+
+        self.completed = 0
+        self.failed = 0
+
+    async def run_job(self, job: Dict) -> bool:
+        started = time.monotonic()
+        address = job["address"]
+        try:
+            scraped = await asyncio.wait_for(self.scrape(job), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            self.failed += 1
+            logger.warning(f"⏱️ Scrape of {address[:8]}... timed out after {self.job_timeout:.0f}s (attempt {job['attempts']})")
+            await self.queue.fail(job, f"timed out after {self.job_timeout:.0f}s")
+            return False
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"❌ Scrape of {address[:8]}... failed (attempt {job['attempts']}): {str(e)}")
+            await self.queue.fail(job, str(e))
+            return False
+
+        result = {
+            "jobs_scraped": scraped["jobs_scraped"],
+            "jobs_stored": scraped["jobs_stored"],
+            "seconds": round(time.monotonic() - started, 1)
+        }
+        if job["kind"] == "live":
+            result["jobs"] = serializable_jobs(scraped.get("jobs", [])[:LIVE_RESULT_LIMIT])
+        await self.queue.complete(job["id"], result)
+        self.completed += 1
+        logger.info(
+            f"✅ Scraped {address[:8]}...: {result['jobs_scraped']} jobs, {result['jobs_stored']} new ({result['seconds']}s)"
+        )
+        return True
+
+    async def _slot(self, stop: asyncio.Event):
+        lease = self.job_timeout + LEASE_MARGIN_SECONDS
+        while not stop.is_set():
+            try:
+                job = await self.queue.claim(self.name, lease)
+            except Exception as e:
+                logger.warning(f"Could not claim a scrape job: {str(e)}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_job(job)
+
+    async def _expire_abandoned(self, stop: asyncio.Event):
+        """Fail jobs whose last attempt's worker died (their lease ran out)"""
+        while not stop.is_set():
+            try:
+                expired = await self.queue.expire_abandoned()
+                if expired:
+                    logger.warning(f"{expired} scrape jobs failed after their last worker died")
+            except Exception as e:
+                logger.debug(f"Could not expire abandoned scrape jobs: {str(e)}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=LEASE_MARGIN_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, stop: asyncio.Event):
+        logger.info(f"🛠️ Scrape worker {self.name} started ({self.concurrency} slots)")
+        await asyncio.gather(self._expire_abandoned(stop), *(self._slot(stop) for _ in range(self.concurrency)))
+
+
+def worker_process(index: int, concurrency: int, job_timeout: float):
+    """Entry point of one worker process"""
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s - worker{index} - %(levelname)s - %(message)s")
+    # Imported here so the supervisor itself never connects to Mongo or loads Chromium;
+    # job_history has the scraping without the API app
+    import job_history
+
+    async def scrape(job: Dict) -> Dict:
+        if job.get("max_pages") or job["kind"] == "live":
+            # Single page, or the whole history for the caller: collected, then stored
+            # Failures raise so the job goes back to the queue for a retry
+            jobs = await job_history.scrape_nosana_job_history(
+                job["address"], max_pages=job.get("max_pages"), raise_errors=True
+            )
+            stored = await job_history.store_scraped_jobs(job["user_id"], job["address"], jobs) if jobs else 0
+            return {"jobs_scraped": len(jobs), "jobs_stored": stored, "jobs": jobs}
+        # Stored page by page; a timed out walk resumes at its last stored page on retry
+        return await job_history.scrape_and_store_job_history(
+            job["user_id"], job["address"], backfill=job.get("backfill", False)
+        )
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+        queue = ScrapeQueue(job_history.db, max_attempts=job_history.SCRAPE_JOB_MAX_ATTEMPTS)
+        worker = ScrapeWorker(
+            queue, scrape,
+            name=f"{socket.gethostname()}:{os.getpid()}",
+            concurrency=concurrency,
+            job_timeout=job_timeout
+        )
+        try:
+            await worker.run(stop)
+        finally:
+            await job_history.browser_pool.stop()
+            await job_history.dashboard_api.close()
+
+    asyncio.run(main())
+
+
+def supervise(processes: int, concurrency: int, job_timeout: float, check_interval: float = 5.0):
+    """Keep `processes` workers running until SIGTERM/SIGINT"""
+    context = multiprocessing.get_context("spawn")
+    workers: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while not stopping:
+        for index in range(processes):
+            process = workers.get(index)
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                # Its jobs become claimable again when their leases expire
+                logger.warning(f"💥 Worker {index} exited with code {process.exitcode}, restarting")
+            process = context.Process(target=worker_process, args=(index, concurrency, job_timeout), daemon=True)
+            process.start()
+            workers[index] = process
+        time.sleep(check_interval)
+
+    logger.info("Stopping scrape workers")
+    for process in workers.values():
+        process.terminate()
+    for process in workers.values():
+        process.join(timeout=30)
+        if process.is_alive():
+            process.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=int(os.environ.get("SCRAPE_WORKER_PROCESSES", "2")))
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("SCRAPE_WORKER_CONCURRENCY", "2")))
+    parser.add_argument("--timeout", type=float, default=float(os.environ.get("SCRAPE_JOB_TIMEOUT", "300")))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - supervisor - %(levelname)s - %(message)s")
+    supervise(args.processes, args.concurrency, args.timeout)
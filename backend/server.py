@@ -5,7 +5,6 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
@@ -14,8 +13,7 @@ from typing import List, Optional, Dict
 import uuid
 from datetime import datetime, timezone, timedelta
 import requests
-from solana.rpc.api import Client as SolanaClient
-from solders.pubkey import Pubkey
+import httpx
 import base64
 import struct
 from passlib.context import CryptContext
@@ -24,6 +22,9 @@ import re
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from limits import parse as parse_rate_limit
+from limits.storage import MemoryStorage
+from limits.strategies import MovingWindowRateLimiter
 import html
 import secrets
 import firebase_admin
@@ -32,10 +33,25 @@ from telegram import Bot
 from telegram.constants import ParseMode
 import asyncio
 from bs4 import BeautifulSoup
-
-# Set Playwright browser path
-os.environ['PLAYWRIGHT_BROWSERS_PATH'] = '/pw-browsers'
-
+from solana_rpc import (
+    SolanaRPCClient, RPCResponseCache, NOS_MINT, EMPTY_DATA_SLICE, PRIORITY_BACKGROUND,
+    parse_token_ui_amount, rpc_priority
+)
+from account_subscriptions import AccountSubscriptionManager, ws_url_from_rpc_url
+from job_index import JobIndex, job_status_from_jobs
+from tx_cursor import NodeTransactionCursor
+from swr_cache import SWRCache
+from scrape_queue import ScrapeQueue
+from circuit_breaker import CircuitOpenError
+from job_history import (
+    NODE_SNAPSHOT_MAX_AGE, SCRAPE_JOB_MAX_ATTEMPTS, client, db, browser_pool, page_wait_stats, dashboard_api,
+    dashboard_breakers, node_snapshots, table_hash_stats, get_nos_token_price, fetch_nos_price_coingecko,
+    scrape_nosana_job_history, scrape_and_store_job_history, store_scraped_jobs
+)
+from status_sources import (
+    DASHBOARD_ONLY_FIELDS, SOURCE_CHAIN, SOURCE_DASHBOARD, SOURCE_JOB_INDEX, SOURCE_SIDECAR,
+    StatusSourceStats, dashboard_max_age, resolve_nos_balance
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -47,6 +63,60 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 43200  # 30 days
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_LOCKOUT_MINUTES = 15
 
+# Solana RPC settings
+SOLANA_RPC_URL = os.environ.get('SOLANA_RPC_URL', 'https://api.mainnet-beta.solana.com')
+# Comma-separated endpoint list for the RPC router (defaults to SOLANA_RPC_URL only)
+SOLANA_RPC_URLS = [url.strip() for url in os.environ.get('SOLANA_RPC_URLS', SOLANA_RPC_URL).split(',') if url.strip()]
+SOLANA_RPC_HEDGE = os.environ.get('SOLANA_RPC_HEDGE', 'false').lower() == 'true'  # Hedge slow calls to a 2nd endpoint
+SOLANA_RPC_POOL_SIZE = int(os.environ.get('SOLANA_RPC_POOL_SIZE', '20'))  # Max open connections
+SOLANA_RPC_KEEPALIVE = int(os.environ.get('SOLANA_RPC_KEEPALIVE', '10'))  # Idle connections kept warm
+SOLANA_RPC_TIMEOUT = float(os.environ.get('SOLANA_RPC_TIMEOUT', '10'))  # Seconds per request
+SOLANA_RPC_CONNECT_TIMEOUT = float(os.environ.get('SOLANA_RPC_CONNECT_TIMEOUT', '5'))
+# Per-endpoint request budget (public mainnet allows ~100 requests per 10s per IP); 0 disables
+SOLANA_RPC_RATE_LIMIT = float(os.environ.get('SOLANA_RPC_RATE_LIMIT', '8'))  # Requests per second
+SOLANA_RPC_BURST = float(os.environ.get('SOLANA_RPC_BURST', '20'))
+SOLANA_RPC_CACHE_ENABLED = os.environ.get('SOLANA_RPC_CACHE_ENABLED', 'true').lower() == 'true'
+SOLANA_RPC_CACHE_TTL_SLOTS = int(os.environ.get('SOLANA_RPC_CACHE_TTL_SLOTS', '25'))  # ~10s of slots
+SOLANA_RPC_CACHE_NEGATIVE_TTL_SLOTS = int(os.environ.get('SOLANA_RPC_CACHE_NEGATIVE_TTL_SLOTS', '5'))  # "Account not found"
+SOLANA_RPC_CACHE_MAX_ENTRIES = int(os.environ.get('SOLANA_RPC_CACHE_MAX_ENTRIES', '10000'))
+NODE_STATUS_CONCURRENCY = int(os.environ.get('NODE_STATUS_CONCURRENCY', '4'))  # Parallel job checks per refresh
+NOS_BALANCE_CONCURRENCY = int(os.environ.get('NOS_BALANCE_CONCURRENCY', '8'))  # Parallel NOS balance lookups
+
+# Account subscription settings (push updates over the Solana pubsub WebSocket)
+ACCOUNT_SUBSCRIPTIONS_ENABLED = os.environ.get('ACCOUNT_SUBSCRIPTIONS_ENABLED', 'true').lower() == 'true'
+SOLANA_WS_URL = os.environ.get('SOLANA_WS_URL', ws_url_from_rpc_url(SOLANA_RPC_URLS[0]))
+RECONCILE_INTERVAL_SECONDS = int(os.environ.get('RECONCILE_INTERVAL_SECONDS', '600'))  # Slow polling pass
+
+# Browser, dashboard API, circuit breaker and history scrape settings are in job_history.py
+LIVE_SCRAPE_FRESH_SECONDS = float(os.environ.get('LIVE_SCRAPE_FRESH_SECONDS', '120'))  # /earnings/.../live served from cache
+LIVE_SCRAPE_STALE_SECONDS = float(os.environ.get('LIVE_SCRAPE_STALE_SECONDS', '1800'))  # Served stale while one refresh runs
+# Public check-status endpoint: per-depth cache TTL and rate limits (per client, and across all clients)
+CHECK_STATUS_DEPTHS = ('basic', 'balances', 'full')
+CHECK_STATUS_CACHE_SECONDS = {
+    'basic': float(os.environ.get('CHECK_STATUS_BASIC_CACHE_SECONDS', '15')),
+    'balances': float(os.environ.get('CHECK_STATUS_BALANCES_CACHE_SECONDS', '60')),
+    'full': float(os.environ.get('CHECK_STATUS_FULL_CACHE_SECONDS', '300'))
+}
+CHECK_STATUS_LIMITS = {
+    'basic': os.environ.get('CHECK_STATUS_BASIC_LIMIT', '30/minute'),
+    'balances': os.environ.get('CHECK_STATUS_BALANCES_LIMIT', '10/minute'),
+    'full': os.environ.get('CHECK_STATUS_FULL_LIMIT', '3/minute')
+}
+CHECK_STATUS_GLOBAL_LIMITS = {
+    'basic': os.environ.get('CHECK_STATUS_BASIC_GLOBAL_LIMIT', '1200/minute'),
+    'balances': os.environ.get('CHECK_STATUS_BALANCES_GLOBAL_LIMIT', '300/minute'),
+    'full': os.environ.get('CHECK_STATUS_FULL_GLOBAL_LIMIT', '60/hour')  # Bounds dashboard reads the public can cause (cache misses only)
+}
+# Out-of-process scraping (scrape_worker.py consumes the Mongo queue; the API only enqueues)
+SCRAPE_WORKER_ENABLED = os.environ.get('SCRAPE_WORKER_ENABLED', 'false').lower() == 'true'
+LIVE_SCRAPE_WAIT_SECONDS = float(os.environ.get('LIVE_SCRAPE_WAIT_SECONDS', '120'))  # /live waits this long for a worker
+# Dashboard snapshot reuse beyond NODE_SNAPSHOT_MAX_AGE
+DASHBOARD_STATS_MAX_AGE = float(os.environ.get('DASHBOARD_STATS_MAX_AGE', '21600'))  # Reuse for total_jobs/availability when job status and balance came from chain
+
+# Per-node transaction cursor (job events and payments from getSignaturesForAddress)
+TX_CURSOR_ENABLED = os.environ.get('TX_CURSOR_ENABLED', 'true').lower() == 'true'
+TX_BATCH_SIZE = int(os.environ.get('TX_BATCH_SIZE', '20'))  # getTransaction calls per JSON-RPC batch
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -134,11 +204,6 @@ def clear_failed_login(email: str):
     if email in locked_accounts:
         del locked_accounts[email]
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # Configure logging EARLY
 logging.basicConfig(
     level=logging.INFO,
@@ -166,6 +231,51 @@ try:
 except Exception as e:
     logger.error(f"Failed to initialize Telegram Bot: {str(e)}")
 
+# Shared Solana RPC client (connection pool opened on startup, closed on shutdown)
+solana_rpc = SolanaRPCClient(
+    SOLANA_RPC_URLS,
+    pool_size=SOLANA_RPC_POOL_SIZE,
+    keepalive=SOLANA_RPC_KEEPALIVE,
+    timeout=SOLANA_RPC_TIMEOUT,
+    connect_timeout=SOLANA_RPC_CONNECT_TIMEOUT,
+    hedge=SOLANA_RPC_HEDGE,
+    rate_limit=SOLANA_RPC_RATE_LIMIT or None,
+    burst=SOLANA_RPC_BURST,
+    cache=RPCResponseCache(
+        ttl_slots=SOLANA_RPC_CACHE_TTL_SLOTS,
+        negative_ttl_slots=SOLANA_RPC_CACHE_NEGATIVE_TTL_SLOTS,
+        max_entries=SOLANA_RPC_CACHE_MAX_ENTRIES
+    ) if SOLANA_RPC_CACHE_ENABLED else None
+)
+
+# Running/queued job lookups straight from the Nosana jobs program
+job_index = JobIndex(solana_rpc)
+
+# New transactions per node since the stored cursor
+tx_cursor = NodeTransactionCursor(solana_rpc, db, batch_size=TX_BATCH_SIZE)
+
+# Nosana SDK service (Node.js sidecar on :3001), called without blocking the event loop
+sidecar_client = httpx.AsyncClient(base_url="http://localhost:3001", timeout=8)
+
+# Scrape jobs for the worker processes
+scrape_queue = ScrapeQueue(db, max_attempts=SCRAPE_JOB_MAX_ATTEMPTS)
+
+# Full job history scrapes per node address, shared by every user watching it
+live_scrape_cache = SWRCache(fresh_ttl=LIVE_SCRAPE_FRESH_SECONDS, stale_ttl=LIVE_SCRAPE_STALE_SECONDS)
+
+# Public check-status answers per depth (no stale window: a public request never starts a background read)
+check_status_caches = {
+    depth: SWRCache(fresh_ttl=ttl, stale_ttl=ttl, max_entries=5000)
+    for depth, ttl in CHECK_STATUS_CACHE_SECONDS.items()
+}
+
+# Global check-status budgets per depth, charged only when a check runs (cache hits are free)
+check_status_global_limiter = MovingWindowRateLimiter(MemoryStorage())
+check_status_global_limits = {depth: parse_rate_limit(limit) for depth, limit in CHECK_STATUS_GLOBAL_LIMITS.items()}
+
+# Which source (job index, SDK sidecar, chain, dashboard) answered each status field
+status_sources = StatusSourceStats()
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -384,221 +494,301 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     return User(**user)
 
 
-async def fetch_node_status_from_solana(address: str) -> dict:
-    """Fetch node status from Solana blockchain"""
+def offline_node_status(error: str) -> dict:
+    """Status dict for an address that has no account on Solana"""
+    return {
+        'status': 'offline',
+        'job_status': None,
+        'online': False,
+        'nos_balance': None,
+        'sol_balance': None,
+        'total_jobs': None,
+        'availability_score': None,
+        'error': error
+    }
+
+
+def unknown_node_status(error: str) -> dict:
+    """Status dict for an address whose status could not be fetched"""
+    return {
+        'status': 'unknown',
+        'job_status': None,
+        'online': False,
+        'sol_balance': None,
+        'nos_balance': None,
+        'total_jobs': None,
+        'availability_score': None,
+        'error': error
+    }
+
+
+def account_node_status(account_info: dict) -> dict:
+    """Status fields that come from the account itself (lamports and size)"""
+    lamports = account_info.get('lamports', 0)
+    
+    # Check if account has lamports (SOL balance)
+    has_balance = lamports > 0
+    # Data is sliced away to save bandwidth, so rely on the reported account size
+    has_data = account_info.get('space', 0) > 0
+    
+    # Determine basic status
+    if has_balance and has_data:
+        status = 'online'
+    elif has_balance:
+        status = 'online'
+    else:
+        status = 'offline'
+    
+    return {
+        'status': status,
+        'online': True,
+        'lamports': lamports,
+        'has_data': has_data,
+        'sol_balance': lamports / 1e9  # Convert lamports to SOL
+    }
+
+
+async def build_node_status(
+    address: str,
+    account_info: Optional[dict],
+    nos_balances: Optional[Dict[str, Optional[float]]] = None,
+    job_statuses: Optional[Dict[str, str]] = None
+) -> dict:
+    """Build the node status dict from a getAccountInfo/getMultipleAccounts value"""
     try:
-        # Connect to Solana mainnet
-        solana_client = SolanaClient("https://api.mainnet-beta.solana.com")
-        
-        # Convert address string to Pubkey
-        pubkey = Pubkey.from_string(address)
-        
-        # Get account info from Solana
-        response = solana_client.get_account_info(pubkey)
-        
-        if response.value is None:
-            return {
-                'status': 'offline',
-                'job_status': None,
-                'online': False,
-                'nos_balance': None,
-                'sol_balance': None,
-                'total_jobs': None,
-                'availability_score': None,
-                'error': 'Account not found on Solana'
-            }
+        if account_info is None:
+            return offline_node_status('Account not found on Solana')
         
         # Account exists on blockchain
-        account_info = response.value
-        
-        # Check if account has lamports (SOL balance)
-        has_balance = account_info.lamports > 0
-        has_data = account_info.data is not None and len(account_info.data) > 0
-        
-        # Determine basic status
-        if has_balance and has_data:
-            status = 'online'
-        elif has_balance:
-            status = 'online'
-        else:
-            status = 'offline'
-        
-        # Get SOL balance
-        sol_balance = account_info.lamports / 1e9  # Convert lamports to SOL
+        account_status = account_node_status(account_info)
         
         # Check for active jobs from Nosana Jobs program
-        job_data = await check_node_jobs(address, solana_client)
+        job_data = await check_node_jobs(address, nos_balances, job_statuses)
         
         return {
-            'status': status,
+            **account_status,
             'job_status': job_data.get('job_status'),
-            'online': True,
-            'lamports': account_info.lamports,
-            'has_data': has_data,
-            'sol_balance': sol_balance,
             'nos_balance': job_data.get('nos_balance'),
             'total_jobs': job_data.get('total_jobs'),
             'availability_score': job_data.get('availability_score')
         }
         
+    except Exception as e:
+        logger.error(f"Error building node status for {address[:8]}: {str(e)}")
+        return unknown_node_status(str(e))
+
+
+async def fetch_node_status_from_solana(address: str) -> dict:
+    """Fetch node status from Solana blockchain"""
+    try:
+        # Only lamports and account size are used, so skip the account data
+        account_info = await solana_rpc.get_account_info(address, data_slice=EMPTY_DATA_SLICE)
     except Exception as e:
         logger.error(f"Error fetching node status from Solana: {str(e)}")
-        return {
-            'status': 'unknown',
-            'job_status': None,
-            'online': False,
-            'sol_balance': None,
-            'nos_balance': None,
-            'total_jobs': None,
-            'availability_score': None,
-            'error': str(e)
-        }
+        return unknown_node_status(str(e))
+    
+    return await build_node_status(address, account_info)
+
+
+async def fetch_node_status_at_depth(address: str, depth: str) -> dict:
+    """
+    Node status for the public check-status endpoint
+    
+    basic: lamports and account size only (one getAccountInfo)
+    balances: plus the NOS balance from the node's token accounts
+    full: everything fetch_node_status_from_solana returns (job index, SDK
+    service, dashboard snapshot)
+    """
+    if depth == 'full':
+        return await fetch_node_status_from_solana(address)
+    
+    try:
+        account_info = await solana_rpc.get_account_info(address, data_slice=EMPTY_DATA_SLICE)
+    except Exception as e:
+        logger.error(f"Error fetching node status from Solana: {str(e)}")
+        return unknown_node_status(str(e))
+    if account_info is None:
+        return offline_node_status('Account not found on Solana')
+    
+    status_data = {**account_node_status(account_info), 'job_status': None}
+    if depth == 'balances':
+        try:
+            status_data['nos_balance'] = await solana_rpc.get_owner_token_balance(address, NOS_MINT)
+        except Exception as e:
+            logger.debug(f"Could not get NOS balance from blockchain: {str(e)}")
+            status_data['nos_balance'] = None
+    return status_data
 
 
-async def check_node_jobs(node_address: str, solana_client: SolanaClient) -> dict:
+async def fetch_nodes_status_batch(addresses: List[str], use_live: bool = True) -> Dict[str, dict]:
     """
-    Check node jobs using multiple methods (Playwright scraping)
+    Fetch status for many nodes with batched getMultipleAccounts calls
+    
+    Accounts are requested in chunks of up to 100 with a zero-length dataSlice.
+    Per-node job checks then run with bounded concurrency.
+    Returns {address: status dict} with the same dicts as fetch_node_status_from_solana.
+    
+    use_live: take lamports and NOS balances pushed over account subscriptions
+    instead of asking the RPC node again
+    """
+    unique_addresses = list(dict.fromkeys(addresses))
+    if not unique_addresses:
+        return {}
+    
+    accounts_by_address = {}
+    if use_live:
+        for address in unique_addresses:
+            latest = account_subscriptions.latest(address)
+            if latest is not None:
+                accounts_by_address[address] = latest['value']
+    
+    to_fetch = [address for address in unique_addresses if address not in accounts_by_address]
+    if to_fetch:
+        try:
+            accounts = await solana_rpc.get_multiple_accounts(to_fetch, data_slice=EMPTY_DATA_SLICE)
+        except Exception as e:
+            logger.error(f"Error fetching batched node status from Solana: {str(e)}")
+            return {address: unknown_node_status(str(e)) for address in unique_addresses}
+        
+        for address, account_info in zip(to_fetch, accounts):
+            accounts_by_address[address] = account_info
+            account_subscriptions.seed(address, account_info)
+    
+    existing = [address for address in unique_addresses if accounts_by_address[address] is not None]
+    
+    nos_balances = {}
+    if use_live:
+        for address in existing:
+            live_balance = live_nos_balance(address)
+            if live_balance is not None:
+                nos_balances[address] = live_balance
+    
+    # Resolve the remaining NOS balances in one bounded pass
+    nos_balances.update(await solana_rpc.get_owner_token_balances(
+        [address for address in existing if address not in nos_balances],
+        NOS_MINT,
+        concurrency=NOS_BALANCE_CONCURRENCY
+    ))
+    
+    # Job states for every node from a few getProgramAccounts calls
+    job_statuses = None
+    if existing:
+        try:
+            job_statuses = await job_index.job_statuses(existing)
+        except Exception as e:
+            logger.warning(f"On-chain job index unavailable, checking nodes one by one: {str(e)}")
+    
+    statuses = {}
+    semaphore = asyncio.Semaphore(NODE_STATUS_CONCURRENCY)
+    
+    async def build(address: str, account_info: Optional[dict]):
+        async with semaphore:
+            statuses[address] = await build_node_status(address, account_info, nos_balances, job_statuses)
+    
+    await asyncio.gather(*(
+        build(address, accounts_by_address[address])
+        for address in unique_addresses
+    ))
+    
+    logger.info(f"Fetched status for {len(unique_addresses)} nodes ({len(to_fetch)} via getMultipleAccounts)")
+    return statuses
+
+
+async def check_node_jobs(
+    node_address: str,
+    nos_balances: Optional[Dict[str, Optional[float]]] = None,
+    job_statuses: Optional[Dict[str, str]] = None
+) -> dict:
+    """
+    Check node jobs using multiple methods (on-chain job index, SDK service, Playwright scraping)
     Returns job status, NOS balance, SOL balance, and other stats
+    
+    A successful on-chain or SDK answer is final; the dashboard is only read
+    for the fields they can't provide (see status_sources.py)
+    
+    nos_balances: NOS balances already resolved by get_owner_token_balances,
+    used instead of a per-node lookup when this node's lookup there succeeded
+    job_statuses: job states already resolved by job_index.job_statuses
     """
+    sources = {'job_status': None, 'nos_balance': None, 'total_jobs': None, 'availability_score': None}
     try:
         # First, try to get NOS balance directly from Solana blockchain
         nos_balance = None
         try:
-            from solders.pubkey import Pubkey as SoldersPubkey
-            from solana.rpc.types import TokenAccountOpts
-            
-            # NOS token mint address
-            NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
-            
-            wallet_pubkey = SoldersPubkey.from_string(node_address)
-            nos_mint_pubkey = SoldersPubkey.from_string(NOS_MINT)
-            
-            # Get all NOS token accounts for this wallet
-            opts = TokenAccountOpts(mint=nos_mint_pubkey)
-            response = solana_client.get_token_accounts_by_owner(wallet_pubkey, opts)
+            # One jsonParsed lookup covers all NOS token accounts of this wallet
+            total_nos_balance = await resolve_nos_balance(
+                node_address, nos_balances, lambda owner: solana_rpc.get_owner_token_balance(owner, NOS_MINT)
+            )
             
-            if response and response.value:
-                # Sum up balances from all token accounts
-                total_nos_balance = 0.0
-                for account in response.value:
-                    token_account_pubkey = SoldersPubkey.from_string(str(account.pubkey))
-                    balance_response = solana_client.get_token_account_balance(token_account_pubkey)
-                    if balance_response and balance_response.value:
-                        # Use ui_amount for human-readable balance with decimals
-                        account_balance = balance_response.value.ui_amount
-                        if account_balance:
-                            total_nos_balance += account_balance
-                
-                if total_nos_balance > 0:
-                    nos_balance = total_nos_balance
-                    logger.info(f"✅ Got NOS balance from blockchain: {nos_balance:.2f} NOS for {node_address[:8]}...")
+            # A zero can be a lagging or partial RPC read; leave it to the dashboard
+            if total_nos_balance and total_nos_balance > 0:
+                nos_balance = total_nos_balance
+                sources['nos_balance'] = SOURCE_CHAIN
+                logger.info(f"✅ Got NOS balance from blockchain: {nos_balance:.2f} NOS for {node_address[:8]}...")
         except Exception as nos_error:
             logger.debug(f"Could not get NOS balance from blockchain: {str(nos_error)}")
         
-        # First, try the Node.js Nosana SDK service as primary method for job status
-        try:
-            response = requests.get(
-                f"http://localhost:3001/check-node/{node_address}",
-                timeout=8
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('jobStatus') != 'idle':
-                    return {
-                        'job_status': data.get('jobStatus', 'idle'),
-                        'nos_balance': nos_balance,  # Use blockchain balance
-                        'sol_balance': None,
-                        'total_jobs': None,
-                        'availability_score': None
-                    }
-        except Exception as sdk_error:
-            logger.debug(f"SDK service unavailable, trying web scraping: {str(sdk_error)}")
-        
-        # Fallback to web scraping the dashboard
-        from playwright.async_api import async_playwright
-        import re
+        # Primary: running/queued jobs straight from the Nosana jobs program
+        job_status = None
+        if job_statuses is not None and node_address in job_statuses:
+            job_status = job_statuses[node_address]
+            sources['job_status'] = SOURCE_JOB_INDEX
+        else:
+            try:
+                job_status = job_status_from_jobs(await job_index.jobs_for_node(node_address))
+                sources['job_status'] = SOURCE_JOB_INDEX
+            except Exception as index_error:
+                logger.debug(f"On-chain job index unavailable, trying SDK service: {str(index_error)}")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            url = f"https://dashboard.nosana.com/host/{node_address}"
-            
+        # Then the Node.js Nosana SDK service (only needed when the index failed)
+        if job_status is None:
             try:
-                await page.goto(url, wait_until='networkidle', timeout=20000)
-                await page.wait_for_timeout(2000)
-                
-                # Get page text
-                text_content = await page.inner_text('body')
-                text_lower = text_content.lower()
-                
-                await browser.close()
-                
-                # Parse job status
-                job_status = 'idle'
-                if 'status' in text_lower and 'running' in text_lower:
-                    if 'running deployment' in text_lower:
-                        logger.info(f"Node {node_address[:8]}... has RUNNING deployment")
-                        job_status = 'running'
-                    elif 'status\nrunning' in text_lower or 'status:\nrunning' in text_lower:
-                        logger.info(f"Node {node_address[:8]}... status is RUNNING")
-                        job_status = 'running'
-                
-                if 'queued' in text_lower or 'queue' in text_lower:
-                    logger.info(f"Node {node_address[:8]}... has queued jobs")
-                    job_status = 'queue'
-                
-                if 'online' in text_lower or 'host api status\nonline' in text_lower:
-                    logger.info(f"Node {node_address[:8]}... is online but idle")
-                
-                # Extract NOS balance from scraping (if not already got from blockchain)
-                scraped_nos_balance = None
-                nos_match = re.search(r'(\d+\.?\d*)\s*nos', text_lower)
-                if nos_match:
-                    scraped_nos_balance = float(nos_match.group(1))
-                
-                # Use blockchain balance if available, otherwise use scraped balance
-                final_nos_balance = nos_balance if nos_balance is not None else scraped_nos_balance
-                
-                # Extract SOL balance
-                sol_balance = None
-                sol_match = re.search(r'(\d+\.?\d*)\s*sol', text_lower)
-                if sol_match:
-                    sol_balance = float(sol_match.group(1))
-                
-                # Extract total jobs
-                total_jobs = None
-                jobs_match = re.search(r'(\d+)\s*job', text_lower)
-                if jobs_match:
-                    total_jobs = int(jobs_match.group(1))
-                
-                # Extract availability score (percentage)
-                availability_score = None
-                avail_match = re.search(r'availability[:\s]+(\d+\.?\d*)%', text_lower)
-                if not avail_match:
-                    avail_match = re.search(r'uptime[:\s]+(\d+\.?\d*)%', text_lower)
-                if avail_match:
-                    availability_score = float(avail_match.group(1))
-                
-                return {
-                    'job_status': job_status,
-                    'nos_balance': final_nos_balance,
-                    'sol_balance': sol_balance,
-                    'total_jobs': total_jobs,
-                    'availability_score': availability_score
-                }
-                
-            except Exception as page_error:
-                await browser.close()
-                logger.warning(f"Error scraping dashboard for {node_address[:8]}: {str(page_error)}")
-                return {
-                    'job_status': 'idle',
-                    'nos_balance': nos_balance,  # Still return blockchain balance even if scraping fails
-                    'sol_balance': None,
-                    'total_jobs': None,
-                    'availability_score': None
-                }
+                response = await sidecar_client.get(f"/check-node/{node_address}")
+            
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get('success'):
+                        job_status = data.get('jobStatus') or 'idle'
+                        sources['job_status'] = SOURCE_SIDECAR
+            except Exception as sdk_error:
+                logger.debug(f"SDK service unavailable, trying web scraping: {str(sdk_error)}")
+        
+        result = {
+            'job_status': job_status or 'idle',
+            'nos_balance': nos_balance,  # Use blockchain balance
+            'sol_balance': None,
+            'total_jobs': None,
+            'availability_score': None
+        }
+        
+        # The dashboard snapshot only for what the sources above couldn't answer: a
+        # current read if one of them failed, an older one will do for the dashboard-only fields
+        max_age = dashboard_max_age(
+            sources['job_status'], sources['nos_balance'], NODE_SNAPSHOT_MAX_AGE, DASHBOARD_STATS_MAX_AGE
+        )
+        try:
+            snapshot = await node_snapshots.get(node_address, max_age=max_age)
+        except CircuitOpenError:
+            logger.debug(f"Dashboard circuit open for {node_address[:8]}, no earlier snapshot")
+            return result
+        except Exception as snapshot_error:
+            logger.warning(f"Error reading dashboard for {node_address[:8]}: {str(snapshot_error)}")
+            return result  # Still return blockchain values even if scraping fails
+        
+        if sources['job_status'] is None:
+            result['job_status'] = snapshot.job_status or 'idle'
+            sources['job_status'] = SOURCE_DASHBOARD
+            if snapshot.job_status != 'idle':
+                logger.info(f"Node {node_address[:8]}... dashboard status is {snapshot.job_status}")
+        if sources['nos_balance'] is None and snapshot.nos_balance is not None:
+            result['nos_balance'] = snapshot.nos_balance
+            sources['nos_balance'] = SOURCE_DASHBOARD
+        result['sol_balance'] = snapshot.sol_balance
+        for field in DASHBOARD_ONLY_FIELDS:
+            result[field] = getattr(snapshot, field)
+            if result[field] is not None:
+                sources[field] = SOURCE_DASHBOARD
+        return result
             
     except Exception as e:
         logger.error(f"Error checking node jobs: {str(e)}")
@@ -609,6 +799,8 @@ async def check_node_jobs(node_address: str, solana_client: SolanaClient) -> dic
             'total_jobs': None,
             'availability_score': None
         }
+    finally:
+        status_sources.record(sources)
 
 
 # Authentication endpoints
@@ -1025,311 +1217,6 @@ async def send_telegram_notification(user_id: str, message: str):
 
 
 
-async def get_nos_token_price() -> Optional[float]:
-    """Fetch current NOS token price in USD from CoinGecko API"""
-    try:
-        response = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price?ids=nosana&vs_currencies=usd",
-            timeout=5
-        )
-        if response.status_code == 200:
-            data = response.json()
-            price = data.get('nosana', {}).get('usd')
-            if price:
-                logger.info(f"💰 NOS Token Price: ${price:.4f} USD")
-                return float(price)
-        logger.warning(f"Failed to fetch NOS price: {response.status_code}")
-    except Exception as e:
-        logger.error(f"Error fetching NOS price: {str(e)}")
-    return None
-
-
-def fetch_nos_price_coingecko() -> Optional[float]:
-    """Synchronous version - Fetch current NOS token price in USD from CoinGecko API"""
-    try:
-        response = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price?ids=nosana&vs_currencies=usd",
-            timeout=5
-        )
-        if response.status_code == 200:
-            data = response.json()
-            price = data.get('nosana', {}).get('usd')
-            if price:
-                return float(price)
-    except Exception as e:
-        logger.error(f"Error fetching NOS price: {str(e)}")
-    return None
-
-
-async def scrape_nosana_job_history(node_address: str, max_pages: int = None) -> List[Dict]:
-    """
-    Scrape actual job history data from Nosana dashboard using Playwright
-    Supports pagination to get all historical jobs
-    
-    Args:
-        node_address: Node address to scrape
-        max_pages: Maximum number of pages to scrape (None = all pages)
-    
-    Returns list of jobs with real payment data
-    """
-    try:
-        from playwright.async_api import async_playwright
-        
-        url = f"https://dashboard.nosana.com/host/{node_address}"
-        logger.info(f"🌐 Scraping Nosana dashboard for node: {node_address}")
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-            
-            try:
-                # Navigate to page
-                await page.goto(url, wait_until='networkidle', timeout=15000)
-                
-                # Wait for table to load
-                await page.wait_for_selector('table', timeout=10000)
-                
-                all_jobs = []
-                page_num = 1
-                
-                while True:
-                    logger.info(f"📄 Scraping page {page_num}...")
-                    
-                    # Extract job data from current page
-                    jobs_data = await page.evaluate('''() => {
-                        const jobs = [];
-                        const table = document.querySelector('table');
-                        if (!table) return jobs;
-                        
-                        const rows = table.querySelectorAll('tr');
-                        
-                        for (let i = 1; i < rows.length; i++) {
-                            const row = rows[i];
-                            const cells = row.querySelectorAll('td');
-                            
-                            if (cells.length >= 6) {
-                                const jobLink = cells[0].querySelector('a');
-                                const jobId = jobLink ? jobLink.getAttribute('href').split('/').pop() : null;
-                                
-                                jobs.push({
-                                    job_id: jobId,
-                                    started: cells[2].textContent.trim(),
-                                    duration: cells[3].textContent.trim(),
-                                    price: cells[4].textContent.trim(),
-                                    gpu: cells[5].textContent.trim(),
-                                    status: cells[6].textContent.trim().includes('RUNNING') ? 'RUNNING' : 'SUCCESS'
-                                });
-                            }
-                        }
-                        
-                        return jobs;
-                    }''')
-                    
-                    # Parse and add to all_jobs
-                    for job_data in jobs_data:
-                        duration_seconds = parse_duration_to_seconds(job_data['duration'])
-                        hourly_rate = parse_hourly_rate(job_data['price'])
-                        started_time = parse_relative_time(job_data['started'])
-                        
-                        job = {
-                            "job_id": job_data['job_id'],
-                            "started": started_time,
-                            "started_text": job_data['started'],
-                            "duration_seconds": duration_seconds,
-                            "duration_text": job_data['duration'],
-                            "hourly_rate_usd": hourly_rate,
-                            "gpu_type": job_data['gpu'],
-                            "status": job_data['status']
-                        }
-                        
-                        all_jobs.append(job)
-                    
-                    logger.info(f"✅ Page {page_num}: {len(jobs_data)} jobs")
-                    
-                    # Check if max_pages reached
-                    if max_pages and page_num >= max_pages:
-                        logger.info(f"🛑 Reached max pages limit: {max_pages}")
-                        break
-                    
-                    # Check for "Next" button
-                    next_button = await page.query_selector('button:has-text("Next"), a:has-text("Next"), button[aria-label*="next" i]')
-                    
-                    if next_button:
-                        # Check if button is disabled
-                        is_disabled = await next_button.evaluate('el => el.disabled || el.classList.contains("disabled")')
-                        
-                        if not is_disabled:
-                            # Click next button
-                            await next_button.click()
-                            await page.wait_for_timeout(2000)  # Wait for new data to load
-                            page_num += 1
-                        else:
-                            logger.info(f"✅ Reached last page (button disabled)")
-                            break
-                    else:
-                        # No next button found - check for pagination links
-                        pagination = await page.query_selector('nav[role="navigation"], div[class*="pagination"]')
-                        
-                        if pagination:
-                            # Try to find and click next page number
-                            next_page_link = await pagination.query_selector(f'a:has-text("{page_num + 1}"), button:has-text("{page_num + 1}")')
-                            
-                            if next_page_link:
-                                await next_page_link.click()
-                                await page.wait_for_timeout(2000)
-                                page_num += 1
-                            else:
-                                logger.info(f"✅ No more pages (no next link)")
-                                break
-                        else:
-                            logger.info(f"✅ Single page only (no pagination)")
-                            break
-                
-                await browser.close()
-                
-                logger.info(f"🎉 Successfully scraped {len(all_jobs)} total jobs from {page_num} pages")
-                return all_jobs
-                
-            except Exception as e:
-                await browser.close()
-                logger.error(f"Error during Playwright scraping: {str(e)}")
-                return []
-        
-    except Exception as e:
-        logger.error(f"Error scraping Nosana dashboard: {str(e)}")
-        return []
-
-
-def parse_duration_to_seconds(duration_text: str) -> int:
-    """Convert duration text like '55m 9s' or '1h 23m' to seconds"""
-    try:
-        seconds = 0
-        # Match hours
-        hours_match = re.search(r'(\d+)h', duration_text)
-        if hours_match:
-            seconds += int(hours_match.group(1)) * 3600
-        
-        # Match minutes
-        minutes_match = re.search(r'(\d+)m', duration_text)
-        if minutes_match:
-            seconds += int(minutes_match.group(1)) * 60
-        
-        # Match seconds
-        seconds_match = re.search(r'(\d+)s', duration_text)
-        if seconds_match:
-            seconds += int(seconds_match.group(1))
-        
-        return seconds
-    except Exception as e:
-        logger.error(f"Error parsing duration '{duration_text}': {str(e)}")
-        return 0
-
-
-def parse_hourly_rate(price_text: str) -> float:
-    """Extract hourly rate from price text like '$0.176' or '$0.192/h'"""
-    try:
-        # Remove '/h' suffix and '$' prefix
-        rate_str = price_text.replace('/h', '').replace('$', '').strip()
-        return float(rate_str)
-    except Exception as e:
-        logger.error(f"Error parsing hourly rate '{price_text}': {str(e)}")
-        return 0.0
-
-
-def parse_relative_time(time_text: str) -> datetime:
-    """Convert relative time like '3 hours ago' to datetime"""
-    try:
-        now = datetime.now(timezone.utc)
-        
-        # Match patterns like "3 hours ago", "33 minutes ago", "2 days ago"
-        hours_match = re.search(r'(\d+)\s+hours?\s+ago', time_text)
-        if hours_match:
-            return now - timedelta(hours=int(hours_match.group(1)))
-        
-        minutes_match = re.search(r'(\d+)\s+minutes?\s+ago', time_text)
-        if minutes_match:
-            return now - timedelta(minutes=int(minutes_match.group(1)))
-        
-        days_match = re.search(r'(\d+)\s+days?\s+ago', time_text)
-        if days_match:
-            return now - timedelta(days=int(days_match.group(1)))
-        
-        # Default to now if can't parse
-        return now
-    except Exception as e:
-        logger.error(f"Error parsing relative time '{time_text}': {str(e)}")
-        return datetime.now(timezone.utc)
-
-
-async def store_scraped_jobs(user_id: str, node_address: str, jobs: List[Dict]):
-    """
-    Store scraped jobs from Nosana dashboard in MongoDB
-    Prevents duplicates by job_id
-    """
-    try:
-        if not jobs:
-            return 0
-        
-        nos_price = fetch_nos_price_coingecko() or 0.1
-        stored_count = 0
-        
-        for job in jobs:
-            # Skip if job already exists
-            existing = await db.scraped_jobs.find_one({
-                "job_id": job['job_id'],
-                "node_address": node_address
-            })
-            
-            if existing:
-                continue
-            
-            # Calculate earnings
-            duration_hours = job['duration_seconds'] / 3600.0
-            usd_earned = duration_hours * job['hourly_rate_usd']
-            nos_earned = usd_earned / nos_price if nos_price > 0 else 0
-            
-            # Calculate completion time: started + duration
-            started_dt = job['started'] if isinstance(job['started'], datetime) else datetime.fromisoformat(job['started'].replace('Z', '+00:00'))
-            
-            # For SUCCESS jobs, calculate completed time
-            if job['status'] == 'SUCCESS':
-                completed_dt = started_dt + timedelta(seconds=job['duration_seconds'])
-                completed = completed_dt.isoformat()
-            else:
-                # RUNNING jobs - not completed yet
-                completed = None
-            
-            # Store job
-            job_doc = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "node_address": node_address,
-                "job_id": job['job_id'],
-                "started": started_dt.isoformat(),
-                "started_text": job.get('started_text', ''),
-                "completed": completed,
-                "duration_seconds": job['duration_seconds'],
-                "duration_text": job.get('duration_text', ''),
-                "hourly_rate_usd": job['hourly_rate_usd'],
-                "usd_earned": round(usd_earned, 4),
-                "nos_earned": round(nos_earned, 2),
-                "nos_price_at_time": nos_price,
-                "gpu_type": job['gpu_type'],
-                "status": job['status'],
-                "scraped_at": datetime.now(timezone.utc).isoformat()
-            }
-            
-            await db.scraped_jobs.insert_one(job_doc)
-            stored_count += 1
-        
-        logger.info(f"✅ Stored {stored_count} new jobs for node {node_address[:8]}...")
-        return stored_count
-        
-    except Exception as e:
-        logger.error(f"Error storing scraped jobs: {str(e)}")
-        return 0
-
-
 async def get_yesterday_scraped_earnings(user_id: str, node_address: str, user_timezone: str = "UTC") -> Dict:
     """Get yesterday's earnings from scraped data using user's timezone"""
     try:
@@ -1545,6 +1432,7 @@ def calculate_job_payment(duration_seconds: int, nos_price_usd: Optional[float],
 async def scrape_latest_job_payment(node_address: str) -> Optional[float]:
     """
     Scrape the ACTUAL payment amount from Nosana dashboard for the most recent job
+    (read from the node's dashboard snapshot)
     
     Args:
         node_address: Node's Solana address
@@ -1553,62 +1441,16 @@ async def scrape_latest_job_payment(node_address: str) -> Optional[float]:
         Actual payment amount in USD from dashboard's price column, or None if scraping fails
     """
     try:
-        from playwright.async_api import async_playwright
-        import re
-        
         logger.info(f"🔍 Scraping latest job payment for {node_address[:12]}...")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            url = f"https://dashboard.nosana.com/host/{node_address}"
-            await page.goto(url, wait_until='networkidle', timeout=15000)
-            await page.wait_for_selector('table', timeout=10000)
-            
-            # Extract the FIRST job (most recent) with ACTUAL price from dashboard
-            latest_job = await page.evaluate('''() => {
-                const table = document.querySelector('table');
-                if (!table) return null;
-                
-                const rows = table.querySelectorAll('tr');
-                
-                // Get first job (index 1, after header)
-                if (rows.length < 2) return null;
-                
-                const row = rows[1];
-                const cells = row.querySelectorAll('td');
-                
-                if (cells.length >= 6) {
-                    // Column 4 is the price column with ACTUAL payment
-                    const priceText = cells[4].textContent.trim();
-                    
-                    return {
-                        price: priceText,
-                        status: cells[6].textContent.trim()
-                    };
-                }
-                
-                return null;
-            }''')
-            
-            await browser.close()
-            
-            if latest_job and latest_job['price']:
-                # Parse the actual payment amount from price column
-                # Remove "/h" if present and extract numeric value
-                price_text = latest_job['price'].replace('/h', '').replace('$', '').strip()
-                
-                try:
-                    actual_payment = float(price_text)
-                    logger.info(f"✅ Scraped ACTUAL payment: ${actual_payment:.3f} (from dashboard price column)")
-                    return actual_payment
-                except:
-                    logger.error(f"⚠️  Could not parse price: {latest_job['price']}")
-                    return None
-            else:
-                logger.warning(f"⚠️  No job data found on dashboard for {node_address[:12]}")
-                return None
+        # Newest job's price column, from the snapshot this refresh already took if there is one
+        snapshot = await node_snapshots.get(node_address)
+        actual_payment = snapshot.latest_payment_usd
+        if actual_payment is None:
+            logger.warning(f"⚠️  No job data found on dashboard for {node_address[:12]}")
+            return None
+        logger.info(f"✅ Got ACTUAL payment from dashboard ({snapshot.source}): ${actual_payment:.3f}")
+        return actual_payment
                 
     except Exception as e:
         logger.error(f"❌ Error scraping job payment: {str(e)}")
@@ -1892,6 +1734,9 @@ async def add_node(request: Request, input: NodeCreate, current_user: User = Dep
     
     await db.nodes.insert_one(doc)
     
+    if ACCOUNT_SUBSCRIPTIONS_ENABLED:
+        asyncio.create_task(subscribe_node_accounts(input.address))
+    
     logger.info(f"Node added by {current_user.email}: {input.address[:8]}...")
     
     return node_obj
@@ -1940,34 +1785,54 @@ async def update_node(node_id: str, update: NodeUpdate, current_user: User = Dep
 @api_router.delete("/nodes/{node_id}")
 async def delete_node(node_id: str, current_user: User = Depends(get_current_user)):
     """Delete a node"""
-    result = await db.nodes.delete_one({"id": node_id, "user_id": current_user.id})
-    if result.deleted_count == 0:
+    node = await db.nodes.find_one_and_delete({"id": node_id, "user_id": current_user.id})
+    if not node:
         raise HTTPException(status_code=404, detail="Node not found")
+    
+    if ACCOUNT_SUBSCRIPTIONS_ENABLED:
+        asyncio.create_task(unsubscribe_node_accounts(node['address']))
+    
     return {"message": "Node deleted successfully"}
 
 
+def check_status_depth(request: Request) -> str:
+    depth = request.query_params.get('depth', 'basic')
+    return depth if depth in CHECK_STATUS_DEPTHS else 'basic'
+
+
+def check_status_client_key(request: Request) -> str:
+    """Rate limit bucket per client and depth"""
+    return f"{get_remote_address(request)}|{check_status_depth(request)}"
+
+
 @api_router.get("/nodes/{address}/check-status")
-@limiter.limit("30/minute")  # Rate limit status checks
-async def check_node_status_blockchain(request: Request, address: str):
-    """Check node status from Solana blockchain"""
+@limiter.limit(lambda key: CHECK_STATUS_LIMITS[key.rsplit('|', 1)[1]], key_func=check_status_client_key)
+async def check_node_status_blockchain(request: Request, address: str, depth: str = 'basic'):
+    """
+    Check node status from Solana blockchain
+    
+    depth: 'basic' (lamports only, default), 'balances' (plus NOS) or 'full'
+    (job status and dashboard stats). Each depth has its own cache and rate limits:
+    one per client, and a global one that only answers served from cache don't use.
+    """
     # Validate address format
     if not validate_solana_address(address):
         raise HTTPException(status_code=400, detail="Invalid Solana address format")
+    if depth not in CHECK_STATUS_DEPTHS:
+        raise HTTPException(status_code=400, detail=f"depth must be one of: {', '.join(CHECK_STATUS_DEPTHS)}")
     
-    status_data = await fetch_node_status_from_solana(address)
-    return status_data
+    async def check():
+        if not check_status_global_limiter.hit(check_status_global_limits[depth], 'check-status', depth):
+            raise HTTPException(status_code=429, detail="Too many status checks right now. Please try again later.")
+        return await fetch_node_status_at_depth(address, depth)
+    
+    status_data, cache_state = await check_status_caches[depth].get(address, check)
+    return {**status_data, 'depth': depth, 'cache': cache_state}
 
 
-@api_router.post("/nodes/refresh-all-status")
-@limiter.limit("10/minute")  # Rate limit bulk refresh
-async def refresh_all_nodes_status(request: Request, current_user: User = Depends(get_current_user)):
-    """Automatically refresh status for all nodes from Solana blockchain"""
-    nodes = await db.nodes.find({"user_id": current_user.id}, {"_id": 0}).to_list(1000)
-    updated_count = 0
-    errors = []
-    
-    # Get user notification preferences
-    prefs = await db.notification_preferences.find_one({"user_id": current_user.id})
+async def get_notification_prefs(user_id: str) -> dict:
+    """Get user notification preferences, falling back to defaults"""
+    prefs = await db.notification_preferences.find_one({"user_id": user_id})
     if not prefs:
         prefs = {
             "notify_offline": True,
@@ -1975,21 +1840,114 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
             "notify_job_started": True,
             "notify_job_completed": True
         }
+    return prefs
+
+
+async def notify_node_status_change(user_id: str, node: dict, current_status: str, prefs: dict):
+    """Send offline/online notifications when a node's status flips"""
+    address = node['address']
+    node_name = node.get('name') or f"{address[:8]}..."
+    previous_status = node.get('status', 'unknown')
+    
+    if previous_status != current_status:
+        logger.info(f"Node {node_name} status changed: {previous_status} -> {current_status}")
+    
+    # Notify on offline
+    if previous_status == 'online' and current_status == 'offline' and prefs.get('notify_offline', True):
+        logger.info(f"Sending offline notification for {node_name}")
+        await send_notification_to_user(
+            user_id,
+            "⚠️ Node Went Offline",
+            f"{node_name} is now OFFLINE",
+            address
+        )
+    
+    # Notify on online
+    elif previous_status == 'offline' and current_status == 'online' and prefs.get('notify_online', True):
+        logger.info(f"Sending online notification for {node_name}")
+        await send_notification_to_user(
+            user_id,
+            "✅ Node Back Online",
+            f"{node_name} is back ONLINE",
+            address
+        )
+
+
+async def check_low_sol_balance(user_id: str, node: dict, sol_balance: Optional[float]):
+    """Alert (at most once per 24 hours) when a node's SOL balance is critically low"""
+    address = node['address']
+    node_name = node.get('name') or f"{address[:8]}..."
+    
+    # Alert if SOL balance drops below 0.006 (critical threshold)
+    if sol_balance is not None and sol_balance < 0.006:
+        # Only send if we haven't sent alert in last 24 hours
+        last_alert = node.get('last_low_balance_alert')
+        should_alert = True
+        
+        if last_alert:
+            try:
+                if isinstance(last_alert, str):
+                    last_alert_time = datetime.fromisoformat(last_alert.replace('Z', '+00:00'))
+                else:
+                    last_alert_time = last_alert
+                
+                hours_since_alert = (datetime.now(timezone.utc) - last_alert_time).total_seconds() / 3600
+                should_alert = hours_since_alert >= 24  # Send max once per 24 hours
+            except:
+                should_alert = True
+        
+        if should_alert:
+            logger.info(f"⚠️ CRITICAL: Low SOL balance detected for {node_name}: {sol_balance:.6f} SOL")
+            
+            # Send notification with critical warning
+            await send_notification_to_user(
+                user_id,
+                "🟡 CRITICAL: Low SOL Balance",
+                f"{node_name} has only {sol_balance:.6f} SOL (minimum: 0.005). Top up immediately!",
+                address
+            )
+            
+            # Record alert time
+            await db.nodes.update_one(
+                {"address": address, "user_id": user_id},
+                {"$set": {"last_low_balance_alert": datetime.now(timezone.utc).isoformat()}}
+            )
+
+
+async def refresh_nodes_for_user(user_id: str, use_live: bool = True) -> dict:
+    """
+    Refresh status for all of a user's nodes and send change notifications
+    
+    use_live: reuse values pushed over account subscriptions where available
+    (the reconciliation pass sets this to False to re-read everything over RPC)
+    """
+    nodes = await db.nodes.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
+    updated_count = 0
+    errors = []
+    
+    # Get user notification preferences
+    prefs = await get_notification_prefs(user_id)
+    
+    # Fetch status for every node up front with batched RPC calls
+    all_status_data = await fetch_nodes_status_batch([node['address'] for node in nodes], use_live=use_live)
+    
+    # Record new job/payment transactions before comparing job states
+    if TX_CURSOR_ENABLED:
+        with rpc_priority(PRIORITY_BACKGROUND):
+            await tx_cursor.sync_many([node['address'] for node in nodes], concurrency=NODE_STATUS_CONCURRENCY)
     
     for node in nodes:
         try:
             address = node['address']
-            previous_status = node.get('status', 'unknown')
             previous_job_status = node.get('job_status', 'unknown')
             
-            # Fetch status from Solana
-            status_data = await fetch_node_status_from_solana(address)
+            status_data = all_status_data[address]
             current_status = status_data['status']
             current_job_status = status_data.get('job_status', 'unknown')
             
             # Update node in database
             await db.nodes.update_one(
-                {"address": address, "user_id": current_user.id},
+                {"address": address, "user_id": user_id},
                 {"$set": {
                     "status": current_status,
                     "job_status": current_job_status,
@@ -2007,30 +1965,11 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
             node_name = node.get('name') or f"{address[:8]}..."
             
             # Log status changes
-            if previous_status != current_status:
-                logger.info(f"Node {node_name} status changed: {previous_status} -> {current_status}")
             if previous_job_status != current_job_status:
                 logger.info(f"Node {node_name} job status changed: {previous_job_status} -> {current_job_status}")
             
-            # Notify on offline
-            if previous_status == 'online' and current_status == 'offline' and prefs.get('notify_offline', True):
-                logger.info(f"Sending offline notification for {node_name}")
-                await send_notification_to_user(
-                    current_user.id,
-                    "⚠️ Node Went Offline",
-                    f"{node_name} is now OFFLINE",
-                    address
-                )
-            
-            # Notify on online
-            elif previous_status == 'offline' and current_status == 'online' and prefs.get('notify_online', True):
-                logger.info(f"Sending online notification for {node_name}")
-                await send_notification_to_user(
-                    current_user.id,
-                    "✅ Node Back Online",
-                    f"{node_name} is back ONLINE",
-                    address
-                )
+            # Notify on offline/online
+            await notify_node_status_change(user_id, node, current_status, prefs)
             
             # Notify on job started - STORE START TIME
             if previous_job_status in ['idle', 'unknown', 'queue'] and current_job_status == 'running' and prefs.get('notify_job_started', True):
@@ -2039,13 +1978,13 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
                 # Store job start time for duration calculation later
                 job_start_time = datetime.now(timezone.utc).isoformat()
                 await db.nodes.update_one(
-                    {"address": address, "user_id": current_user.id},
+                    {"address": address, "user_id": user_id},
                     {"$set": {"job_start_time": job_start_time}}
                 )
                 logger.info(f"📝 Stored job start time for {node_name}: {job_start_time}")
                 
                 await send_notification_to_user(
-                    current_user.id,
+                    user_id,
                     "🚀 Job Started",
                     f"{node_name} started processing a job",
                     address
@@ -2075,42 +2014,68 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
                         
                         logger.info(f"⏱️ Job duration for {node_name}: {duration_str} ({duration_seconds}s)")
                         
-                        # Scrape ACTUAL payment from Nosana dashboard (no calculations)
-                        try:
-                            logger.info(f"🔍 Scraping actual payment from dashboard for {address}")
-                            actual_payment_usd = await scrape_latest_job_payment(address)
+                        # Payment from the node's on-chain finish transaction, if the cursor saw it
+                        finish_event = None
+                        if TX_CURSOR_ENABLED:
+                            try:
+                                finish_event = await tx_cursor.latest_event(address, 'job_finished', since=start_dt.isoformat())
+                            except Exception as event_error:
+                                logger.debug(f"Could not read finish event for {address[:8]}: {str(event_error)}")
+                        
+                        if finish_event and finish_event.get('nos_change', 0) > 0:
+                            nos_earned = finish_event['nos_change']
+                            nos_price = await get_nos_token_price()
+                            if nos_price:
+                                actual_payment_usd = nos_earned * nos_price
+                                payment_str = f"\n💰 Payment: ${actual_payment_usd:.3f} USD (~{nos_earned:.2f} NOS)"
+                                await save_job_earnings(
+                                    user_id=user_id,
+                                    node_address=address,
+                                    node_name=node_name,
+                                    duration_seconds=duration_seconds,
+                                    nos_earned=nos_earned,
+                                    usd_value=actual_payment_usd
+                                )
+                            else:
+                                payment_str = f"\n💰 Payment: {nos_earned:.2f} NOS"
+                            logger.info(f"💰 On-chain payment for {node_name}: {nos_earned:.2f} NOS ({finish_event['signature'][:12]}...)")
+                        else:
+                            # Scrape ACTUAL payment from Nosana dashboard (no calculations)
+                            try:
+                                logger.info(f"🔍 Scraping actual payment from dashboard for {address}")
+                                actual_payment_usd = await scrape_latest_job_payment(address)
                             
-                            if actual_payment_usd:
-                                # Get NOS price for conversion
-                                nos_price = await get_nos_token_price()
-                                if nos_price:
-                                    nos_earned = actual_payment_usd / nos_price
-                                    payment_str = f"\n💰 Payment: ${actual_payment_usd:.3f} USD (~{nos_earned:.2f} NOS)"
-                                    logger.info(f"💰 ACTUAL payment for {node_name}: ${actual_payment_usd:.3f} (~{nos_earned:.2f} NOS)")
+                                if actual_payment_usd:
+                                    # Get NOS price for conversion
+                                    nos_price = await get_nos_token_price()
+                                    if nos_price:
+                                        nos_earned = actual_payment_usd / nos_price
+                                        payment_str = f"\n💰 Payment: ${actual_payment_usd:.3f} USD (~{nos_earned:.2f} NOS)"
+                                        logger.info(f"💰 ACTUAL payment for {node_name}: ${actual_payment_usd:.3f} (~{nos_earned:.2f} NOS)")
                                     
-                                    # Save earnings to statistics
-                                    await save_job_earnings(
-                                        user_id=current_user.id,
-                                        node_address=address,
-                                        node_name=node_name,
-                                        duration_seconds=duration_seconds,
-                                        nos_earned=nos_earned,
-                                        usd_value=actual_payment_usd
-                                    )
+                                        # Save earnings to statistics
+                                        await save_job_earnings(
+                                            user_id=user_id,
+                                            node_address=address,
+                                            node_name=node_name,
+                                            duration_seconds=duration_seconds,
+                                            nos_earned=nos_earned,
+                                            usd_value=actual_payment_usd
+                                        )
+                                    else:
+                                        payment_str = f"\n💰 Payment: ${actual_payment_usd:.3f} USD"
+                                        logger.info(f"💰 ACTUAL payment for {node_name}: ${actual_payment_usd:.3f}")
                                 else:
-                                    payment_str = f"\n💰 Payment: ${actual_payment_usd:.3f} USD"
-                                    logger.info(f"💰 ACTUAL payment for {node_name}: ${actual_payment_usd:.3f}")
-                            else:
-                                logger.warning(f"⚠️  Could not scrape payment from dashboard for {address}")
+                                    logger.warning(f"⚠️  Could not scrape payment from dashboard for {address}")
+                                    payment_str = ""
+                            except Exception as scrape_error:
+                                logger.error(f"Error scraping payment from dashboard: {str(scrape_error)}")
                                 payment_str = ""
-                        except Exception as scrape_error:
-                            logger.error(f"Error scraping payment from dashboard: {str(scrape_error)}")
-                            payment_str = ""
                         
                         # Increment completed jobs counter
                         job_count_completed = node.get('job_count_completed', 0) + 1
                         await db.nodes.update_one(
-                            {"address": address, "user_id": current_user.id},
+                            {"address": address, "user_id": user_id},
                             {"$set": {
                                 "job_start_time": None,  # Clear start time
                                 "job_count_completed": job_count_completed
@@ -2127,7 +2092,7 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
                     firebase_body += payment_str.replace("\n💰 Payment:", " •")
                 
                 await send_notification_to_user(
-                    current_user.id,
+                    user_id,
                     "✅ Job Completed",
                     firebase_body,
                     address,
@@ -2141,56 +2106,19 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
                 telegram_message += f"\n\n[View Dashboard](https://dashboard.nosana.com/host/{address})"
                 
                 try:
-                    await send_telegram_notification(current_user.id, telegram_message)
+                    await send_telegram_notification(user_id, telegram_message)
                     logger.info(f"✅ Enhanced Telegram notification sent for {node_name}")
                 except Exception as tg_error:
                     logger.error(f"Failed to send enhanced Telegram notification: {str(tg_error)}")
             
             # Check for LOW SOL BALANCE (critical for node operation)
-            sol_balance = status_data.get('sol_balance')
-            previous_sol_balance = node.get('sol_balance')
-            
-            # Alert if SOL balance drops below 0.006 (critical threshold)
-            if sol_balance is not None and sol_balance < 0.006:
-                # Only send if we haven't sent alert in last 24 hours
-                last_alert = node.get('last_low_balance_alert')
-                should_alert = True
-                
-                if last_alert:
-                    from datetime import datetime as dt
-                    try:
-                        if isinstance(last_alert, str):
-                            last_alert_time = dt.fromisoformat(last_alert.replace('Z', '+00:00'))
-                        else:
-                            last_alert_time = last_alert
-                        
-                        hours_since_alert = (datetime.now(timezone.utc) - last_alert_time).total_seconds() / 3600
-                        should_alert = hours_since_alert >= 24  # Send max once per 24 hours
-                    except:
-                        should_alert = True
-                
-                if should_alert:
-                    logger.info(f"⚠️ CRITICAL: Low SOL balance detected for {node_name}: {sol_balance:.6f} SOL")
-                    
-                    # Send notification with critical warning
-                    await send_notification_to_user(
-                        current_user.id,
-                        "🟡 CRITICAL: Low SOL Balance",
-                        f"{node_name} has only {sol_balance:.6f} SOL (minimum: 0.005). Top up immediately!",
-                        address
-                    )
-                    
-                    # Record alert time
-                    await db.nodes.update_one(
-                        {"address": address, "user_id": current_user.id},
-                        {"$set": {"last_low_balance_alert": datetime.now(timezone.utc).isoformat()}}
-                    )
+            await check_low_sol_balance(user_id, node, status_data.get('sol_balance'))
             
         except Exception as e:
             errors.append({"address": node['address'], "error": str(e)})
             logger.error(f"Error updating node {node['address']}: {str(e)}")
     
-    logger.info(f"Refreshed {updated_count} nodes for user {current_user.email}")
+    logger.info(f"Refreshed {updated_count} nodes for user {user_id}")
     
     return {
         "updated": updated_count,
@@ -2199,6 +2127,151 @@ async def refresh_all_nodes_status(request: Request, current_user: User = Depend
     }
 
 
+@api_router.post("/nodes/refresh-all-status")
+@limiter.limit("10/minute")  # Rate limit bulk refresh
+async def refresh_all_nodes_status(request: Request, current_user: User = Depends(get_current_user)):
+    """Automatically refresh status for all nodes from Solana blockchain"""
+    return await refresh_nodes_for_user(current_user.id)
+
+
+# ===========================
+# Account Subscriptions (push updates)
+# ===========================
+
+# NOS token accounts per node wallet, and the reverse lookup
+nos_token_accounts: Dict[str, List[str]] = {}
+token_account_owners: Dict[str, str] = {}
+
+
+def live_nos_balance(owner: str) -> Optional[float]:
+    """NOS balance from pushed token account values, or None if not all of them are live"""
+    token_accounts = nos_token_accounts.get(owner)
+    if token_accounts is None:
+        return None
+    
+    total = 0.0
+    for token_account in token_accounts:
+        latest = account_subscriptions.latest(token_account)
+        if latest is None:
+            return None
+        total += parse_token_ui_amount(latest['value']) or 0.0
+    return total
+
+
+async def subscribe_node_accounts(address: str):
+    """Subscribe to a node wallet and all of its NOS token accounts"""
+    await account_subscriptions.subscribe(address, "base64")
+    
+    try:
+        token_accounts = await solana_rpc.get_token_accounts_by_owner(address, NOS_MINT)
+    except Exception as e:
+        logger.debug(f"Could not list NOS token accounts for {address[:8]}: {str(e)}")
+        return
+    
+    pubkeys = [account['pubkey'] for account in token_accounts]
+    for pubkey in nos_token_accounts.get(address, []):
+        if pubkey not in pubkeys:
+            token_account_owners.pop(pubkey, None)
+            await account_subscriptions.unsubscribe(pubkey)
+    
+    nos_token_accounts[address] = pubkeys
+    for account in token_accounts:
+        token_account_owners[account['pubkey']] = address
+        await account_subscriptions.subscribe(account['pubkey'], "jsonParsed")
+        account_subscriptions.seed(account['pubkey'], account.get('account'))
+
+
+async def unsubscribe_node_accounts(address: str):
+    """Stop tracking a node wallet once no user monitors it anymore"""
+    if await db.nodes.count_documents({"address": address}) > 0:
+        return
+    
+    await account_subscriptions.unsubscribe(address)
+    for pubkey in nos_token_accounts.pop(address, []):
+        token_account_owners.pop(pubkey, None)
+        await account_subscriptions.unsubscribe(pubkey)
+
+
+async def sync_account_subscriptions():
+    """Subscribe to every monitored node and drop accounts nobody monitors"""
+    addresses = await db.nodes.distinct("address")
+    
+    for address in list(nos_token_accounts):
+        if address not in addresses:
+            await unsubscribe_node_accounts(address)
+    
+    semaphore = asyncio.Semaphore(NOS_BALANCE_CONCURRENCY)
+    
+    async def subscribe(address: str):
+        async with semaphore:
+            await subscribe_node_accounts(address)
+    
+    await asyncio.gather(*(subscribe(address) for address in addresses))
+    logger.info(f"📡 Account subscriptions synced for {len(addresses)} nodes")
+
+
+async def handle_account_notification(address: str, value: Optional[dict], slot: int):
+    """Apply a pushed account change to db.nodes and run the status/balance alerts"""
+    owner = token_account_owners.get(address)
+    if owner is not None:
+        # NOS token account changed - recompute the owner's total
+        nos_balance = live_nos_balance(owner)
+        if nos_balance is not None:
+            await db.nodes.update_many(
+                {"address": owner},
+                {"$set": {
+                    "nos_balance": nos_balance if nos_balance > 0 else None,
+                    "last_updated": datetime.now(timezone.utc).isoformat()
+                }}
+            )
+            logger.info(f"📡 NOS balance pushed for {owner[:8]}...: {nos_balance:.2f} NOS (slot {slot})")
+        return
+    
+    # Node wallet changed
+    lamports = value.get('lamports', 0) if value else 0
+    current_status = 'online' if lamports > 0 else 'offline'
+    sol_balance = lamports / 1e9 if value else None
+    
+    nodes = await db.nodes.find({"address": address}, {"_id": 0}).to_list(1000)
+    for node in nodes:
+        await db.nodes.update_one(
+            {"address": address, "user_id": node['user_id']},
+            {"$set": {
+                "status": current_status,
+                "sol_balance": sol_balance,
+                "last_updated": datetime.now(timezone.utc).isoformat()
+            }}
+        )
+        
+        prefs = await get_notification_prefs(node['user_id'])
+        await notify_node_status_change(node['user_id'], node, current_status, prefs)
+        await check_low_sol_balance(node['user_id'], node, sol_balance)
+    
+    logger.info(f"📡 Account change pushed for {address[:8]}...: {lamports} lamports (slot {slot})")
+
+
+async def reconcile_nodes_status_loop():
+    """Slow polling pass that catches anything the push stream missed"""
+    while True:
+        await asyncio.sleep(RECONCILE_INTERVAL_SECONDS)
+        try:
+            # Yield the RPC budget to interactive requests
+            with rpc_priority(PRIORITY_BACKGROUND):
+                await sync_account_subscriptions()
+                
+                user_ids = await db.nodes.distinct("user_id")
+                for user_id in user_ids:
+                    await refresh_nodes_for_user(user_id, use_live=False)
+            
+            logger.info(f"🔁 Reconciled node status for {len(user_ids)} users")
+        except Exception as e:
+            logger.error(f"Error in node status reconciliation: {str(e)}")
+
+
+account_subscriptions = AccountSubscriptionManager(SOLANA_WS_URL, handle_account_notification)
+reconcile_task: Optional[asyncio.Task] = None
+
+
 @api_router.get("/nodes/{address}/dashboard", response_model=DashboardLink)
 async def get_dashboard_link(address: str):
     """Get Nosana dashboard link for a node"""
@@ -2457,9 +2530,12 @@ async def get_live_earnings_from_dashboard(address: str, current_user: User = De
     """
     Get real-time earnings by scraping Nosana dashboard AND store the data
     Returns actual job payment data from the live dashboard
+    
+    Scrapes are cached per address (not per user): fresh results are served
+    from cache, stale ones immediately while one background scrape refreshes them
     """
     try:
-        # Verify node belongs to user
+        # Verify node belongs to user (on every request, cached or not)
         node = await db.nodes.find_one({
             "address": address,
             "user_id": current_user.id
@@ -2468,16 +2544,32 @@ async def get_live_earnings_from_dashboard(address: str, current_user: User = De
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
         
-        # Scrape live data from Nosana dashboard
-        jobs = await scrape_nosana_job_history(address)
-        
-        # Store scraped jobs in database
-        if jobs:
-            await store_scraped_jobs(current_user.id, address, jobs)
+        async def scrape_and_store() -> List[Dict]:
+            if SCRAPE_WORKER_ENABLED:
+                # A worker scrapes and stores; wait for its result
+                queued = await scrape_queue.enqueue(address, current_user.id, kind="live")
+                finished = await scrape_queue.wait(queued['id'], LIVE_SCRAPE_WAIT_SECONDS)
+                if not finished or finished['status'] != 'done':
+                    logger.warning(f"Live scrape of {address[:8]}... not finished by a worker in time")
+                    return []
+                return finished['result'].get('jobs', [])
+            
+            # Scrape live data from Nosana dashboard
+            scraped = await scrape_nosana_job_history(address)
+            # Store scraped jobs in database
+            if scraped:
+                await store_scraped_jobs(current_user.id, address, scraped)
+            return scraped
+        
+        # An empty result is usually a failed scrape - don't cache it over older jobs
+        cached_jobs, cache_state = await live_scrape_cache.get(address, scrape_and_store, cacheable=bool)
+        # Copies - the cached dicts are shared between requests
+        jobs = [dict(job) for job in cached_jobs]
         
         if not jobs:
             return {
                 "node_address": address,
+                "cache": cache_state,
                 "jobs": [],
                 "summary": {
                     "total_jobs": 0,
@@ -2520,6 +2612,7 @@ async def get_live_earnings_from_dashboard(address: str, current_user: User = De
         
         return {
             "node_address": address,
+            "cache": cache_state,
             "nos_price": nos_price,
             "jobs": jobs,
             "summary": {
@@ -2722,11 +2815,12 @@ async def get_yesterday_earnings_scraped(address: str, current_user: User = Depe
 
 
 @api_router.post("/earnings/node/{address}/scrape-all-history")
-async def scrape_all_history_for_node(address: str, current_user: User = Depends(get_current_user)):
+async def scrape_all_history_for_node(address: str, backfill: bool = False, current_user: User = Depends(get_current_user)):
     """
     Scrape recent jobs for a specific node (FIRST PAGE ONLY - last ~20 hours)
     This ensures accurate timestamps since relative times are only accurate for recent jobs
     Run this regularly (hourly) to build historical data over time
+    backfill=true walks every page once (e.g. for a newly added node)
     """
     try:
         # Verify node belongs to user
@@ -2738,12 +2832,34 @@ async def scrape_all_history_for_node(address: str, current_user: User = Depends
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
         
+        if SCRAPE_WORKER_ENABLED:
+            queued = await scrape_queue.enqueue(
+                address, current_user.id, backfill=backfill, max_pages=None if backfill else 1
+            )
+            return {
+                "success": True,
+                "message": f"Scrape queued for node {address[:8]}",
+                "queued": True,
+                "scrape_job_id": queued['id'],
+                "node_address": address,
+                "node_name": node.get('name', 'Unnamed Node')
+            }
+        
         logger.info(f"🚀 Scraping recent jobs for node: {address[:8]}...")
         
-        # Scrape ONLY first page (max_pages=1) to get accurate recent data
-        jobs = await scrape_nosana_job_history(address, max_pages=1)
+        if backfill:
+            logger.info(f"📚 Backfilling full job history for {address[:8]}...")
+            # Stored page by page as the walk goes
+            result = await scrape_and_store_job_history(current_user.id, address, backfill=True)
+            jobs_scraped, stored = result['jobs_scraped'], result['jobs_stored']
+        else:
+            # Scrape ONLY first page (max_pages=1) to get accurate recent data
+            jobs = await scrape_nosana_job_history(address, max_pages=1)
+            jobs_scraped = len(jobs)
+            # Store all scraped jobs
+            stored = await store_scraped_jobs(current_user.id, address, jobs) if jobs else 0
         
-        if not jobs:
+        if not jobs_scraped:
             return {
                 "success": False,
                 "message": "No jobs found",
@@ -2751,13 +2867,10 @@ async def scrape_all_history_for_node(address: str, current_user: User = Depends
                 "jobs_stored": 0
             }
         
-        # Store all scraped jobs
-        stored = await store_scraped_jobs(current_user.id, address, jobs)
-        
         return {
             "success": True,
             "message": f"Successfully scraped recent jobs for node {address[:8]}",
-            "jobs_scraped": len(jobs),
+            "jobs_scraped": jobs_scraped,
             "jobs_stored": stored,
             "node_address": address,
             "node_name": node.get('name', 'Unnamed Node'),
@@ -2772,10 +2885,11 @@ async def scrape_all_history_for_node(address: str, current_user: User = Depends
 
 
 @api_router.post("/earnings/scrape-all-nodes")
-async def scrape_all_user_nodes(current_user: User = Depends(get_current_user)):
+async def scrape_all_user_nodes(backfill: bool = False, current_user: User = Depends(get_current_user)):
     """
     Scrape earnings data for ALL nodes of the current user
     Stores data in database for statistics
+    Only jobs newer than the stored ones are scraped unless backfill=true
     """
     try:
         # Get all user's nodes
@@ -2789,6 +2903,18 @@ async def scrape_all_user_nodes(current_user: User = Depends(get_current_user)):
                 "jobs_stored": 0
             }
         
+        if SCRAPE_WORKER_ENABLED:
+            queued = await scrape_queue.enqueue_many(
+                [{"address": node['address'], "user_id": current_user.id} for node in nodes], backfill=backfill
+            )
+            return {
+                "success": True,
+                "message": f"Queued {len(queued)} node scrapes",
+                "queued": True,
+                "scrape_job_ids": [job['id'] for job in queued],
+                "total_nodes": len(nodes)
+            }
+        
         total_jobs_stored = 0
         nodes_scraped = 0
         errors = []
@@ -2797,12 +2923,11 @@ async def scrape_all_user_nodes(current_user: User = Depends(get_current_user)):
             try:
                 logger.info(f"🔄 Scraping node: {node['address'][:8]}...")
                 
-                # Scrape jobs from dashboard
-                jobs = await scrape_nosana_job_history(node['address'])
+                # Scrape jobs from dashboard, stored page by page
+                result = await scrape_and_store_job_history(current_user.id, node['address'], backfill=backfill)
                 
-                if jobs:
-                    # Store scraped jobs
-                    stored = await store_scraped_jobs(current_user.id, node['address'], jobs)
+                if result['jobs_scraped']:
+                    stored = result['jobs_stored']
                     total_jobs_stored += stored
                     nodes_scraped += 1
                     logger.info(f"✅ Node {node['address'][:8]}: {stored} new jobs stored")
@@ -2829,10 +2954,10 @@ async def scrape_all_user_nodes(current_user: User = Depends(get_current_user)):
 
 
 @api_router.post("/admin/scrape-all-users-nodes")
-async def scrape_all_users_nodes(current_user: User = Depends(get_current_user)):
+async def scrape_all_users_nodes(backfill: bool = False, current_user: User = Depends(get_current_user)):
     """
     Admin endpoint: Scrape ALL nodes for ALL users
-    Use carefully - can take a long time!
+    Use carefully - can take a long time with backfill=true!
     """
     try:
         # Get all nodes from all users
@@ -2845,6 +2970,17 @@ async def scrape_all_users_nodes(current_user: User = Depends(get_current_user))
                 "total_jobs_stored": 0
             }
         
+        if SCRAPE_WORKER_ENABLED:
+            queued = await scrape_queue.enqueue_many(
+                [{"address": node['address'], "user_id": node['user_id']} for node in all_nodes], backfill=backfill
+            )
+            return {
+                "success": True,
+                "message": f"Queued {len(queued)} node scrapes",
+                "queued": True,
+                "total_nodes": len(all_nodes)
+            }
+        
         total_jobs_stored = 0
         nodes_scraped = 0
         errors = []
@@ -2853,13 +2989,11 @@ async def scrape_all_users_nodes(current_user: User = Depends(get_current_user))
             try:
                 logger.info(f"🔄 Scraping node: {node['address'][:8]} (user: {node['user_id'][:8]})")
                 
-                # Scrape jobs from dashboard
-                jobs = await scrape_nosana_job_history(node['address'])
+                # Scrape jobs from dashboard, stored page by page
+                result = await scrape_and_store_job_history(node['user_id'], node['address'], backfill=backfill)
                 
-                if jobs:
-                    # Store scraped jobs
-                    stored = await store_scraped_jobs(node['user_id'], node['address'], jobs)
-                    total_jobs_stored += stored
+                if result['jobs_scraped']:
+                    total_jobs_stored += result['jobs_stored']
                     nodes_scraped += 1
                 
             except Exception as e:
@@ -2881,6 +3015,43 @@ async def scrape_all_users_nodes(current_user: User = Depends(get_current_user))
         raise HTTPException(status_code=500, detail="Failed to scrape nodes")
 
 
+@api_router.get("/scrape-jobs/{job_id}")
+async def get_scrape_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Status and result of a queued scrape"""
+    job = await scrape_queue.get(job_id)
+    if not job or job.get('user_id') != current_user.id:
+        raise HTTPException(status_code=404, detail="Scrape job not found")
+    job.pop('active', None)
+    if job.get('finished_at') is not None:
+        job['finished_at'] = job['finished_at'].isoformat()
+    if job.get('result'):
+        job['result'].pop('jobs', None)  # /earnings/node/{address}/live serves those
+    return job
+
+
+@api_router.post("/admin/dashboard-api/discover")
+@limiter.limit("5/hour")  # Each call renders a dashboard page in the browser pool
+async def discover_dashboard_api(request: Request, address: str, current_user: User = Depends(get_current_user)):
+    """
+    Admin endpoint: open the dashboard for one node and record its JSON data endpoints
+    Later scrapes call those endpoints directly instead of rendering the page;
+    only endpoints that answer a direct request are recorded
+    """
+    if not validate_solana_address(address):
+        raise HTTPException(status_code=400, detail="Invalid Solana address format")
+    
+    try:
+        recorded = await dashboard_api.discover(address)
+        return {
+            "success": True,
+            "endpoints": recorded,
+            "message": f"Recorded {len(recorded)} data endpoints"
+        }
+    except Exception as e:
+        logger.error(f"Error discovering dashboard API: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to discover dashboard API")
+
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -2923,6 +3094,91 @@ async def health_check():
     
     return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
+# Metrics endpoint
+@app.get("/api/metrics")
+async def metrics(current_user: User = Depends(get_current_user)):
+    """RPC routing, response cache, account subscription, browser pool and page wait counters (logged-in users)"""
+    return {
+        "rpc": solana_rpc.stats(),
+        "account_subscriptions": account_subscriptions.stats(),
+        "browser_pool": browser_pool.stats(),
+        "dashboard_api": dashboard_api.stats(),
+        "page_waits": page_wait_stats.stats(),
+        "node_snapshots": node_snapshots.stats(),
+        "live_scrape_cache": live_scrape_cache.stats(),
+        "check_status_caches": {depth: cache.stats() for depth, cache in check_status_caches.items()},
+        "dashboard_breakers": dashboard_breakers.stats(),
+        "status_sources": status_sources.stats(),
+        "table_hashes": table_hash_stats.stats(),
+        "scrape_queue": await scrape_queue.stats() if SCRAPE_WORKER_ENABLED else None,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+@app.on_event("startup")
+async def start_solana_rpc():
+    await solana_rpc.start()
+
+@app.on_event("startup")
+async def create_tx_cursor_indexes():
+    if TX_CURSOR_ENABLED:
+        try:
+            await tx_cursor.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not create transaction cursor indexes: {str(e)}")
+
+@app.on_event("startup")
+async def create_scrape_indexes():
+    try:
+        if SCRAPE_WORKER_ENABLED:
+            await scrape_queue.ensure_indexes()
+        await db.scrape_watermarks.create_index("node_address", unique=True)
+        await db.scraped_jobs.create_index([("node_address", 1), ("started", -1)])
+        await db.scraped_jobs.create_index([("node_address", 1), ("job_id", 1)])
+        await db.scrape_progress.create_index("node_address", unique=True)
+    except Exception as e:
+        logger.warning(f"Could not create scrape indexes: {str(e)}")
+
+@app.on_event("startup")
+async def start_account_subscriptions():
+    global reconcile_task
+    if not ACCOUNT_SUBSCRIPTIONS_ENABLED:
+        logger.info("Account subscriptions disabled (ACCOUNT_SUBSCRIPTIONS_ENABLED=false)")
+        return
+    await account_subscriptions.start()
+    with rpc_priority(PRIORITY_BACKGROUND):
+        # Tasks inherit the priority from the current context
+        asyncio.create_task(sync_account_subscriptions())
+    reconcile_task = asyncio.create_task(reconcile_nodes_status_loop())
+
+@app.on_event("shutdown")
+async def shutdown_account_subscriptions():
+    if reconcile_task is not None:
+        reconcile_task.cancel()
+    await account_subscriptions.stop()
+
+@app.on_event("startup")
+async def start_browser_pool():
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.warning(f"Browser pool could not start, will retry on first scrape: {str(e)}")
+
+@app.on_event("shutdown")
+async def shutdown_browser_pool():
+    await browser_pool.stop()
+
+@app.on_event("shutdown")
+async def shutdown_dashboard_api():
+    await dashboard_api.close()
+
+@app.on_event("shutdown")
+async def shutdown_sidecar_client():
+    await sidecar_client.aclose()
+
+@app.on_event("shutdown")
+async def shutdown_solana_rpc():
+    await solana_rpc.close()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
@@ -0,0 +1,817 @@
+"""
+Shared async Solana JSON-RPC client
+
+One long-lived httpx connection pool is reused for every Solana call made by the
+backend, instead of building a new blocking client per request. Calls are
+routed across one or more RPC endpoints by rolling latency and error rate,
+with failover on rate limits/server errors and optional hedged requests.
+Read-only calls can be served from a slot-aware response cache, and every
+endpoint can be given a token-bucket request budget with interactive calls
+admitted ahead of background ones.
+"""
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPC_URL = "https://api.mainnet-beta.solana.com"
+NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
+
+# getMultipleAccounts accepts at most 100 addresses per request
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Slice that returns no account data - enough when only lamports are needed
+EMPTY_DATA_SLICE = {"offset": 0, "length": 0}
+
+# Average mainnet slot time, used to estimate the current slot between responses
+SLOT_DURATION = 0.4
+
+# Read-only methods whose results may be served from RPCResponseCache
+CACHEABLE_METHODS = {
+    "getAccountInfo",
+    "getMultipleAccounts",
+    "getTokenAccountsByOwner",
+    "getTokenAccountBalance",
+    "getBalance",
+    "getProgramAccounts",
+}
+
+
+def parse_token_ui_amount(account: Optional[Dict]) -> Optional[float]:
+    """Read tokenAmount.uiAmount from a jsonParsed token account value"""
+    try:
+        return account['data']['parsed']['info']['tokenAmount']['uiAmount']
+    except (KeyError, TypeError):
+        return None
+
+
+class SolanaRPCError(Exception):
+    """JSON-RPC error object returned by a Solana node"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+
+
+class RPCEndpointError(Exception):
+    """Retryable endpoint failure (429, 5xx or transport error)"""
+
+    def __init__(self, url: str, reason: str, retry_after: Optional[float] = None):
+        super().__init__(f"{public_url(url)}: {reason}")
+        self.url = url
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RPCResponseError(Exception):
+    """Successful JSON-RPC reply whose result doesn't fit the request (null, truncated, missing fields)"""
+
+
+# Admission priority classes; lower is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+_rpc_priority: contextvars.ContextVar = contextvars.ContextVar("rpc_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextlib.contextmanager
+def rpc_priority(priority: int) -> Iterator[None]:
+    """Run the RPC calls made inside this block (and tasks it starts) at `priority`"""
+    token = _rpc_priority.set(priority)
+    try:
+        yield
+    finally:
+        _rpc_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Request budget of `rate` per second with bursts up to `burst`
+
+    Callers that cannot be admitted right away queue by priority (FIFO within
+    a class) and are released as tokens refill.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._waiters: List[List] = []  # heap of [priority, seq, cost, future]
+        self._seq = itertools.count()
+        self._drainer: Optional[asyncio.Task] = None
+
+        self.admitted = 0
+        self.throttled = 0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _cost(self, cost: float) -> float:
+        return min(cost, self.burst)
+
+    def has_capacity(self, cost: float = 1) -> bool:
+        self._refill()
+        return not self._waiters and self.tokens >= self._cost(cost)
+
+    def try_acquire(self, cost: float = 1) -> bool:
+        """Take tokens only if that needs no waiting"""
+        if not self.has_capacity(cost):
+            return False
+        self.tokens -= self._cost(cost)
+        self.admitted += 1
+        return True
+
+    async def acquire(self, cost: float = 1, priority: int = PRIORITY_INTERACTIVE):
+        """Wait until `cost` tokens are available for this caller"""
+        if self.try_acquire(cost):
+            return
+
+        self.throttled += 1
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), self._cost(cost), future])
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        try:
+            await future
+        finally:
+            # A cancelled waiter stays in the heap and is skipped by _drain
+            self.max_wait = max(self.max_wait, time.monotonic() - started)
+
+    async def _drain(self):
+        while self._waiters:
+            head = self._waiters[0]
+            if head[3].done():
+                heapq.heappop(self._waiters)
+                continue
+            self._refill()
+            if self.tokens >= head[2]:
+                heapq.heappop(self._waiters)
+                self.tokens -= head[2]
+                self.admitted += 1
+                head[3].set_result(None)
+                continue
+            await asyncio.sleep((head[2] - self.tokens) / self.rate)
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+        return depth
+
+    def stats(self) -> Dict:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "queue_depth": self.queue_depth(),
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "max_wait_ms": round(self.max_wait * 1000, 1)
+        }
+
+
+def public_url(url: str) -> str:
+    """Scheme and host of an endpoint URL: providers put API keys in the path, query or userinfo"""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    return f"{parts.scheme}://{host}:{parts.port}" if parts.port else f"{parts.scheme}://{host}"
+
+
+class RPCEndpoint:
+    """Rolling latency and error statistics for one RPC endpoint"""
+
+    # Latency assumed for an endpoint without samples yet (seconds)
+    DEFAULT_LATENCY = 0.25
+
+    def __init__(
+        self,
+        url: str,
+        window: int = 100,
+        max_age: float = 300.0,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None
+    ):
+        self.url = url
+        self.max_age = max_age  # Samples older than this are forgotten
+        # Request budget (None = unlimited)
+        self.bucket = TokenBucket(rate_limit, burst or rate_limit) if rate_limit else None
+        self.latencies = deque(maxlen=window)  # (timestamp, seconds)
+        self.outcomes = deque(maxlen=window)  # (timestamp, failed)
+        self.requests = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def record_latency(self, latency: float):
+        self.latencies.append((time.monotonic(), latency))
+
+    def record_success(self, latency: float):
+        self.record_latency(latency)
+        self.outcomes.append((time.monotonic(), False))
+        self.requests += 1
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        self.outcomes.append((time.monotonic(), True))
+        self.requests += 1
+        self.failures += 1
+        if retry_after:
+            self.cooldown_until = time.monotonic() + retry_after
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.max_age
+        for samples in (self.latencies, self.outcomes):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def percentile(self, pct: float) -> float:
+        self._prune()
+        if not self.latencies:
+            return self.DEFAULT_LATENCY
+        ordered = sorted(latency for _, latency in self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        self._prune()
+        if not self.outcomes:
+            return 0.0
+        return sum(failed for _, failed in self.outcomes) / len(self.outcomes)
+
+    def has_capacity(self, cost: float = 1) -> bool:
+        return self.bucket is None or self.bucket.has_capacity(cost)
+
+    def try_admit(self, cost: float = 1) -> bool:
+        return self.bucket is None or self.bucket.try_acquire(cost)
+
+    async def admit(self, cost: float = 1, priority: int = PRIORITY_INTERACTIVE):
+        if self.bucket is not None:
+            await self.bucket.acquire(cost, priority)
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    def score(self) -> float:
+        """
+        Lower is healthier: median latency inflated by recent errors
+
+        Endpoints without recent samples score 0 so they get probed again.
+        """
+        self._prune()
+        if not self.latencies and not self.outcomes:
+            return 0.0
+        return self.percentile(50) * (1 + 10 * self.error_rate)
+
+    def stats(self) -> Dict:
+        return {
+            "url": public_url(self.url),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+            "cooling_down": self.cooling_down,
+            "budget": self.bucket.stats() if self.bucket is not None else None
+        }
+
+
+class RPCResponseCache:
+    """
+    Response cache for read-only RPC calls, expiring by slot progression
+
+    Entries are keyed by (method, params), which includes the commitment from
+    the params config. An entry stays fresh for `ttl_slots` slots after the
+    slot its response was produced at (context.slot); responses without a
+    context use the same budget converted to seconds. "Account not found"
+    answers (value None) expire after the shorter `negative_ttl_slots`.
+
+    Identical concurrent misses share one in-flight request.
+    """
+
+    def __init__(self, ttl_slots: int = 25, negative_ttl_slots: int = 5, max_entries: int = 10000):
+        self.ttl_slots = ttl_slots
+        self.negative_ttl_slots = negative_ttl_slots
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._latest_slot = 0
+        self._latest_slot_at = 0.0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(method: str, params: Optional[List]) -> str:
+        return method + ":" + json.dumps(params or [], sort_keys=True, separators=(",", ":"))
+
+    def observe_slot(self, slot: int):
+        """Track the newest slot seen in any response"""
+        if slot > self._latest_slot:
+            self._latest_slot = slot
+            self._latest_slot_at = time.monotonic()
+
+    def current_slot(self) -> float:
+        """Estimated current slot: newest seen slot plus slots elapsed since then"""
+        if not self._latest_slot:
+            return 0.0
+        return self._latest_slot + (time.monotonic() - self._latest_slot_at) / SLOT_DURATION
+
+    @staticmethod
+    def _is_negative(result: Any) -> bool:
+        return result is None or (isinstance(result, dict) and "value" in result and result["value"] is None)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        ttl = self.negative_ttl_slots if entry["negative"] else self.ttl_slots
+        if entry["slot"]:
+            return self.current_slot() - entry["slot"] < ttl
+        return time.monotonic() - entry["stored_at"] < ttl * SLOT_DURATION
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the fresh entry for `key`, dropping it if it has expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not self._is_fresh(entry):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, result: Any):
+        slot = 0
+        if isinstance(result, dict):
+            slot = (result.get("context") or {}).get("slot", 0)
+            self.observe_slot(slot)
+        self._entries[key] = {
+            "result": result,
+            "slot": slot,
+            "stored_at": time.monotonic(),
+            "negative": self._is_negative(result)
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(self, method: str, params: Optional[List], fetch) -> Any:
+        """Serve a fresh cached result or run `fetch()` once for all concurrent callers"""
+        key = self.key(method, params)
+        entry = self.get(key)
+        if entry is not None:
+            if entry["negative"]:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry["result"]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller that owned the request was cancelled - fetch ourselves
+                return await fetch()
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a future nobody awaited does not log a warning
+            future.exception()
+            raise
+        else:
+            self.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.negative_hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "current_slot": int(self.current_slot())
+        }
+
+
+class SolanaRPCClient:
+    """
+    Async JSON-RPC client backed by a bounded keep-alive connection pool
+
+    Call start() once (the app does this on startup) and close() on shutdown.
+    The pool is also created lazily on first use, so standalone scripts can use
+    the client as an async context manager.
+
+    With several endpoints each call goes to the healthiest one and fails over
+    to the next on 429/5xx/transport errors. With hedge=True a second request is
+    sent to the runner-up once the primary is slower than its own p95.
+
+    If a `cache` is given, CACHEABLE_METHODS are answered from it while fresh.
+
+    With rate_limit (requests/second per endpoint) every request first takes
+    a token from its endpoint's bucket; endpoints with budget left are tried
+    before ones that would make the caller wait. Waiting callers are admitted
+    by the priority set with rpc_priority() (interactive by default).
+    """
+
+    def __init__(
+        self,
+        url: Union[str, List[str]] = DEFAULT_RPC_URL,
+        pool_size: int = 20,
+        keepalive: int = 10,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        commitment: str = "confirmed",
+        hedge: bool = False,
+        rate_limit_cooldown: float = 10.0,
+        cache: Optional[RPCResponseCache] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None
+    ):
+        urls = [url] if isinstance(url, str) else list(url)
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [RPCEndpoint(u, rate_limit=rate_limit, burst=burst) for u in urls]
+        self.pool_size = pool_size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.commitment = commitment
+        self.hedge = hedge
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.hedged_requests = 0
+        self.cache = cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self) -> str:
+        """URL of the currently preferred endpoint"""
+        return self._ranked_endpoints()[0].url
+
+    async def start(self):
+        """Open the connection pool (no-op if already open)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.keepalive
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                headers={"Content-Type": "application/json"}
+            )
+            logger.info(
+                f"Solana RPC pool opened: {', '.join(public_url(e.url) for e in self.endpoints)} "
+                f"(max {self.pool_size} connections)"
+            )
+
+    async def close(self):
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Solana RPC pool closed")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def call(self, method: str, params: Optional[List] = None) -> Any:
+        """Send one JSON-RPC request and return its `result`"""
+        if self.cache is not None and method in CACHEABLE_METHODS:
+            return await self.cache.get_or_fetch(method, params, lambda: self._call(method, params))
+        return await self._call(method, params)
+
+    async def _call(self, method: str, params: Optional[List] = None) -> Any:
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": params or []
+        }
+        body = await self._send(payload, method)
+        if body.get('error'):
+            error = body['error']
+            raise SolanaRPCError(error.get('code', 0), error.get('message', 'Unknown error'))
+        result = body.get('result')
+        if self.cache is not None and isinstance(result, dict):
+            # Every response moves the cache's notion of the current slot
+            self.cache.observe_slot((result.get('context') or {}).get('slot', 0))
+        return result
+
+    async def call_batch(self, calls: List[Tuple[str, List]]) -> List[Any]:
+        """
+        Send several requests as one JSON-RPC batch; results come back in order
+
+        Entries whose request failed with a JSON-RPC error are None.
+        """
+        if not calls:
+            return []
+        payload = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+            for method, params in calls
+        ]
+        body = await self._send(payload, f"batch of {len(calls)}")
+        if isinstance(body, dict):
+            # The whole batch was rejected (e.g. batches disabled on this endpoint)
+            error = body.get('error') or {}
+            raise SolanaRPCError(error.get('code', 0), error.get('message', 'Batch request rejected'))
+
+        by_id = {item.get('id'): item for item in body}
+        results = []
+        for request in payload:
+            item = by_id.get(request['id']) or {}
+            if item.get('error'):
+                logger.debug(f"RPC {request['method']} failed in batch: {item['error']}")
+            results.append(item.get('result'))
+        return results
+
+    async def _send(self, payload: Union[Dict, List[Dict]], description: str) -> Any:
+        """POST a payload to the ranked endpoints, failing over on retryable errors"""
+        if self._client is None:
+            await self.start()
+
+        # Batches count against the budget once per request in them
+        cost = len(payload) if isinstance(payload, list) else 1
+        priority = _rpc_priority.get()
+
+        # Endpoints that can take the request right away go first (stable sort keeps the ranking)
+        ranked = sorted(self._ranked_endpoints(), key=lambda e: not e.has_capacity(cost))
+        last_error = None
+        for i, endpoint in enumerate(ranked):
+            backup = ranked[i + 1] if self.hedge and i + 1 < len(ranked) else None
+            try:
+                await endpoint.admit(cost, priority)
+                if backup is not None:
+                    return await self._post_hedged(endpoint, backup, payload, cost)
+                return await self._post(endpoint, payload)
+            except RPCEndpointError as e:
+                last_error = e
+                logger.warning(f"RPC {description} failed on {public_url(e.url)} ({e.reason}), failing over")
+
+        raise last_error
+
+    def _ranked_endpoints(self) -> List[RPCEndpoint]:
+        """Endpoints from healthiest to least healthy; rate-limited ones go last"""
+        return sorted(self.endpoints, key=lambda e: (e.cooling_down, e.score()))
+
+    async def _post(self, endpoint: RPCEndpoint, payload: Union[Dict, List[Dict]]) -> Any:
+        started = time.monotonic()
+        try:
+            response = await self._client.post(endpoint.url, json=payload)
+        except httpx.TransportError as e:
+            endpoint.record_failure()
+            raise RPCEndpointError(endpoint.url, type(e).__name__)
+        except asyncio.CancelledError:
+            # Lost a hedge race - it took at least this long
+            endpoint.record_latency(time.monotonic() - started)
+            raise
+
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            cooldown = float(retry_after) if retry_after and retry_after.isdigit() else self.rate_limit_cooldown
+            endpoint.record_failure(retry_after=cooldown)
+            raise RPCEndpointError(endpoint.url, "429 Too Many Requests", cooldown)
+        if response.status_code >= 500:
+            endpoint.record_failure()
+            raise RPCEndpointError(endpoint.url, f"HTTP {response.status_code}")
+
+        if response.is_error:
+            # raise_for_status() would put the full URL (and its key) in the message
+            raise httpx.HTTPStatusError(
+                f"HTTP {response.status_code} from {public_url(endpoint.url)}",
+                request=response.request, response=response
+            )
+        endpoint.record_success(time.monotonic() - started)
+        return response.json()
+
+    async def _post_hedged(
+        self,
+        primary: RPCEndpoint,
+        backup: RPCEndpoint,
+        payload: Union[Dict, List[Dict]],
+        cost: float = 1
+    ) -> Any:
+        """Send to primary; if it is slower than its p95, race a copy on backup"""
+        primary_task = asyncio.create_task(self._post(primary, payload))
+        done, _ = await asyncio.wait({primary_task}, timeout=primary.percentile(95))
+        if done:
+            return primary_task.result()
+        if not backup.try_admit(cost):
+            # No budget left for a hedge - wait for the primary
+            return await primary_task
+
+        self.hedged_requests += 1
+        backup_task = asyncio.create_task(self._post(backup, payload))
+        pending = {primary_task, backup_task}
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        return task.result()
+                    except RPCEndpointError as e:
+                        last_error = e
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Callers waiting for a request budget, per priority class, over all endpoints"""
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for endpoint in self.endpoints:
+            if endpoint.bucket is not None:
+                for name, count in endpoint.bucket.queue_depth().items():
+                    depth[name] = depth.get(name, 0) + count
+        return depth
+
+    def stats(self) -> Dict:
+        return {
+            "endpoints": [endpoint.stats() for endpoint in self._ranked_endpoints()],
+            "hedged_requests": self.hedged_requests,
+            "queue_depth": self.queue_depth(),
+            "cache": self.cache.stats() if self.cache is not None else None
+        }
+
+    async def get_account_info(
+        self,
+        address: str,
+        encoding: str = "base64",
+        data_slice: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Return the account info `value` for an address, or None if it does not exist"""
+        config = {"encoding": encoding, "commitment": self.commitment}
+        if data_slice:
+            config["dataSlice"] = data_slice
+        result = await self.call("getAccountInfo", [address, config])
+        return result.get('value') if result else None
+
+    async def get_multiple_accounts(
+        self,
+        addresses: List[str],
+        encoding: str = "base64",
+        data_slice: Optional[Dict] = None
+    ) -> List[Optional[Dict]]:
+        """
+        Return account info for many addresses, in the same order
+
+        Addresses are split into chunks of MAX_MULTIPLE_ACCOUNTS and the chunks
+        are requested concurrently. Missing accounts come back as None; a null,
+        truncated or value-less result raises RPCResponseError instead, since
+        reading it as "no accounts" would report existing accounts as gone.
+        """
+        config = {"encoding": encoding, "commitment": self.commitment}
+        if data_slice:
+            config["dataSlice"] = data_slice
+
+        chunks = [
+            addresses[i:i + MAX_MULTIPLE_ACCOUNTS]
+            for i in range(0, len(addresses), MAX_MULTIPLE_ACCOUNTS)
+        ]
+        results = await asyncio.gather(*(
+            self.call("getMultipleAccounts", [chunk, config]) for chunk in chunks
+        ))
+
+        accounts = []
+        for chunk, result in zip(chunks, results):
+            values = result.get('value') if isinstance(result, dict) else None
+            if not isinstance(values, list) or len(values) != len(chunk):
+                got = f"{len(values)} values" if isinstance(values, list) else f"value {values!r}"
+                raise RPCResponseError(f"getMultipleAccounts returned {got} for {len(chunk)} addresses")
+            accounts.extend(values)
+        return accounts
+
+    async def get_signatures_for_address(
+        self,
+        address: str,
+        until: Optional[str] = None,
+        before: Optional[str] = None,
+        limit: int = 1000
+    ) -> List[Dict]:
+        """Signatures touching `address`, newest first, stopping at `until` (exclusive)"""
+        config: Dict[str, Any] = {"limit": limit, "commitment": self.commitment}
+        if until:
+            config["until"] = until
+        if before:
+            config["before"] = before
+        return await self.call("getSignaturesForAddress", [address, config]) or []
+
+    async def get_transactions(
+        self,
+        signatures: List[str],
+        encoding: str = "jsonParsed",
+        batch_size: int = 20
+    ) -> List[Optional[Dict]]:
+        """
+        Fetch many transactions with batched getTransaction requests, in order
+
+        Transactions that are not available (yet) come back as None.
+        """
+        config = {"encoding": encoding, "commitment": self.commitment, "maxSupportedTransactionVersion": 0}
+        transactions: List[Optional[Dict]] = []
+        for i in range(0, len(signatures), batch_size):
+            chunk = signatures[i:i + batch_size]
+            transactions.extend(await self.call_batch([
+                ("getTransaction", [signature, config]) for signature in chunk
+            ]))
+        return transactions
+
+    async def get_token_accounts_by_owner(
+        self,
+        owner: str,
+        mint: str = NOS_MINT,
+        encoding: str = "jsonParsed"
+    ) -> List[Dict]:
+        """Return all token accounts of `mint` held by `owner`"""
+        config = {"encoding": encoding, "commitment": self.commitment}
+        result = await self.call("getTokenAccountsByOwner", [owner, {"mint": mint}, config])
+        if not result:
+            return []
+        return result.get('value') or []
+
+    async def get_owner_token_balance(self, owner: str, mint: str = NOS_MINT) -> float:
+        """
+        Return the total UI balance of `mint` held by `owner`
+
+        Uses a single jsonParsed getTokenAccountsByOwner call and reads
+        tokenAmount.uiAmount from it instead of one balance call per account.
+        """
+        token_accounts = await self.get_token_accounts_by_owner(owner, mint, encoding="jsonParsed")
+        total = 0.0
+        for account in token_accounts:
+            ui_amount = parse_token_ui_amount(account.get('account'))
+            if ui_amount:
+                total += ui_amount
+        return total
+
+    async def get_owner_token_balances(
+        self,
+        owners: List[str],
+        mint: str = NOS_MINT,
+        concurrency: int = 8
+    ) -> Dict[str, Optional[float]]:
+        """
+        Resolve token balances for many owners, at most `concurrency` requests at a time
+
+        Owners whose lookup fails map to None.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        balances: Dict[str, Optional[float]] = {}
+
+        async def fetch(owner: str):
+            async with semaphore:
+                try:
+                    balances[owner] = await self.get_owner_token_balance(owner, mint)
+                except Exception as e:
+                    logger.debug(f"Token balance lookup failed for {owner[:8]}: {str(e)}")
+                    balances[owner] = None
+
+        await asyncio.gather(*(fetch(owner) for owner in dict.fromkeys(owners)))
+        return balances
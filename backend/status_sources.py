@@ -0,0 +1,77 @@
+"""
+Source selection for node status fields
+
+check_node_jobs asks the cheap sources first: job_status from the on-chain
+job index (the SDK sidecar when the index is down) and nos_balance from the
+node's token accounts. A successful answer from either is final - 'idle'
+included - so the dashboard is only read for what they can't provide:
+total_jobs and availability_score, which change slowly enough that an
+hours-old snapshot does, plus any field whose cheap source failed (those
+need a current read). StatusSourceStats counts which source answered each
+field so the split shows up in /api/metrics.
+"""
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, Optional
+
+SOURCE_JOB_INDEX = "job_index"
+SOURCE_SIDECAR = "sidecar"
+SOURCE_CHAIN = "chain"
+SOURCE_DASHBOARD = "dashboard"
+SOURCE_NONE = "none"
+
+# Fields only the dashboard has
+DASHBOARD_ONLY_FIELDS = ("total_jobs", "availability_score")
+
+
+def dashboard_max_age(
+    job_status_source: Optional[str],
+    nos_balance_source: Optional[str],
+    live_max_age: float,
+    stats_max_age: float
+) -> float:
+    """
+    How old a dashboard snapshot may be for this check
+
+    live_max_age when a cheap source failed and the dashboard has to stand in
+    for it, stats_max_age when it is only needed for the dashboard-only fields
+    """
+    if job_status_source is None or nos_balance_source is None:
+        return live_max_age
+    return max(live_max_age, stats_max_age)
+
+
+async def resolve_nos_balance(
+    address: str,
+    batched: Optional[Dict[str, Optional[float]]],
+    lookup: Callable[[str], Awaitable[float]]
+) -> float:
+    """
+    NOS balance from a get_owner_token_balances result, or lookup(address)
+
+    The batch maps a failed lookup to None, so that is looked up again rather
+    than taken as an answer; lookup errors propagate (the chain source failed)
+    """
+    balance = batched.get(address) if batched is not None else None
+    if balance is None:
+        balance = await lookup(address)
+    return balance
+
+
+class StatusSourceStats:
+    """Per field, how many status checks each source answered"""
+
+    def __init__(self):
+        self.fields: Dict[str, Counter] = defaultdict(Counter)
+        self.checks = 0
+
+    def record(self, sources: Dict[str, Optional[str]]):
+        """sources: field -> source that answered it (None: no source did)"""
+        self.checks += 1
+        for field, source in sources.items():
+            self.fields[field][source or SOURCE_NONE] += 1
+
+    def stats(self) -> Dict:
+        return {
+            "checks": self.checks,
+            "fields": {field: dict(counts) for field, counts in self.fields.items()}
+        }
@@ -0,0 +1,129 @@
+"""
+Stale-while-revalidate cache for expensive per-key loads (dashboard scrapes)
+
+A value younger than `fresh_ttl` is served as is. Between `fresh_ttl` and
+`stale_ttl` it is still served immediately, and one background refresh
+replaces it. Older or missing values are loaded before answering. Callers
+asking for the same key at the same time share one load.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SWRCache:
+    """
+    Per-key cache with a freshness TTL, a stale window and single-flight loads
+
+    get() returns (value, state) where state is 'fresh', 'stale' (a refresh
+    is running in the background), 'miss' (loaded for this call) or
+    'coalesced' (waited for another caller's load). Loaded values for which
+    `cacheable` is false (e.g. an empty scrape) are returned but not stored,
+    so a stale value is kept instead.
+    """
+
+    def __init__(self, fresh_ttl: float = 120.0, stale_ttl: float = 1800.0, max_entries: int = 1000):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refresh_failures = 0
+
+    def age(self, key: str) -> Optional[float]:
+        entry = self._entries.get(key)
+        return time.monotonic() - entry[0] if entry is not None else None
+
+    async def get(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True
+    ) -> Tuple[Any, str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age <= self.fresh_ttl:
+                self.fresh_hits += 1
+                return entry[1], "fresh"
+            if age <= self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight and key not in self._refreshes:
+                    self._refreshes[key] = asyncio.create_task(self._refresh(key, load, cacheable))
+                return entry[1], "stale"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight), "coalesced"
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The loading caller was cancelled - load again
+                return await self.get(key, load, cacheable)
+
+        self.misses += 1
+        return await self._load(key, load, cacheable), "miss"
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if cacheable(value):
+            self.put(key, value)
+        future.set_result(value)
+        return value
+
+    async def _refresh(self, key: str, load: Callable[[], Awaitable[Any]], cacheable: Callable[[Any], bool]):
+        try:
+            await self._load(key, load, cacheable)
+        except Exception as e:
+            # The stale value keeps being served until it expires
+            self.refresh_failures += 1
+            logger.warning(f"Background refresh of {key[:16]} failed: {str(e)}")
+        finally:
+            self._refreshes.pop(key, None)
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        lookups = self.fresh_hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshing": len(self._refreshes),
+            "refresh_failures": self.refresh_failures,
+            "hit_rate": round((self.fresh_hits + self.stale_hits + self.coalesced) / lookups, 3) if lookups else None
+        }
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test AccountSubscriptionManager against a local WebSocket stand-in for the
+Solana pubsub endpoint, including a slow notification handler that must not
+stall the receive loop (no network access needed)
+
+Run directly: python test_account_subscriptions.py  (also collected by pytest)
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import websockets
+
+from account_subscriptions import AccountSubscriptionManager
+
+NODE_A = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+NODE_B = "7Qm8JnTZRs7MbE1hXX3jAEvKfBwv421mRkszBsbfhihH"
+
+
+class FakePubsubServer:
+    """Minimal accountSubscribe/accountUnsubscribe server"""
+
+    def __init__(self):
+        self.connections = 0
+        self.subscribe_requests = []
+        self.unsubscribe_requests = []
+        self.subscriptions = {}  # address -> subscription id on the current connection
+        self._next_sub = 100
+        self._ws = None
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, ws):
+        self.connections += 1
+        self._ws = ws
+        self.subscriptions = {}
+        async for message in ws:
+            request = json.loads(message)
+            if request["method"] == "accountSubscribe":
+                address = request["params"][0]
+                self._next_sub += 1
+                self.subscriptions[address] = self._next_sub
+                self.subscribe_requests.append(address)
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": self._next_sub}))
+            elif request["method"] == "accountUnsubscribe":
+                self.unsubscribe_requests.append(request["params"][0])
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": True}))
+
+    async def push(self, address: str, lamports: int, slot: int):
+        await self._ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "result": {
+                    "context": {"slot": slot},
+                    "value": {"lamports": lamports, "data": ["", "base64"], "owner": "11111111111111111111111111111111", "space": 0}
+                },
+                "subscription": self.subscriptions[address]
+            }
+        }))
+
+    async def drop_connection(self):
+        await self._ws.close()
+
+
+async def wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        await asyncio.sleep(0.01)
+
+
+async def run_notifications_are_multiplexed():
+    server = FakePubsubServer()
+    url = await server.start()
+    received = []
+
+    async def on_notification(address, value, slot):
+        received.append((address, value["lamports"], slot))
+
+    manager = AccountSubscriptionManager(url, on_notification, reconnect_delay=0.05)
+    await manager.subscribe(NODE_A)
+    await manager.start()
+    await manager.subscribe(NODE_B)
+    try:
+        await wait_for(lambda: len(server.subscriptions) == 2)
+        assert server.connections == 1
+
+        await server.push(NODE_B, 5_000_000, 10)
+        await server.push(NODE_A, 0, 11)
+        await wait_for(lambda: len(received) == 2)
+
+        assert received == [(NODE_B, 5_000_000, 10), (NODE_A, 0, 11)]
+        assert manager.is_live(NODE_A) and manager.latest(NODE_B)["slot"] == 10
+    finally:
+        await manager.stop()
+        await server.stop()
+
+
+async def run_resubscribes_after_reconnect():
+    server = FakePubsubServer()
+    url = await server.start()
+    received = []
+
+    async def on_notification(address, value, slot):
+        received.append(address)
+
+    manager = AccountSubscriptionManager(url, on_notification, reconnect_delay=0.05)
+    await manager.sync({NODE_A: "base64", NODE_B: "base64"})
+    await manager.start()
+    try:
+        await wait_for(lambda: len(server.subscriptions) == 2)
+        await server.drop_connection()
+
+        await wait_for(lambda: server.connections == 2 and len(server.subscriptions) == 2)
+        await wait_for(lambda: manager.stats()["active"] == 2)
+        assert manager.reconnects == 1
+
+        await server.push(NODE_A, 1, 20)
+        await wait_for(lambda: received == [NODE_A])
+    finally:
+        await manager.stop()
+        await server.stop()
+
+
+async def run_unsubscribe():
+    server = FakePubsubServer()
+    url = await server.start()
+
+    async def on_notification(address, value, slot):
+        pass
+
+    manager = AccountSubscriptionManager(url, on_notification, reconnect_delay=0.05)
+    await manager.sync({NODE_A: "base64", NODE_B: "base64"})
+    await manager.start()
+    try:
+        await wait_for(lambda: manager.stats()["active"] == 2)
+        sub_id = server.subscriptions[NODE_B]
+
+        await manager.sync({NODE_A: "base64"})
+        await wait_for(lambda: server.unsubscribe_requests == [sub_id])
+        assert not manager.is_live(NODE_B)
+        assert manager.stats()["wanted"] == 1
+    finally:
+        await manager.stop()
+        await server.stop()
+
+
+async def run_slow_handler_does_not_block_receiving():
+    server = FakePubsubServer()
+    url = await server.start()
+    received = []
+    release = asyncio.Event()
+
+    async def on_notification(address, value, slot):
+        # DB writes and alerts stand-in: blocks until released
+        await release.wait()
+        received.append((address, slot))
+
+    manager = AccountSubscriptionManager(url, on_notification, reconnect_delay=0.05)
+    await manager.sync({NODE_A: "base64", NODE_B: "base64"})
+    await manager.start()
+    try:
+        await wait_for(lambda: manager.stats()["active"] == 2)
+        await server.push(NODE_B, 1, 30)
+        for slot in (31, 32, 33):
+            await server.push(NODE_A, slot, slot)
+
+        # Still receiving while the handler is stuck on NODE_B
+        await wait_for(lambda: manager.stats()["notifications_received"] == 4)
+        assert manager.latest(NODE_A)["slot"] == 33 and received == []
+        # NODE_A waits once, with its newest value
+        assert manager.stats()["queued"] == 1 and manager.stats()["notifications_coalesced"] == 2
+
+        release.set()
+        await wait_for(lambda: len(received) == 2)
+        assert received == [(NODE_B, 30), (NODE_A, 33)]
+    finally:
+        await manager.stop()
+        await server.stop()
+
+
+def test_notifications_are_multiplexed():
+    asyncio.run(run_notifications_are_multiplexed())
+
+
+def test_resubscribes_after_reconnect():
+    asyncio.run(run_resubscribes_after_reconnect())
+
+
+def test_unsubscribe():
+    asyncio.run(run_unsubscribe())
+
+
+def test_slow_handler_does_not_block_receiving():
+    asyncio.run(run_slow_handler_does_not_block_receiving())
+
+
+if __name__ == "__main__":
+    tests = [
+        test_notifications_are_multiplexed, test_resubscribes_after_reconnect, test_unsubscribe,
+        test_slow_handler_does_not_block_receiving
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test the on-disk asset cache: which requests and responses are cached,
+serving from disk across instances (a process restart), LRU eviction and
+failed fetches (no browser needed - routes are faked)
+
+Run directly: python test_asset_cache.py  (also collected by pytest)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from asset_cache import AssetCache, is_hashed_asset, is_immutable_response
+
+BUNDLE_URL = "https://dashboard.nosana.com/_nuxt/entry.3f9a1c2e.js"
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, body, status=200, headers=None):
+        self._body = body
+        self.status = status
+        self.headers = headers if headers is not None else {
+            "content-type": "application/javascript", "cache-control": "public, max-age=31536000, immutable"
+        }
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, request, response=None, fetch_error=None, fulfill_error=None):
+        self.request = request
+        self.response = response
+        self.fetch_error = fetch_error
+        self.fulfill_error = fulfill_error
+        self.outcome = None
+        self.fulfilled = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def fetch(self):
+        if self.fetch_error is not None:
+            raise self.fetch_error
+        self.outcome = "fetched"
+        return self.response
+
+    async def fulfill(self, **kwargs):
+        if self.fulfill_error is not None:
+            raise self.fulfill_error
+        self.fulfilled = kwargs
+        self.outcome = self.outcome or "cached"
+
+
+def test_cacheable():
+    assert is_hashed_asset(BUNDLE_URL)
+    assert is_hashed_asset("https://dashboard.nosana.com/assets/index-BdX8_k2q.js")
+    assert is_hashed_asset("https://dashboard.nosana.com/css/app.5d2f8a9b1c.css?v=2")
+    assert not is_hashed_asset("https://dashboard.nosana.com/js/app-settings.js")
+    assert not is_hashed_asset("https://dashboard.nosana.com/api/nodes/abc")
+
+    assert is_immutable_response(BUNDLE_URL, 200, {})
+    assert is_immutable_response("https://cdn.example/lib.js", 200, {"cache-control": "max-age=31536000, immutable"})
+    assert not is_immutable_response(BUNDLE_URL, 304, {})
+    assert not is_immutable_response(BUNDLE_URL, 200, {"cache-control": "no-store"})
+
+
+async def run_serves_across_instances():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AssetCache(directory)
+
+        # Documents, API calls and unhashed scripts are left to the other handlers
+        for request in (
+            FakeRequest("https://dashboard.nosana.com/host/abc", "document"),
+            FakeRequest("https://dashboard.nosana.com/js/app.js"),
+            FakeRequest(BUNDLE_URL, method="POST"),
+        ):
+            route = FakeRoute(request)
+            await cache.handle(route)
+            assert route.outcome == "fallback"
+
+        route = FakeRoute(FakeRequest(BUNDLE_URL), FakeResponse(b"console.log(1)"))
+        await cache.handle(route)
+        assert route.outcome == "fetched" and route.fulfilled["body"] == b"console.log(1)"
+
+        # A new instance on the same directory (new process) serves it from disk
+        restarted = AssetCache(directory)
+        route = FakeRoute(FakeRequest(BUNDLE_URL))
+        await restarted.handle(route)
+        assert route.outcome == "cached"
+        assert route.fulfilled["body"] == b"console.log(1)" and route.fulfilled["status"] == 200
+        assert route.fulfilled["headers"]["content-type"] == "application/javascript"
+        assert restarted.stats()["hits"] == 1 and restarted.stats()["bytes_served"] == 14
+
+        # Not stored: a no-store response for a hashed name
+        url = "https://dashboard.nosana.com/_nuxt/other.aaaabbbb.js"
+        await cache.handle(FakeRoute(FakeRequest(url), FakeResponse(b"x", headers={"cache-control": "no-store"})))
+        route = FakeRoute(FakeRequest(url), FakeResponse(b"x"))
+        await cache.handle(route)
+        assert route.outcome == "fetched"
+
+
+def test_serves_across_instances():
+    asyncio.run(run_serves_across_instances())
+
+
+async def run_lru_eviction():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AssetCache(directory, max_bytes=350, max_entry_bytes=100)
+        urls = [f"https://dashboard.nosana.com/_nuxt/chunk.{i:08x}.js" for i in range(3)]
+        for url in urls:
+            assert await cache.put(url, 200, {}, b"x" * 100)
+        assert cache.evictions == 0
+
+        # Make the first entry the most recently used, the second the oldest
+        past = time.time() - 60
+        for i, url in enumerate(urls):
+            body_path, _ = cache._paths(url)
+            os.utime(body_path, (past + i, past + i))
+        assert await cache.get(urls[0]) is not None
+
+        assert await cache.put("https://dashboard.nosana.com/_nuxt/chunk.ffffffff.js", 200, {}, b"y" * 100)
+        # 400 bytes > 350: the least recently used one goes
+        assert cache.evictions == 1
+        assert await cache.get(urls[1]) is None
+        assert await cache.get(urls[0]) is not None and await cache.get(urls[2]) is not None
+        assert cache.stats()["size_mb"] is not None and cache._size == 300
+
+        # Larger than max_entry_bytes: passed through, not stored
+        assert not await cache.put("https://dashboard.nosana.com/_nuxt/big.12345678.js", 200, {}, b"z" * 101)
+
+
+def test_lru_eviction():
+    asyncio.run(run_lru_eviction())
+
+
+async def run_failed_fetch():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AssetCache(directory)
+
+        # Network error: the route is aborted instead of left hanging
+        route = FakeRoute(FakeRequest(BUNDLE_URL), fetch_error=ConnectionError("net::ERR_CONNECTION_RESET"))
+        await cache.handle(route)
+        assert route.outcome == "aborted" and cache.errors == 1
+
+        # Fetched but the page went away before fulfilling: handed on
+        route = FakeRoute(FakeRequest(BUNDLE_URL), FakeResponse(b"x"), fulfill_error=RuntimeError("Target closed"))
+        await cache.handle(route)
+        assert route.outcome == "fallback" and cache.errors == 2
+
+
+def test_failed_fetch():
+    asyncio.run(run_failed_fetch())
+
+
+if __name__ == "__main__":
+    tests = [test_cacheable, test_serves_across_instances, test_lru_eviction, test_failed_fetch]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
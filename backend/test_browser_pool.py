@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the scraping block policy: which requests are aborted and that allowed
+requests fall through to the next route handler (no browser needed)
+
+Run directly: python test_browser_pool.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from browser_pool import BlockPolicy
+
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url: str, resource_type: str):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+
+def test_block_reason():
+    policy = BlockPolicy()
+    assert policy.block_reason("image", "https://dashboard.nosana.com/logo.png") == "image"
+    assert policy.block_reason("font", "https://fonts.gstatic.com/a.woff2") == "font"
+    assert policy.block_reason("script", "https://www.googletagmanager.com/gtag/js") == "tracker"
+    assert policy.block_reason("xhr", "https://dashboard.nosana.com/api/jobs") is None
+    assert policy.block_reason("document", "https://dashboard.nosana.com/host/x") is None
+    # Domain match is on whole labels only
+    assert policy.block_reason("script", "https://notsentry.io/x.js") is None
+
+    custom = BlockPolicy(resource_types=["image", " stylesheet "], domains=[".example.com", ""])
+    assert custom.block_reason("stylesheet", "https://a.b/x.css") == "stylesheet"
+    assert custom.block_reason("font", "https://a.b/x.woff") is None
+    assert custom.block_reason("script", "https://cdn.example.com/t.js") == "tracker"
+
+
+async def run_handle():
+    policy = BlockPolicy()
+    routes = [
+        FakeRoute("https://dashboard.nosana.com/host/x", "document"),
+        FakeRoute("https://dashboard.nosana.com/a.png", "image"),
+        FakeRoute("https://www.google-analytics.com/collect", "xhr"),
+    ]
+    for route in routes:
+        await policy.handle(route)
+    assert [route.outcome for route in routes] == ["fallback", "abort", "abort"]
+    assert policy.stats()["blocked"] == {"image": 1, "tracker": 1}
+    assert policy.allowed == 1
+
+
+def test_handle():
+    asyncio.run(run_handle())
+
+
+if __name__ == "__main__":
+    tests = [test_block_reason, test_handle]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
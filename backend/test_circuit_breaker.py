@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the dashboard circuit breakers: opening after consecutive failures,
+half-open probes, exponential backoff, serving the last good snapshot and
+bounded per-node state
+
+Run directly: python test_circuit_breaker.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CircuitOpenError, DashboardBreakers
+from node_snapshot import NodeDashboardSnapshot, NodeSnapshotStore
+
+NODE_A = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+NODE_B = "5ZWj7a1f8tWkjBESHKgrLmXshuXxqeY9SYcfbshpAqPG"
+
+
+def test_breaker_states_and_backoff():
+    breaker = CircuitBreaker("test", failure_threshold=2, base_delay=0.05, max_delay=0.15, jitter=0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    # Half-open: exactly one probe
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.trips == 2
+    assert 0.05 < breaker.retry_in() <= 0.1  # doubled
+
+    breaker.trips = 5
+    assert breaker.backoff() == 0.15  # capped
+
+    time.sleep(0.11)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.trips == 0 and breaker.consecutive_failures == 0
+
+
+def test_breaker_jitter_and_stuck_probe():
+    breaker = CircuitBreaker("test", base_delay=100, jitter=0.5)
+    delays = {round(breaker.backoff(), 3) for _ in range(20)}
+    assert len(delays) > 1 and all(50 <= delay <= 100 for delay in delays)
+
+    breaker.state = "half_open"
+    assert breaker.allow() and not breaker.allow()
+    breaker.probe_started -= circuit_breaker.PROBE_TIMEOUT + 1
+    assert breaker.allow()
+
+
+def test_host_breaker():
+    breakers = DashboardBreakers(node_threshold=3, host_threshold=4, base_delay=60)
+    # Failures spread over nodes open the host breaker for every node
+    for address in (NODE_A, NODE_B, NODE_A, NODE_B):
+        assert breakers.allow(address)
+        breakers.record(address, ok=False)
+    assert breakers.host.state == "open"
+    assert not breakers.allow("other-node")
+    stats = breakers.stats()
+    assert stats["host"]["state"] == "open" and stats["nodes_open"] == 0
+
+
+async def run_last_good_snapshot():
+    breakers = DashboardBreakers(node_threshold=1, host_threshold=10, base_delay=60)
+
+    class FlakyStore(NodeSnapshotStore):
+        fail = False
+
+        async def _read_dashboard(self, address):
+            if self.fail:
+                raise TimeoutError("goto timed out")
+            return NodeDashboardSnapshot(address=address, job_status="running")
+
+    store = FlakyStore(browser_pool=None, max_age=0, breakers=breakers)
+    good = await store.get(NODE_A)
+
+    store.fail = True
+    try:
+        await store.get(NODE_A)
+        assert False, "read failure should propagate"
+    except TimeoutError:
+        pass
+    # Open now: no read, the last good snapshot comes back
+    assert await store.get(NODE_A) is good
+    assert store.stats()["last_good_served"] == 1
+
+    # Nothing to fall back to for a node that never had a good read
+    breakers.node(NODE_B).record_failure()
+    try:
+        await store.get(NODE_B)
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+
+
+def test_last_good_snapshot():
+    asyncio.run(run_last_good_snapshot())
+
+
+async def run_bounded_per_node_state():
+    breakers = DashboardBreakers(max_nodes=3)
+    for i in range(10):
+        breakers.allow(f"node{i}")
+    assert list(breakers.nodes) == ["node7", "node8", "node9"]
+    # Used again: kept over the least recently used one
+    breakers.allow("node7")
+    breakers.allow("node10")
+    assert list(breakers.nodes) == ["node9", "node7", "node10"]
+
+    class InstantStore(NodeSnapshotStore):
+        async def _read_dashboard(self, address):
+            return NodeDashboardSnapshot(address=address, job_status="idle")
+
+    store = InstantStore(browser_pool=None, max_age=0, max_entries=3, keep_seconds=60)
+    for i in range(10):
+        await store.get(f"node{i}")
+    assert list(store._snapshots) == ["node7", "node8", "node9"]
+
+    # Kept longer than keep_seconds: dropped at the next store, and not served as the last good one
+    store._snapshots["node7"].taken_at -= 120
+    await store.get("node10")
+    assert "node7" not in store._snapshots
+    store.breakers = DashboardBreakers(node_threshold=1)
+    store.breakers.node("node8").record_failure()
+    store._snapshots["node8"].taken_at -= 120
+    try:
+        await store.get("node8")
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+
+
+def test_bounded_per_node_state():
+    asyncio.run(run_bounded_per_node_state())
+
+
+if __name__ == "__main__":
+    tests = [
+        test_breaker_states_and_backoff, test_breaker_jitter_and_stuck_probe, test_host_breaker, test_last_good_snapshot,
+        test_bounded_per_node_state
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
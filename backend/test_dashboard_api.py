@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Test the dashboard data API helpers: recognising recorded responses, mapping
+jobs to the scraper's dict shape, templates recorded mid-pagination,
+replaying discovered templates before they're saved and paging through a
+recorded endpoint (no network access needed)
+
+Run directly: python test_dashboard_api.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).parent))
+
+import httpx
+
+from dashboard_api import DashboardAPI, classify_response, node_summary_from, normalize_job, url_template
+
+NODE_ADDRESS = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+
+
+def api_job(i: int, running: bool = False) -> dict:
+    return {
+        "address": f"job{i}",
+        "timeStart": 1_760_000_000 + i * 7200,
+        "timeEnd": 0 if running else 1_760_000_000 + i * 7200 + 3600,
+        "usdRewardPerHour": 0.192,
+        "market": "NVIDIA 3090",
+        "state": "RUNNING" if running else "COMPLETED"
+    }
+
+
+def test_classify_and_template():
+    assert classify_response({"data": [api_job(1)], "total": 1}) == "jobs"
+    assert classify_response({"status": "RUNNING", "nos": 12.5}) == "node"
+    assert classify_response({"version": "1.0"}) is None
+    url = f"https://api.example/nodes/{NODE_ADDRESS}/jobs?limit=2&page=1"
+    assert url_template(url, NODE_ADDRESS) == "https://api.example/nodes/{address}/jobs?limit=2&page=1"
+
+
+class FakeEndpoints:
+    """db.dashboard_api_endpoints: an upsert per template"""
+
+    def __init__(self, stored=None):
+        self.docs = {doc["template"]: doc for doc in stored or []}
+        self.upserts = 0
+
+    async def update_one(self, query, update, upsert=False):
+        self.upserts += 1
+        new = query["template"] not in self.docs
+        self.docs[query["template"]] = update["$set"]
+        return type("Result", (), {"upserted_id": "id" if new else None})()
+
+    def find(self, query, projection):
+        docs = list(self.docs.values())
+
+        class Cursor:
+            async def to_list(self, length):
+                return docs[:length]
+        return Cursor()
+
+
+class FakeDB:
+    def __init__(self, stored=None):
+        self.dashboard_api_endpoints = FakeEndpoints(stored)
+
+
+def test_template_from_later_page():
+    base = f"https://api.example/nodes/{NODE_ADDRESS}/jobs"
+    assert url_template(f"{base}?limit=2&page=3", NODE_ADDRESS) == "https://api.example/nodes/{address}/jobs?limit=2&page=1"
+    assert url_template(f"{base}?offset=40&limit=20", NODE_ADDRESS).endswith("?offset=0&limit=20")
+    # 0-based pages stay 0-based, URLs without paging are left alone
+    assert url_template(f"{base}?page=0", NODE_ADDRESS).endswith("?page=0")
+    assert url_template(f"{base}?sort=desc", NODE_ADDRESS).endswith("?sort=desc")
+
+
+async def run_save_once_per_template():
+    db = FakeDB()
+    api = DashboardAPI(db=db, browser_pool=None)
+    recorded = [
+        {"template": url_template(f"https://api.example/nodes/{NODE_ADDRESS}/jobs?limit=2&page={page}", NODE_ADDRESS),
+         "role": "jobs", "method": "GET"}
+        for page in (1, 2, 3)
+    ]
+    assert await api.save(recorded) == 1
+    assert db.dashboard_api_endpoints.upserts == 1
+
+    # Templates stored from a later page before the fix walk from page 1
+    stale = "https://api.example/nodes/{address}/jobs?limit=2&page=3"
+    api = DashboardAPI(db=FakeDB([{"template": stale, "role": "jobs", "method": "GET"}]), browser_pool=None)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(int(request.url.params["page"]))
+        return httpx.Response(200, json={"data": [api_job(1), api_job(2)] if seen[-1] == 1 else []})
+
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        endpoints = await api.endpoints("jobs")
+        assert [e["template"] for e in endpoints] == ["https://api.example/nodes/{address}/jobs?limit=2&page=1"]
+        jobs = await api.fetch_job_history(NODE_ADDRESS)
+        assert [job["job_id"] for job in jobs] == ["job1", "job2"] and seen[0] == 1
+    finally:
+        await api.close()
+
+
+def test_save_once_per_template():
+    asyncio.run(run_save_once_per_template())
+
+
+class FakeDiscoveryPool:
+    """browser_pool whose page replays `responses` (url -> JSON) to the response handler on goto"""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    @asynccontextmanager
+    async def page(self):
+        handlers = []
+
+        async def goto(url, **kwargs):
+            for response_url, data in self.responses.items():
+                async def body(data=data):
+                    return data
+                for handler in handlers:
+                    await handler(SimpleNamespace(
+                        url=response_url, status=200, headers={"content-type": "application/json"}, json=body,
+                        request=SimpleNamespace(resource_type="fetch", method="GET")
+                    ))
+
+        yield SimpleNamespace(on=lambda event, handler: handlers.append(handler), goto=goto)
+
+
+async def run_discover_saves_replayable_templates():
+    good = f"https://api.example/nodes/{NODE_ADDRESS}/jobs?limit=2&page=1"
+    signed = f"https://api.example/nodes/{NODE_ADDRESS}/history?sig=abc"
+    stored = {"template": "https://api.example/nodes/{address}/history?sig=abc", "role": "jobs", "method": "GET"}
+    db = FakeDB([stored])
+    pool = FakeDiscoveryPool({good: {"data": [api_job(1)]}, signed: {"data": [api_job(1)]}})
+    api = DashboardAPI(db=db, browser_pool=pool)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # The signed URL only works inside the browser session
+        if request.url.path.endswith("/history"):
+            return httpx.Response(403)
+        return httpx.Response(200, json={"data": [api_job(1), api_job(2)]})
+
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        saved = await api.discover(NODE_ADDRESS)
+        assert [e["template"] for e in saved] == [url_template(good, NODE_ADDRESS)]
+        assert api.stats()["rejected_endpoints"] == 1
+        # The stored template was not overwritten by the one that failed to replay
+        assert db.dashboard_api_endpoints.docs[stored["template"]] == stored
+        assert url_template(good, NODE_ADDRESS) in db.dashboard_api_endpoints.docs
+    finally:
+        await api.close()
+
+
+def test_discover_saves_replayable_templates():
+    asyncio.run(run_discover_saves_replayable_templates())
+
+
+def test_normalize_job_matches_scraper_shape():
+    job = normalize_job(api_job(1))
+    assert set(job) == {
+        "job_id", "started", "started_text", "duration_seconds", "duration_text",
+        "hourly_rate_usd", "gpu_type", "status"
+    }
+    assert job["duration_seconds"] == 3600 and job["status"] == "SUCCESS"
+    assert normalize_job(api_job(2, running=True))["status"] == "RUNNING"
+
+    # Rate from the on-chain price (NOS base units per second) when no USD rate is given
+    raw = dict(api_job(3), price=100)
+    del raw["usdRewardPerHour"]
+    assert normalize_job(raw) is None
+    assert normalize_job(raw, nos_price=0.5)["hourly_rate_usd"] == 0.18
+
+
+def test_node_summary():
+    summary = node_summary_from({"status": "QUEUED", "nosBalance": 10.0, "uptime": 99.5})
+    assert summary == {"job_status": "queue", "nos_balance": 10.0, "availability_score": 99.5}
+
+
+async def run_fetch_job_history_pages():
+    pages = {1: [api_job(1), api_job(2)], 2: [api_job(3)]}
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert NODE_ADDRESS in request.url.path
+        page = int(request.url.params["page"])
+        seen.append(page)
+        return httpx.Response(200, json={"data": pages.get(page, [])})
+
+    api = DashboardAPI(db=None, browser_pool=None)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api._endpoints = [{"template": "https://api.example/nodes/{address}/jobs?limit=2&page=1", "role": "jobs"}]
+    api._loaded_at = time.monotonic()
+    try:
+        jobs = await api.fetch_job_history(NODE_ADDRESS)
+        assert [job["job_id"] for job in jobs] == ["job1", "job2", "job3"]
+        assert seen == [1, 2]
+
+        assert len(await api.fetch_job_history(NODE_ADDRESS, max_pages=1)) == 2
+
+        # Stops at the first page with only known jobs
+        seen.clear()
+        jobs = await api.fetch_job_history(NODE_ADDRESS, stop_when=lambda ids: "job1" in ids)
+        assert len(jobs) == 2 and seen == [1]
+    finally:
+        await api.close()
+
+
+def test_fetch_job_history_pages():
+    asyncio.run(run_fetch_job_history_pages())
+
+
+async def run_iter_job_history_pages():
+    pages = {1: [api_job(1), api_job(2)], 2: [api_job(3), api_job(4)], 3: [api_job(5)]}
+    seen = []
+    broken = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        seen.append(page)
+        if page in broken:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"data": pages.get(page, [])})
+
+    api = DashboardAPI(db=None, browser_pool=None)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api._endpoints = [{"template": "https://api.example/nodes/{address}/jobs?limit=2&page=1", "role": "jobs"}]
+    api._loaded_at = time.monotonic()
+    try:
+        # Pages come out one at a time, a failure keeps what was yielded before it
+        broken.add(3)
+        yielded = []
+        try:
+            async for page_num, jobs in api.iter_job_history_pages(NODE_ADDRESS):
+                yielded.append((page_num, [job["job_id"] for job in jobs]))
+            assert False, "the failing page should raise"
+        except httpx.HTTPStatusError:
+            pass
+        assert yielded == [(1, ["job1", "job2"]), (2, ["job3", "job4"])]
+
+        # Resume at the failed page without requesting the earlier ones
+        broken.clear()
+        seen.clear()
+        resumed = [page async for page in api.iter_job_history_pages(NODE_ADDRESS, start_page=3)]
+        assert [page_num for page_num, _ in resumed] == [3] and seen == [3]
+    finally:
+        await api.close()
+
+
+def test_iter_job_history_pages():
+    asyncio.run(run_iter_job_history_pages())
+
+
+async def run_unchanged_first_page():
+    pages = {1: [api_job(1), api_job(2)], 2: [api_job(3)]}
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requests.append((page, request.headers.get("if-none-match")))
+        etag = f'"p{page}-{abs(hash(repr(pages[page])))}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": pages[page]}, headers={"ETag": etag})
+
+    api = DashboardAPI(db=None, browser_pool=None)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api._endpoints = [{"template": "https://api.example/nodes/{address}/jobs?limit=2&page=1", "role": "jobs"}]
+    api._loaded_at = time.monotonic()
+    try:
+        table_hash = {"known": None}
+        first = [page async for page in api.iter_job_history_pages(NODE_ADDRESS, table_hash=table_hash)]
+        assert len(first) == 2 and table_hash["current"].startswith("api:") and "unchanged" not in table_hash
+
+        # Same first page: revalidated with its ETag, nothing parsed or yielded
+        requests.clear()
+        again = {"known": table_hash["current"]}
+        assert [page async for page in api.iter_job_history_pages(NODE_ADDRESS, table_hash=again)] == []
+        assert again["unchanged"] and [(page, etag is not None) for page, etag in requests] == [(1, True)]
+        assert api.not_modified == 1 and api.stats()["not_modified_rate"] is not None
+
+        # A job changing state changes the hash
+        pages[1][0]["state"] = "STOPPED"
+        changed = {"known": table_hash["current"]}
+        assert len([page async for page in api.iter_job_history_pages(NODE_ADDRESS, table_hash=changed)]) == 2
+        assert "unchanged" not in changed and changed["current"] != table_hash["current"]
+    finally:
+        await api.close()
+
+
+def test_unchanged_first_page():
+    asyncio.run(run_unchanged_first_page())
+
+
+if __name__ == "__main__":
+    tests = [
+        test_classify_and_template, test_template_from_later_page, test_save_once_per_template,
+        test_discover_saves_replayable_templates, test_normalize_job_matches_scraper_shape, test_node_summary,
+        test_fetch_job_history_pages, test_iter_job_history_pages, test_unchanged_first_page
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
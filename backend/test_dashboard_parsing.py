@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the browserless dashboard parser on the saved host pages in
+fixtures/dashboard (no browser or network needed)
+
+Run directly: python test_dashboard_parsing.py  (also collected by pytest)
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from dashboard_parsing import jobs_from_html, parse_host_page, summary_from_html
+
+FIXTURES = Path(__file__).parent / "fixtures" / "dashboard"
+
+# Same keys scrape_nosana_job_history returns
+JOB_KEYS = {
+    "job_id", "started", "started_text", "duration_seconds", "duration_text",
+    "hourly_rate_usd", "gpu_type", "status"
+}
+
+
+def load(name: str) -> str:
+    return (FIXTURES / name).read_text()
+
+
+def test_job_rows():
+    jobs = jobs_from_html(load("host_running.html"))
+    assert len(jobs) == 10
+    assert all(set(job) == JOB_KEYS for job in jobs)
+    assert all(len(job["job_id"]) >= 32 for job in jobs)
+    assert isinstance(jobs[0]["started"], datetime)
+    assert jobs[0]["status"] == "RUNNING"
+    assert [job["status"] for job in jobs[1:]] == ["SUCCESS"] * 9
+    assert all(job["hourly_rate_usd"] > 0 and job["duration_seconds"] > 0 for job in jobs)
+    assert {job["gpu_type"] for job in jobs} == {"NVIDIA 3090"}
+
+
+def test_summaries():
+    assert summary_from_html(load("host_running.html")) == {
+        "job_status": "running", "nos_balance": 1523.41, "sol_balance": 0.0912,
+        "total_jobs": 412, "availability_score": 98.7
+    }
+    assert summary_from_html(load("host_idle.html"))["job_status"] == "idle"
+    summary, jobs = parse_host_page(load("host_queued_last_page.html"))
+    assert summary["job_status"] == "queue" and summary["total_jobs"] == 3
+    assert len(jobs) == 3
+
+
+def test_no_table():
+    assert jobs_from_html("<html><body><p>Status</p><p>Online</p></body></html>") == []
+    summary, jobs = parse_host_page("<html><body><script>var nos = '99 NOS'</script><p>Status</p></body></html>")
+    assert jobs == [] and summary["nos_balance"] is None
+
+
+if __name__ == "__main__":
+    tests = [test_job_rows, test_summaries, test_no_table]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test storing job history page by page: an interrupted walk is resumed at its
+last stored page, and the watermark only moves once a walk is complete - a
+partial scrape (live, single page) never moves it past unscraped pages (an
+in-memory db and page walk stand in for Mongo and the dashboard), and that
+job_history.py, which the scrape workers import, doesn't pull in the API app
+
+Run directly: python test_job_history_scrape.py  (also collected by pytest)
+"""
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_job_history_scrape")
+
+import job_history
+
+NODE_ADDRESS = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def job(i: int) -> dict:
+    """Job i started i hours after START (higher is newer)"""
+    return {
+        "job_id": f"job{i}", "started": START + timedelta(hours=i), "started_text": "",
+        "duration_seconds": 3600, "duration_text": "1h", "hourly_rate_usd": 0.192,
+        "gpu_type": "NVIDIA 3090", "status": "SUCCESS"
+    }
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda doc: doc.get(key, ""), reverse=direction < 0)
+        return self
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class FakeCollection:
+    """One document per node_address, enough for progress and watermarks"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["node_address"])
+        return dict(doc) if doc is not None else None
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["node_address"])
+        if doc is None:
+            if not upsert:
+                return
+            doc = self.docs[query["node_address"]] = {**query, **update.get("$setOnInsert", {})}
+        doc.update(update["$set"])
+
+    async def delete_one(self, query):
+        self.docs.pop(query["node_address"], None)
+
+
+class FakeJobs:
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection=None):
+        return FakeCursor([
+            doc for doc in self.docs.values()
+            if doc["node_address"] == query["node_address"] and doc["started"] <= query["started"]["$lte"]
+        ])
+
+    async def bulk_write(self, operations, ordered=True):
+        # UpdateOne({"job_id", "node_address"}, {"$setOnInsert": job_doc}, upsert=True)
+        upserted = 0
+        for op in operations:
+            doc = op._doc["$setOnInsert"]
+            if doc["job_id"] not in self.docs:
+                self.docs[doc["job_id"]] = doc
+                upserted += 1
+        return type("BulkWriteResult", (), {"upserted_count": upserted})()
+
+
+class FakeDB:
+    def __init__(self):
+        self.scrape_progress = FakeCollection()
+        self.scrape_watermarks = FakeCollection()
+        self.scraped_jobs = FakeJobs()
+
+
+class FakeDashboard:
+    """The node's history newest first, `per_page` jobs a page, optionally failing at a page"""
+
+    def __init__(self, jobs, per_page=2):
+        self.jobs = jobs
+        self.per_page = per_page
+        self.fail_at = None
+        self.served = []
+
+    def page(self, page_num):
+        start = (page_num - 1) * self.per_page
+        return self.jobs[start:start + self.per_page]
+
+    async def iter_pages(self, node_address, max_pages=None, stop_when=None, resume_from=None, table_hash=None):
+        page_num = resume_from[1] if resume_from else 1
+        while True:
+            jobs = self.page(page_num)
+            if not jobs:
+                return
+            if page_num == self.fail_at:
+                raise TimeoutError(f"page {page_num} timed out")
+            self.served.append(page_num)
+            yield page_num, "api", jobs
+            if stop_when and stop_when([j["job_id"] for j in jobs]):
+                return
+            if max_pages and page_num >= max_pages:
+                return
+            page_num += 1
+
+
+def use(db, dashboard):
+    job_history.db = db
+    job_history.iter_job_history_pages = dashboard.iter_pages
+    job_history.fetch_nos_price_coingecko = lambda: 1.0
+
+
+async def run_interrupted_walk_and_resume():
+    db = FakeDB()
+    dashboard = FakeDashboard([job(i) for i in range(6, 0, -1)])  # pages: [6, 5] [4, 3] [2, 1]
+    use(db, dashboard)
+
+    # First walk (no watermark) times out on page 3
+    dashboard.fail_at = 3
+    result = await job_history.scrape_and_store_job_history("user1", NODE_ADDRESS)
+    assert not result["complete"] and result["pages"] == 2 and result["jobs_stored"] == 4
+    # Not complete: no watermark yet, the progress remembers the last stored page and the newest job
+    assert NODE_ADDRESS not in db.scrape_watermarks.docs
+    progress = db.scrape_progress.docs[NODE_ADDRESS]
+    assert progress["page"] == 2 and progress["newest"]["job_id"] == "job6"
+
+    # The retry resumes at the last stored page
+    dashboard.fail_at = None
+    dashboard.served.clear()
+    result = await job_history.scrape_and_store_job_history("user1", NODE_ADDRESS)
+    assert result["complete"] and dashboard.served == [2, 3]
+    assert set(db.scraped_jobs.docs) == {f"job{i}" for i in range(1, 7)}
+    assert db.scrape_watermarks.docs[NODE_ADDRESS]["job_id"] == "job6"
+    assert NODE_ADDRESS not in db.scrape_progress.docs
+
+
+def test_interrupted_walk_and_resume():
+    asyncio.run(run_interrupted_walk_and_resume())
+
+
+async def run_partial_walk_keeps_watermark():
+    db = FakeDB()
+    dashboard = FakeDashboard([job(i) for i in range(2, 0, -1)])
+    use(db, dashboard)
+
+    assert (await job_history.scrape_and_store_job_history("user1", NODE_ADDRESS))["complete"]
+    assert db.scrape_watermarks.docs[NODE_ADDRESS]["job_id"] == "job2"
+
+    # Three pages of new jobs; a live/single-page scrape only stores the first
+    dashboard.jobs = [job(i) for i in range(8, 0, -1)]  # [8, 7] [6, 5] [4, 3] [2, 1]
+    assert await job_history.store_scraped_jobs("user1", NODE_ADDRESS, dashboard.page(1), nos_price=1.0) == 2
+    assert db.scrape_watermarks.docs[NODE_ADDRESS]["job_id"] == "job2"
+
+    # So the next routine scrape still walks down to the old watermark
+    dashboard.served.clear()
+    result = await job_history.scrape_and_store_job_history("user1", NODE_ADDRESS)
+    assert result["complete"] and dashboard.served == [1, 2, 3, 4]
+    assert set(db.scraped_jobs.docs) == {f"job{i}" for i in range(1, 9)}
+    assert db.scrape_watermarks.docs[NODE_ADDRESS]["job_id"] == "job8"
+
+    # Caught up: a routine scrape reads one page
+    dashboard.served.clear()
+    await job_history.scrape_and_store_job_history("user1", NODE_ADDRESS)
+    assert dashboard.served == [1]
+
+
+def test_partial_walk_keeps_watermark():
+    asyncio.run(run_partial_walk_keeps_watermark())
+
+
+def test_worker_import_skips_app():
+    # A fresh interpreter: the scrape workers import job_history, never server
+    check = "import sys, job_history; assert not {'server', 'fastapi'} & set(sys.modules), sorted(sys.modules)"
+    subprocess.run([sys.executable, "-c", check], cwd=Path(__file__).parent, check=True, capture_output=True)
+
+
+if __name__ == "__main__":
+    tests = [test_interrupted_walk_and_resume, test_partial_walk_keeps_watermark, test_worker_import_skips_app]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test JobIndex against a local fake JSON-RPC server that evaluates the
+getProgramAccounts memcmp filters, including the layout check that disables
+the index (no network access needed)
+
+Run directly: python test_job_index.py  (also collected by pytest)
+"""
+import asyncio
+import base64
+import struct
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from solders.pubkey import Pubkey
+
+from job_index import (
+    JobIndex, JobIndexUnavailable, JOB_STATE_QUEUED, JOB_STATE_RUNNING, JOB_STATE_DONE, job_status_from_jobs
+)
+from nosana_accounts import JOB_ACCOUNT
+from solana_rpc import SolanaRPCClient
+from test_rpc_router import FakeRPCServer
+
+NODES = [str(Pubkey.new_unique()) for _ in range(6)]
+
+
+def job_account_data(node: str, state: int, price: int = 1000, time_start: int = 1_700_000_000) -> bytes:
+    market, payer, project = (bytes(Pubkey.new_unique()) for _ in range(3))
+    return (
+        JOB_ACCOUNT.discriminator + bytes(32) + bytes(32) + market + bytes(Pubkey.from_string(node))
+        + payer + struct.pack("<Q", price) + project + bytes([state])
+        + struct.pack("<qqq", 0, time_start, 3600)
+    )
+
+
+class FakeJobsProgramServer(FakeRPCServer):
+    """Holds job accounts and answers getProgramAccounts honouring memcmp filters"""
+
+    def __init__(self, jobs):
+        # jobs: job_account_data arguments, (node, state[, price, time_start])
+        super().__init__()
+        self.accounts = [(str(Pubkey.new_unique()), job_account_data(*job)) for job in jobs]
+        self.program_queries = 0
+
+    def result_for(self, request: dict):
+        if request["method"] != "getProgramAccounts":
+            return super().result_for(request)
+        self.program_queries += 1
+        filters = request["params"][1]["filters"]
+        matches = []
+        for pubkey, data in self.accounts:
+            if all(
+                data[f["memcmp"]["offset"]:].startswith(base64.b64decode(f["memcmp"]["bytes"]))
+                for f in filters
+            ):
+                matches.append({
+                    "pubkey": pubkey,
+                    "account": {"data": [base64.b64encode(data).decode(), "base64"], "lamports": 1}
+                })
+        return matches
+
+
+JOBS = [
+    (NODES[0], JOB_STATE_RUNNING),
+    (NODES[0], JOB_STATE_DONE),
+    (NODES[1], JOB_STATE_QUEUED),
+    (NODES[2], JOB_STATE_DONE),
+    (NODES[5], JOB_STATE_RUNNING),
+]
+
+
+async def run_jobs_for_single_node():
+    server = FakeJobsProgramServer(JOBS)
+    url = await server.start()
+    try:
+        async with SolanaRPCClient(url) as rpc:
+            index = JobIndex(rpc)
+            jobs = await index.jobs_for_node(NODES[0])
+            assert [job["state"] for job in jobs] == [JOB_STATE_RUNNING]
+            assert jobs[0]["node"] == NODES[0] and jobs[0]["price"] == 1000
+            assert job_status_from_jobs(await index.jobs_for_node(NODES[1])) == "queue"
+            assert job_status_from_jobs(await index.jobs_for_node(NODES[2])) == "idle"
+    finally:
+        await server.stop()
+
+
+async def run_batch_uses_one_query_per_state():
+    server = FakeJobsProgramServer(JOBS)
+    url = await server.start()
+    try:
+        async with SolanaRPCClient(url) as rpc:
+            statuses = await JobIndex(rpc).job_statuses(NODES)
+            assert statuses == {
+                NODES[0]: "running", NODES[1]: "queue", NODES[2]: "idle",
+                NODES[3]: "idle", NODES[4]: "idle", NODES[5]: "running"
+            }
+            # One layout check, then one query per state
+            assert server.program_queries == 3
+    finally:
+        await server.stop()
+
+
+async def run_bad_layout_disables_index():
+    # No running job on the network, or running jobs whose start time is garbage
+    # (what a shifted offset decodes to): an empty index answer can't be trusted
+    for jobs in ([(NODES[0], JOB_STATE_DONE)], [(NODES[0], JOB_STATE_RUNNING, 1000, 7)]):
+        server = FakeJobsProgramServer(jobs)
+        url = await server.start()
+        try:
+            async with SolanaRPCClient(url) as rpc:
+                index = JobIndex(rpc)
+                for lookup in (index.jobs_for_node(NODES[1]), index.job_statuses(NODES)):
+                    try:
+                        await lookup
+                    except JobIndexUnavailable:
+                        pass
+                    else:
+                        raise AssertionError(f"index answered with a bad layout: {jobs}")
+                assert index.layout_ok is False
+                assert server.program_queries == 1  # The failed check is cached
+        finally:
+            await server.stop()
+
+
+def test_jobs_for_single_node():
+    asyncio.run(run_jobs_for_single_node())
+
+
+def test_batch_uses_one_query_per_state():
+    asyncio.run(run_batch_uses_one_query_per_state())
+
+
+def test_bad_layout_disables_index():
+    asyncio.run(run_bad_layout_disables_index())
+
+
+if __name__ == "__main__":
+    tests = [test_jobs_for_single_node, test_batch_uses_one_query_per_state, test_bad_layout_disables_index]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
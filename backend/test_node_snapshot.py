@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test the node dashboard snapshot: page text and row parsing, that status,
+payment and history callers share one read per node, and that an unchanged
+jobs table is not parsed again (no browser needed)
+
+Run directly: python test_node_snapshot.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from dashboard_parsing import JOB_ROWS_JS, TABLE_HASH_JS, TableHashStats, job_from_row, summary_from_text
+from node_snapshot import NodeSnapshotStore
+
+NODE_ADDRESS = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+
+ROW = {
+    "job_id": "FxJob1", "started": "3 hours ago", "duration": "1h 5m 10s",
+    "price": "$0.192/h", "gpu": "NVIDIA 3090", "status": "SUCCESS"
+}
+
+
+class FakeDashboardAPI:
+    def __init__(self):
+        self.summary_calls = 0
+        self.history_calls = 0
+
+    async def fetch_node_summary(self, address):
+        self.summary_calls += 1
+        await asyncio.sleep(0.01)
+        return {"job_status": "running", "nos_balance": 12.5}
+
+    async def fetch_job_history(self, address, max_pages=None, nos_price_source=None, stop_when=None):
+        self.history_calls += 1
+        await asyncio.sleep(0.01)
+        return [job_from_row(ROW)]
+
+
+def test_parsing():
+    job = job_from_row(ROW)
+    assert job["duration_seconds"] == 3910
+    assert job["hourly_rate_usd"] == 0.192
+    assert job["started_text"] == "3 hours ago"
+
+    summary = summary_from_text("Host API Status\nOnline\nStatus\nRunning\n1234.5 NOS\n0.25 SOL\n87 jobs\nAvailability: 99.1%")
+    assert summary == {
+        "job_status": "running", "nos_balance": 1234.5, "sol_balance": 0.25,
+        "total_jobs": 87, "availability_score": 99.1
+    }
+    assert summary_from_text("Status\nOnline")["job_status"] == "idle"
+
+
+async def run_shared_reads():
+    api = FakeDashboardAPI()
+    store = NodeSnapshotStore(browser_pool=None, dashboard_api=api, max_age=60)
+
+    # Status, payment and history in the same cycle: one read
+    snapshots = await asyncio.gather(*(store.get(NODE_ADDRESS) for _ in range(3)))
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert (await store.get(NODE_ADDRESS)) is snapshots[0]
+    assert api.summary_calls == 1 and api.history_calls == 1
+
+    snapshot = snapshots[0]
+    assert snapshot.source == "api"
+    assert snapshot.job_status == "running" and snapshot.nos_balance == 12.5
+    assert snapshot.latest_payment_usd == 0.192
+
+    stats = store.stats()
+    assert stats["reads"] == {"api": 1, "page": 0}
+    assert stats["coalesced"] == 2 and stats["hits"] == 1
+
+    # Older than max_age: read again
+    assert (await store.get(NODE_ADDRESS, max_age=0)) is not snapshot
+    assert api.summary_calls == 2
+
+
+def test_shared_reads():
+    asyncio.run(run_shared_reads())
+
+
+class FakePage:
+    """Rendered host page; TABLE_HASH_JS answers with `table_hash`"""
+
+    def __init__(self):
+        self.table_hash = "page:aa"
+        self.row_reads = 0
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_function(self, expression, **kwargs):
+        pass
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    async def inner_text(self, selector):
+        return "Status\nRunning\n12.5 NOS"
+
+    async def evaluate(self, expression):
+        if expression == TABLE_HASH_JS:
+            return self.table_hash
+        assert expression == JOB_ROWS_JS
+        self.row_reads += 1
+        return [ROW]
+
+
+class FakeBrowserPool:
+    def __init__(self, page):
+        self._page = page
+
+    @asynccontextmanager
+    async def page(self):
+        yield self._page
+
+
+async def run_unchanged_table():
+    page = FakePage()
+    store = NodeSnapshotStore(browser_pool=FakeBrowserPool(page), max_age=60)
+
+    first = await store.get(NODE_ADDRESS)
+    assert first.source == "page" and first.table_hash == "page:aa" and page.row_reads == 1
+
+    # Same fingerprint: the rows are not read or parsed again
+    second = await store.get(NODE_ADDRESS, max_age=0)
+    assert second is not first and second.jobs is first.jobs
+    assert page.row_reads == 1 and store.stats()["table_unchanged"] == 1
+
+    page.table_hash = "page:bb"
+    third = await store.get(NODE_ADDRESS, max_age=0)
+    assert third.table_hash == "page:bb" and page.row_reads == 2
+
+
+def test_unchanged_table():
+    asyncio.run(run_unchanged_table())
+
+
+def test_table_hash_stats():
+    stats = TableHashStats()
+    stats.record("api", True)
+    stats.record("api", False)
+    stats.record("page", False)
+    assert stats.stats() == {
+        "api": {"checks": 2, "unchanged": 1, "hit_rate": 0.5},
+        "page": {"checks": 1, "unchanged": 0, "hit_rate": 0.0}
+    }
+
+
+if __name__ == "__main__":
+    tests = [test_parsing, test_shared_reads, test_unchanged_table, test_table_hash_stats]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
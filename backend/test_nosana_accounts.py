@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the Nosana account layouts against the construct reference decoder on
+the recorded fixtures
+
+Run directly: python test_nosana_accounts.py  (also collected by pytest)
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from benchmark_account_decoder import FIXTURES, LAYOUTS, decode_with_construct
+from nosana_accounts import JOB_ACCOUNT, MARKET_ACCOUNT
+
+
+def test_layouts_match_construct():
+    fixtures = json.loads(FIXTURES.read_text())
+    for kind, layout in LAYOUTS.items():
+        expected = decode_with_construct(kind, fixtures[kind])
+        decoded = layout.decode_many(fixtures[kind])
+        for want, got in zip(expected, decoded):
+            got.pop("address")
+            for field in ("ipfs_job", "ipfs_result"):
+                if field in want:
+                    want[field] = want[field].hex()
+            assert got == want, kind
+
+
+def test_field_subset_and_foreign_accounts():
+    fixtures = json.loads(FIXTURES.read_text())
+    job = JOB_ACCOUNT.decode_many(fixtures["jobs"][:1], ("node", "state"))[0]
+    assert set(job) == {"node", "state", "address"} and job["state"] == 1
+
+    # A market account is not a job account, and missing accounts stay None
+    assert JOB_ACCOUNT.decode_many([fixtures["markets"][0], None]) == [None, None]
+    assert MARKET_ACCOUNT.offset("authority") == 8
+
+
+if __name__ == "__main__":
+    tests = [test_layouts_match_construct, test_field_subset_and_foreign_accounts]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the pagination waits against a fake page: the wait ends on the first
+signal (rows changed or data request finished) and the timeout is only a
+backstop (no browser needed)
+
+Run directly: python test_page_waits.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from page_waits import PageWaitStats, wait_for_table_change
+
+
+class FakePage:
+    """Rows change after `rows_after` seconds, the data request finishes after `request_after`"""
+
+    def __init__(self, rows_after=None, request_after=None):
+        self.rows_after = rows_after
+        self.request_after = request_after
+        self.started = time.monotonic()
+
+    async def _until(self, delay, timeout_ms):
+        if delay is None:
+            await asyncio.sleep(timeout_ms / 1000)
+            raise TimeoutError("fake timeout")
+        remaining = delay - (time.monotonic() - self.started)
+        if remaining * 1000 > timeout_ms:
+            await asyncio.sleep(timeout_ms / 1000)
+            raise TimeoutError("fake timeout")
+        await asyncio.sleep(max(0.0, remaining))
+
+    async def wait_for_function(self, expression, arg=None, polling=None, timeout=None):
+        await self._until(self.rows_after, timeout)
+
+    async def wait_for_event(self, event, predicate=None, timeout=None):
+        assert event == "requestfinished"
+        await self._until(self.request_after, timeout)
+
+
+async def run_signals():
+    stats = PageWaitStats()
+
+    started = time.monotonic()
+    assert await wait_for_table_change(FakePage(rows_after=0.05), "a|b", timeout=2, stats=stats) == "rows_changed"
+    assert time.monotonic() - started < 0.5
+
+    # Data arrives but the rows stay the same (e.g. the last page): ends after the settle time
+    page = FakePage(request_after=0.05)
+    started = time.monotonic()
+    outcome = await wait_for_table_change(page, "a|b", lambda r: True, timeout=2, settle=0.1, stats=stats)
+    assert outcome == "response"
+    assert time.monotonic() - started < 0.5
+
+    # Nothing happens: the timeout is the backstop
+    started = time.monotonic()
+    assert await wait_for_table_change(FakePage(), "a|b", lambda r: True, timeout=0.2, stats=stats) == "timeout"
+    assert 0.15 < time.monotonic() - started < 1.0
+
+    summary = stats.stats()
+    assert summary["waits"] == 3
+    assert summary["outcomes"] == {"rows_changed": 1, "response": 1, "timeout": 1}
+    assert summary["max_ms"] >= summary["p50_ms"] > 0
+
+
+def test_signals():
+    asyncio.run(run_signals())
+
+
+def test_empty_stats():
+    assert PageWaitStats().stats() == {"waits": 0, "outcomes": {}}
+
+
+if __name__ == "__main__":
+    tests = [test_signals, test_empty_stats]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
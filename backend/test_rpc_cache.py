@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the slot-aware RPC response cache in SolanaRPCClient against a local
+fake JSON-RPC server (no network access needed)
+
+Run directly: python test_rpc_cache.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from solana_rpc import SolanaRPCClient, RPCResponseCache
+from test_rpc_router import FakeRPCServer, NODE_ADDRESS
+
+MISSING_ADDRESS = "11111111111111111111111111111112"
+
+
+class MissingAccountServer(FakeRPCServer):
+    """Answers getAccountInfo with value None ("Account not found")"""
+
+    def result_for(self, request: dict):
+        return {"context": {"slot": 1}, "value": None}
+
+
+async def run_identical_lookups_cost_one_call():
+    server = FakeRPCServer()
+    url = await server.start()
+    try:
+        async with SolanaRPCClient(url, cache=RPCResponseCache()) as rpc:
+            values = await asyncio.gather(*(rpc.get_account_info(NODE_ADDRESS) for _ in range(10)))
+            values.append(await rpc.get_account_info(NODE_ADDRESS))
+            assert all(v["lamports"] == 5_000_000 for v in values)
+            assert server.requests == 1
+
+            # Different params (here: the data slice) are a different cache key
+            await rpc.get_account_info(NODE_ADDRESS, data_slice={"offset": 0, "length": 0})
+            assert server.requests == 2
+
+            stats = rpc.stats()["cache"]
+            assert stats["misses"] == 2
+            assert stats["hits"] + stats["coalesced"] == 10
+    finally:
+        await server.stop()
+
+
+async def run_expires_with_slot_progression():
+    server = FakeRPCServer()
+    url = await server.start()
+    try:
+        async with SolanaRPCClient(url, cache=RPCResponseCache(ttl_slots=1)) as rpc:
+            await rpc.get_account_info(NODE_ADDRESS)
+            await rpc.get_account_info(NODE_ADDRESS)
+            assert server.requests == 1
+
+            await asyncio.sleep(0.5)  # > one slot
+            await rpc.get_account_info(NODE_ADDRESS)
+            assert server.requests == 2
+    finally:
+        await server.stop()
+
+
+async def run_negative_answers_expire_sooner():
+    server = MissingAccountServer()
+    url = await server.start()
+    try:
+        cache = RPCResponseCache(ttl_slots=100, negative_ttl_slots=1)
+        async with SolanaRPCClient(url, cache=cache) as rpc:
+            assert await rpc.get_account_info(MISSING_ADDRESS) is None
+            assert await rpc.get_account_info(MISSING_ADDRESS) is None
+            assert server.requests == 1
+            assert cache.negative_hits == 1
+
+            await asyncio.sleep(0.5)
+            await rpc.get_account_info(MISSING_ADDRESS)
+            assert server.requests == 2
+    finally:
+        await server.stop()
+
+
+def test_identical_lookups_cost_one_call():
+    asyncio.run(run_identical_lookups_cost_one_call())
+
+
+def test_expires_with_slot_progression():
+    asyncio.run(run_expires_with_slot_progression())
+
+
+def test_negative_answers_expire_sooner():
+    asyncio.run(run_negative_answers_expire_sooner())
+
+
+if __name__ == "__main__":
+    tests = [test_identical_lookups_cost_one_call, test_expires_with_slot_progression, test_negative_answers_expire_sooner]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test the scrape worker's job handling against an in-memory queue: results
+are stored and reported, timeouts and errors go back to the queue, and
+several jobs run concurrently (no Mongo or browser needed)
+
+Run directly: python test_scrape_worker.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from scrape_worker import ScrapeWorker
+
+
+class FakeQueue:
+    def __init__(self, jobs):
+        self.pending = list(jobs)
+        self.completed = {}
+        self.failed = {}
+
+    async def claim(self, worker, lease_seconds):
+        if not self.pending:
+            return None
+        job = self.pending.pop(0)
+        job["attempts"] = job.get("attempts", 0) + 1
+        return job
+
+    async def complete(self, job_id, result):
+        self.completed[job_id] = result
+
+    async def fail(self, job, error):
+        self.failed[job["id"]] = error
+
+    async def expire_abandoned(self):
+        return 0
+
+
+def queued(job_id, address, kind="history"):
+    return {"id": job_id, "address": address, "user_id": "user1", "kind": kind, "backfill": False}
+
+
+SCRAPED = [{"job_id": "j1", "started": datetime(2026, 1, 1, tzinfo=timezone.utc), "hourly_rate_usd": 0.192}]
+
+
+async def run_jobs():
+    stored = []
+
+    async def scrape(job):
+        if job["address"] == "slow":
+            await asyncio.sleep(10)
+        if job["address"] == "broken":
+            raise RuntimeError("page crashed")
+        await asyncio.sleep(0.05)
+        stored.append((job["user_id"], job["address"], len(SCRAPED)))
+        return {"jobs_scraped": len(SCRAPED), "jobs_stored": len(SCRAPED), "jobs": list(SCRAPED)}
+
+    queue = FakeQueue([
+        queued("a", "node-a"), queued("b", "node-b", kind="live"),
+        queued("c", "slow"), queued("d", "broken"),
+    ])
+    worker = ScrapeWorker(queue, scrape, name="test", concurrency=4, job_timeout=0.3, poll_interval=0.05)
+
+    stop = asyncio.Event()
+    started = time.monotonic()
+    runner = asyncio.create_task(worker.run(stop))
+    while len(queue.completed) + len(queue.failed) < 4:
+        await asyncio.sleep(0.02)
+    stop.set()
+    await runner
+    # The slow job's timeout bounds the run, the jobs ran side by side
+    assert time.monotonic() - started < 1.0
+
+    assert set(queue.completed) == {"a", "b"}
+    assert queue.completed["a"]["jobs_stored"] == 1 and "jobs" not in queue.completed["a"]
+    assert queue.completed["b"]["jobs"][0]["started"] == "2026-01-01T00:00:00+00:00"
+    assert queue.failed["c"].startswith("timed out")
+    assert queue.failed["d"] == "page crashed"
+    assert sorted(stored) == [("user1", "node-a", 1), ("user1", "node-b", 1)]
+    assert worker.completed == 2 and worker.failed == 2
+
+
+def test_jobs():
+    asyncio.run(run_jobs())
+
+
+if __name__ == "__main__":
+    tests = [test_jobs]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test status source selection: a dashboard read is only current when a cheap
+source failed, failed batched balance lookups, and per-field source counters
+
+Run directly: python test_status_sources.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from status_sources import (
+    SOURCE_CHAIN, SOURCE_DASHBOARD, SOURCE_JOB_INDEX, SOURCE_SIDECAR,
+    StatusSourceStats, dashboard_max_age, resolve_nos_balance
+)
+
+
+def test_dashboard_max_age():
+    # Job status and balance answered cheaply ('idle' included): old stats will do
+    assert dashboard_max_age(SOURCE_JOB_INDEX, SOURCE_CHAIN, 60, 21600) == 21600
+    assert dashboard_max_age(SOURCE_SIDECAR, SOURCE_CHAIN, 60, 21600) == 21600
+    # The dashboard stands in for a failed source: current read
+    assert dashboard_max_age(None, SOURCE_CHAIN, 60, 21600) == 60
+    assert dashboard_max_age(SOURCE_JOB_INDEX, None, 60, 21600) == 60
+    # Never stricter than a live read
+    assert dashboard_max_age(SOURCE_JOB_INDEX, SOURCE_CHAIN, 60, 0) == 60
+
+
+async def run_resolve_nos_balance():
+    looked_up = []
+
+    async def lookup(owner):
+        looked_up.append(owner)
+        return 7.5
+
+    async def failing_lookup(owner):
+        raise ConnectionError("rpc down")
+
+    # Answered by the batch: no second lookup
+    assert await resolve_nos_balance("node1", {"node1": 3.0}, lookup) == 3.0
+    assert await resolve_nos_balance("node1", {"node1": 0.0}, lookup) == 0.0
+    assert looked_up == []
+
+    # A failed batch lookup (None) is looked up again, not taken as the answer
+    assert await resolve_nos_balance("node1", {"node1": None}, lookup) == 7.5
+    assert await resolve_nos_balance("node2", None, lookup) == 7.5
+    assert looked_up == ["node1", "node2"]
+
+    # Still failing: the error reaches check_node_jobs, which leaves the source
+    # unset so the current dashboard snapshot fills the balance
+    try:
+        await resolve_nos_balance("node1", {"node1": None}, failing_lookup)
+        assert False, "the failed lookup should raise"
+    except ConnectionError:
+        pass
+
+
+def test_resolve_nos_balance():
+    asyncio.run(run_resolve_nos_balance())
+
+
+def test_source_stats():
+    stats = StatusSourceStats()
+    stats.record({"job_status": SOURCE_JOB_INDEX, "nos_balance": SOURCE_CHAIN, "total_jobs": SOURCE_DASHBOARD})
+    stats.record({"job_status": SOURCE_SIDECAR, "nos_balance": None, "total_jobs": None})
+    stats.record({"job_status": SOURCE_JOB_INDEX, "nos_balance": SOURCE_CHAIN, "total_jobs": SOURCE_DASHBOARD})
+    assert stats.stats() == {
+        "checks": 3,
+        "fields": {
+            "job_status": {"job_index": 2, "sidecar": 1},
+            "nos_balance": {"chain": 2, "none": 1},
+            "total_jobs": {"dashboard": 2, "none": 1}
+        }
+    }
+
+
+if __name__ == "__main__":
+    tests = [test_dashboard_max_age, test_resolve_nos_balance, test_source_stats]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the stale-while-revalidate cache: fresh hits, stale hits with a single
+background refresh, shared in-flight loads and uncached empty results
+
+Run directly: python test_swr_cache.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from swr_cache import SWRCache
+
+ADDRESS = "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV"
+
+
+class Loader:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [f"job{self.calls}"]
+
+
+async def run_fresh_stale_and_shared():
+    cache = SWRCache(fresh_ttl=0.1, stale_ttl=5)
+    load = Loader()
+
+    # Concurrent first requests share one load
+    results = await asyncio.gather(*(cache.get(ADDRESS, load) for _ in range(5)))
+    assert load.calls == 1
+    assert sorted(state for _, state in results) == ["coalesced"] * 4 + ["miss"]
+    assert all(value == ["job1"] for value, _ in results)
+
+    assert await cache.get(ADDRESS, load) == (["job1"], "fresh")
+
+    # Stale: served immediately, one background refresh for many requests
+    await asyncio.sleep(0.15)
+    for _ in range(3):
+        assert await cache.get(ADDRESS, load) == (["job1"], "stale")
+    await asyncio.sleep(0.1)
+    assert load.calls == 2
+    assert await cache.get(ADDRESS, load) == (["job2"], "fresh")
+
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 4
+    assert stats["stale_hits"] == 3 and stats["refreshing"] == 0
+
+
+def test_fresh_stale_and_shared():
+    asyncio.run(run_fresh_stale_and_shared())
+
+
+async def run_not_cacheable_and_failures():
+    cache = SWRCache(fresh_ttl=0.05, stale_ttl=5)
+
+    async def empty():
+        return []
+
+    assert await cache.get(ADDRESS, empty, cacheable=bool) == ([], "miss")
+    assert cache.age(ADDRESS) is None
+
+    cache.put(ADDRESS, ["old"])
+    await asyncio.sleep(0.06)
+
+    async def failing():
+        raise RuntimeError("dashboard down")
+
+    # A failed or empty refresh keeps the stale value
+    assert await cache.get(ADDRESS, failing) == (["old"], "stale")
+    await asyncio.sleep(0.01)
+    assert await cache.get(ADDRESS, empty, cacheable=bool) == (["old"], "stale")
+    await asyncio.sleep(0.01)
+    assert cache.stats()["refresh_failures"] == 1
+    assert (await cache.get(ADDRESS, empty))[0] == ["old"]
+
+
+def test_not_cacheable_and_failures():
+    asyncio.run(run_not_cacheable_and_failures())
+
+
+if __name__ == "__main__":
+    tests = [test_fresh_stale_and_shared, test_not_cacheable_and_failures]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
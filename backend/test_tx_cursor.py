@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test transaction classification and batched getTransaction fetching for the
+per-node transaction cursor (no network access needed)
+
+Run directly: python test_tx_cursor.py  (also collected by pytest)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from nosana_accounts import NOSANA_JOBS_PROGRAM_ID
+from solana_rpc import NOS_MINT, SolanaRPCClient
+from test_rpc_router import FakeRPCServer, NODE_ADDRESS
+from tx_cursor import classify_transaction
+
+
+def nos_balance(owner: str, amount: float) -> dict:
+    return {"owner": owner, "mint": NOS_MINT, "uiTokenAmount": {"uiAmount": amount}}
+
+
+def jobs_transaction(instruction: str, pre: float = 10.0, post: float = 10.0) -> dict:
+    return {"meta": {
+        "logMessages": [
+            f"Program {NOSANA_JOBS_PROGRAM_ID} invoke [1]",
+            f"Program log: Instruction: {instruction}",
+            f"Program {NOSANA_JOBS_PROGRAM_ID} success"
+        ],
+        "preTokenBalances": [nos_balance(NODE_ADDRESS, pre)],
+        "postTokenBalances": [nos_balance(NODE_ADDRESS, post)]
+    }}
+
+
+class FakeTransactionServer(FakeRPCServer):
+    def result_for(self, request: dict):
+        if request["method"] == "getTransaction":
+            return {"signature": request["params"][0], "meta": {"logMessages": []}}
+        return super().result_for(request)
+
+
+def test_classify_finish_with_payment():
+    info = {"signature": "sig1", "slot": 5, "blockTime": 1_760_000_000, "err": None}
+    doc = classify_transaction(NODE_ADDRESS, info, jobs_transaction("Finish", pre=10.0, post=12.5))
+    assert doc["event_type"] == "job_finished"
+    assert doc["nos_change"] == 2.5
+    assert doc["block_time"].startswith("2025-10-09")
+
+
+def test_classify_other_and_failed():
+    info = {"signature": "sig2", "slot": 6, "blockTime": None, "err": None}
+    transfer = {"meta": {"logMessages": ["Program 11111111111111111111111111111111 invoke [1]"]}}
+    assert classify_transaction(NODE_ADDRESS, info, transfer)["event_type"] == "other"
+
+    failed = dict(info, err={"InstructionError": [0, "Custom"]})
+    doc = classify_transaction(NODE_ADDRESS, failed, jobs_transaction("Work"))
+    assert doc["failed"] and doc["event_type"] == "other"
+
+    assert classify_transaction(NODE_ADDRESS, info, jobs_transaction("Work"))["event_type"] == "job_started"
+
+
+async def run_transactions_are_fetched_in_batches():
+    server = FakeTransactionServer()
+    url = await server.start()
+    try:
+        async with SolanaRPCClient(url) as rpc:
+            signatures = [f"sig{i}" for i in range(45)]
+            transactions = await rpc.get_transactions(signatures, batch_size=20)
+            assert [tx["signature"] for tx in transactions] == signatures
+            assert server.requests == 3
+    finally:
+        await server.stop()
+
+
+def test_transactions_are_fetched_in_batches():
+    asyncio.run(run_transactions_are_fetched_in_batches())
+
+
+if __name__ == "__main__":
+    tests = [test_classify_finish_with_payment, test_classify_other_and_failed, test_transactions_are_fetched_in_batches]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,206 @@
+"""
+Incremental per-node transaction cursor
+
+For every node the newest processed signature is kept in Mongo
+(`node_tx_cursors`). Each sync asks getSignaturesForAddress for the
+signatures after that cursor only, fetches those transactions with batched
+getTransaction calls and records Nosana job events (start, finish, stop and
+NOS payments) in `node_transactions`. Work per cycle scales with new
+activity, not with the size of the node's history.
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from nosana_accounts import NOSANA_JOBS_PROGRAM_ID
+from solana_rpc import NOS_MINT, SolanaRPCClient
+
+logger = logging.getLogger(__name__)
+
+# Anchor logs "Program log: Instruction: <Name>" for every instruction it runs
+INSTRUCTION_LOG = re.compile(r"^Program log: Instruction: (\w+)")
+
+# Nosana jobs program instructions -> event type
+JOB_EVENTS = {
+    "work": "job_started",
+    "claim": "job_started",
+    "list": "job_started",
+    "finish": "job_finished",
+    "complete": "job_finished",
+    "stop": "job_stopped",
+    "quit": "job_stopped",
+}
+
+
+def _token_balance(balances: List[Dict], owner: str, mint: str) -> float:
+    total = 0.0
+    for balance in balances or []:
+        if balance.get("owner") == owner and balance.get("mint") == mint:
+            total += (balance.get("uiTokenAmount") or {}).get("uiAmount") or 0.0
+    return total
+
+
+def classify_transaction(address: str, signature_info: Dict, transaction: Optional[Dict]) -> Dict:
+    """
+    Turn a jsonParsed getTransaction result into a node_transactions document
+
+    event_type is the Nosana job event if the jobs program ran in it
+    (finish wins over start when both happen), otherwise "other".
+    nos_change is the change of NOS held by the node in this transaction.
+    """
+    block_time = signature_info.get("blockTime")
+    doc = {
+        "address": address,
+        "signature": signature_info["signature"],
+        "slot": signature_info.get("slot"),
+        "block_time": datetime.fromtimestamp(block_time, timezone.utc).isoformat() if block_time else None,
+        "failed": signature_info.get("err") is not None,
+        "event_type": "other",
+        "instructions": [],
+        "nos_change": 0.0,
+    }
+    if transaction is None or doc["failed"]:
+        return doc
+
+    meta = transaction.get("meta") or {}
+    logs = meta.get("logMessages") or []
+    if not any(NOSANA_JOBS_PROGRAM_ID in line for line in logs):
+        return doc
+
+    instructions = []
+    for line in logs:
+        match = INSTRUCTION_LOG.match(line)
+        if match:
+            instructions.append(match.group(1).lower())
+    doc["instructions"] = instructions
+
+    events = [JOB_EVENTS[name] for name in instructions if name in JOB_EVENTS]
+    for event_type in ("job_finished", "job_stopped", "job_started"):
+        if event_type in events:
+            doc["event_type"] = event_type
+            break
+
+    doc["nos_change"] = round(
+        _token_balance(meta.get("postTokenBalances"), address, NOS_MINT)
+        - _token_balance(meta.get("preTokenBalances"), address, NOS_MINT),
+        6
+    )
+    return doc
+
+
+class NodeTransactionCursor:
+    """
+    Keeps node_transactions up to date from getSignaturesForAddress
+
+    initial_limit: how many recent signatures to look at for a node that has
+    no cursor yet (older history is left to the dashboard scraper)
+    """
+
+    def __init__(
+        self,
+        rpc: SolanaRPCClient,
+        db,
+        page_size: int = 1000,
+        batch_size: int = 20,
+        initial_limit: int = 25
+    ):
+        self.rpc = rpc
+        self.db = db
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.initial_limit = initial_limit
+
+    async def ensure_indexes(self):
+        await self.db.node_tx_cursors.create_index("address", unique=True)
+        await self.db.node_transactions.create_index([("address", 1), ("signature", 1)], unique=True)
+        await self.db.node_transactions.create_index([("address", 1), ("event_type", 1), ("slot", -1)])
+
+    async def _new_signatures(self, address: str, cursor: Optional[str]) -> List[Dict]:
+        """Signatures newer than `cursor`, newest first"""
+        if cursor is None:
+            return await self.rpc.get_signatures_for_address(address, limit=self.initial_limit)
+
+        signatures: List[Dict] = []
+        before = None
+        while True:
+            page = await self.rpc.get_signatures_for_address(
+                address, until=cursor, before=before, limit=self.page_size
+            )
+            signatures.extend(page)
+            if len(page) < self.page_size:
+                return signatures
+            before = page[-1]["signature"]
+
+    async def sync(self, address: str) -> List[Dict]:
+        """Process new transactions for one node; returns the new job events"""
+        cursor_doc = await self.db.node_tx_cursors.find_one({"address": address}, {"_id": 0})
+        cursor = cursor_doc.get("signature") if cursor_doc else None
+
+        signatures = await self._new_signatures(address, cursor)
+        if not signatures:
+            return []
+
+        # Failed transactions cannot carry job events, so skip fetching them
+        to_fetch = [info["signature"] for info in signatures if info.get("err") is None]
+        fetched = dict(zip(to_fetch, await self.rpc.get_transactions(to_fetch, batch_size=self.batch_size)))
+
+        docs = [classify_transaction(address, info, fetched.get(info["signature"])) for info in signatures]
+        missing = [doc["signature"] for doc in docs if not doc["failed"] and fetched.get(doc["signature"]) is None]
+        if missing:
+            # Not retrievable yet - don't move the cursor past the oldest one
+            logger.debug(f"{len(missing)} transactions for {address[:8]} not available yet")
+            oldest_missing = missing[-1]
+            index = next(i for i, doc in enumerate(docs) if doc["signature"] == oldest_missing)
+            docs = docs[index + 1:]
+            if not docs:
+                return []
+
+        now = datetime.now(timezone.utc).isoformat()
+        await self.db.node_transactions.bulk_write([
+            UpdateOne(
+                {"address": address, "signature": doc["signature"]},
+                {"$set": doc, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for doc in docs
+        ], ordered=False)
+
+        # Cursor moves only after the events are stored
+        newest = docs[0]
+        await self.db.node_tx_cursors.update_one(
+            {"address": address},
+            {"$set": {"signature": newest["signature"], "slot": newest["slot"], "updated_at": now}},
+            upsert=True
+        )
+
+        events = [doc for doc in docs if doc["event_type"] != "other"]
+        if events:
+            logger.info(f"📜 {address[:8]}...: {len(events)} new job events from {len(docs)} transactions")
+        return events
+
+    async def sync_many(self, addresses: List[str], concurrency: int = 4) -> Dict[str, List[Dict]]:
+        """sync() for many nodes; nodes whose sync fails map to an empty list"""
+        semaphore = asyncio.Semaphore(concurrency)
+        events: Dict[str, List[Dict]] = {}
+
+        async def run(address: str):
+            async with semaphore:
+                try:
+                    events[address] = await self.sync(address)
+                except Exception as e:
+                    logger.warning(f"Transaction sync failed for {address[:8]}: {str(e)}")
+                    events[address] = []
+
+        await asyncio.gather(*(run(address) for address in dict.fromkeys(addresses)))
+        return events
+
+    async def latest_event(self, address: str, event_type: str, since: Optional[str] = None) -> Optional[Dict]:
+        """Newest stored event of a type for a node, optionally not older than `since` (ISO time)"""
+        query = {"address": address, "event_type": event_type}
+        if since:
+            query["block_time"] = {"$gte": since}
+        return await self.db.node_transactions.find_one(query, {"_id": 0}, sort=[("slot", -1)])
@@ -6,12 +6,11 @@ Verify NOS and SOL balances match between:
 3. Solana blockchain (direct RPC)
 """
 import asyncio
+import os
 import sys
 sys.path.append('/app/backend')
 
-from solana.rpc.api import Client as SolanaClient
-from solders.pubkey import Pubkey as SoldersPubkey
-from solana.rpc.types import TokenAccountOpts
+from solana_rpc import SolanaRPCClient, NOS_MINT, DEFAULT_RPC_URL
 from playwright.async_api import async_playwright
 import re
 import logging
@@ -24,37 +23,18 @@ TEST_NODES = [
     "9hsWPkJUBiDQnc2p7dKi2gMKHp6LwscA6Z5qAF8NGsyV",
 ]
 
-NOS_MINT = "nosXBVoaCTtYdLvKY6Csb4AC8JCdQKKAaWYtx2ZMoo7"
-
-async def get_blockchain_balances(address: str):
+async def get_blockchain_balances(address: str, solana_rpc: SolanaRPCClient):
     """Get SOL and NOS balances directly from Solana blockchain"""
     try:
-        solana_client = SolanaClient("https://api.mainnet-beta.solana.com")
-        
         # Get SOL balance
-        pubkey = SoldersPubkey.from_string(address)
-        account_info = solana_client.get_account_info(pubkey)
+        account_info = await solana_rpc.get_account_info(address)
         
         sol_balance = None
-        if account_info.value:
-            sol_balance = account_info.value.lamports / 1e9
-        
-        # Get NOS balance
-        nos_balance = 0.0
-        wallet_pubkey = SoldersPubkey.from_string(address)
-        nos_mint_pubkey = SoldersPubkey.from_string(NOS_MINT)
-        
-        opts = TokenAccountOpts(mint=nos_mint_pubkey)
-        response = solana_client.get_token_accounts_by_owner(wallet_pubkey, opts)
+        if account_info:
+            sol_balance = account_info['lamports'] / 1e9
         
-        if response and response.value:
-            for account in response.value:
-                token_account_pubkey = SoldersPubkey.from_string(str(account.pubkey))
-                balance_response = solana_client.get_token_account_balance(token_account_pubkey)
-                if balance_response and balance_response.value:
-                    account_balance = balance_response.value.ui_amount
-                    if account_balance:
-                        nos_balance += account_balance
+        # Get NOS balance (single jsonParsed token account lookup)
+        nos_balance = await solana_rpc.get_owner_token_balance(address, NOS_MINT)
         
         return {
             'sol': sol_balance,
@@ -99,7 +79,7 @@ async def get_dashboard_balances(address: str):
         logger.error(f"Error scraping dashboard: {e}")
         return {'sol': None, 'nos': None}
 
-async def verify_node_balances(address: str):
+async def verify_node_balances(address: str, solana_rpc: SolanaRPCClient):
     """Compare balances from different sources"""
     print(f"\n{'='*100}")
     print(f"VERIFYING BALANCES FOR NODE: {address}")
@@ -107,7 +87,7 @@ async def verify_node_balances(address: str):
     
     # Get balances from blockchain
     print("📡 Fetching from Solana blockchain...")
-    blockchain = await get_blockchain_balances(address)
+    blockchain = await get_blockchain_balances(address, solana_rpc)
     sol_str = f"{blockchain['sol']:.6f}" if blockchain['sol'] is not None else 'N/A'
     nos_str = f"{blockchain['nos']:.2f}" if blockchain['nos'] is not None else 'N/A'
     print(f"   SOL: {sol_str}")
@@ -178,9 +158,12 @@ async def main():
     
     results = []
     
-    for address in TEST_NODES:
-        result = await verify_node_balances(address)
-        results.append(result)
+    # Same endpoint list as the backend's RPC router
+    rpc_urls = os.environ.get('SOLANA_RPC_URLS', os.environ.get('SOLANA_RPC_URL', DEFAULT_RPC_URL)).split(',')
+    async with SolanaRPCClient(rpc_urls) as solana_rpc:
+        for address in TEST_NODES:
+            result = await verify_node_balances(address, solana_rpc)
+            results.append(result)
     
     print(f"\n{'='*100}")
     print(f"SUMMARY")